@@ -33,6 +33,21 @@ def create_app(config_name='development'):
     # Inicializar extensões
     db.init_app(app)
     
+    from app.utils.cache import cache
+    from app.utils import data_versions
+    from app.utils.query_cache import query_cache
+    cache.init_app(app)
+    data_versions.init_app(app)
+    query_cache.init_app(app)
+    
+    from app.services.search_service import search_index
+    from app.services.suggest_service import client_prefix_index
+    from app.services import client_counters, dashboard_aggregates
+    search_index.init_app(app)
+    client_prefix_index.init_app(app)
+    client_counters.init_app(app)
+    dashboard_aggregates.init_app(app)
+    
     # Configurar CORS seguro
     CORS(app, 
          origins=app.config.get('CORS_ORIGINS', ['http://localhost:5000']),
@@ -87,12 +102,9 @@ def register_blueprints(app):
     def inject_global_vars():
         """Injeta variáveis globais nos templates"""
         try:
-            from app.models import Notification
+            from app.services.dashboard_service import DashboardService
             user_id = 1  # Temporário até implementar auth
-            unread_count = Notification.query.filter_by(
-                user_id=user_id, 
-                is_read=False
-            ).count()
+            unread_count = DashboardService.get_unread_notifications_count(user_id)
             return {'unread_count': unread_count}
         except:
             return {'unread_count': 0}
@@ -131,6 +143,8 @@ def register_error_handlers(app):
 
 def register_cli_commands(app):
     """Registra comandos CLI personalizados"""
+    import click
+    
     @app.cli.command()
     def init_db():
         """Inicializa banco de dados"""
@@ -153,3 +167,67 @@ def register_cli_commands(app):
         db.session.add(admin)
         db.session.commit()
         print('Usuário administrador criado.')
+    
+    @app.cli.command('reindex-search')
+    def reindex_search():
+        """Reconstrói o índice de busca de clientes e contratos"""
+        from app.services.search_service import search_index
+        total = search_index.reindex()
+        print(f'Índice de busca reconstruído: {total} documentos.')
+    
+    @app.cli.command('repair-client-counters')
+    @click.option('--chunk-size', default=500, show_default=True, help='Clientes por transação')
+    def repair_client_counters(chunk_size):
+        """Recalcula os contadores de contratos de todos os clientes"""
+        from app.services import client_counters
+        total = client_counters.repair(chunk_size)
+        print(f'Contadores recalculados para {total} clientes.')
+    
+    @app.cli.command('verify-dashboard-aggregates')
+    @click.option('--fix', is_flag=True, help='Reconstrói a tabela se houver divergências')
+    def verify_dashboard_aggregates(fix):
+        """Compara os agregados do dashboard com um recálculo completo"""
+        from app.services import dashboard_aggregates
+        differences = dashboard_aggregates.verify()
+        for metric, stored, expected in differences:
+            print(f'{metric}: armazenado {stored[0]} / {stored[1]}, esperado {expected[0]} / {expected[1]}')
+        if not differences:
+            print('Agregados do dashboard consistentes.')
+        elif fix:
+            total = dashboard_aggregates.rebuild()
+            print(f'Agregados reconstruídos: {total} métricas.')
+        else:
+            raise SystemExit(1)
+    
+    @app.cli.command('extract-parquet')
+    @click.option('--entity', type=click.Choice(['clients', 'contracts', 'all']), default='all')
+    @click.option('--full', is_flag=True, help='Ignora a marca d\'água e recria as partições')
+    @click.option('--compact', is_flag=True, help='Compacta as partições antigas após a extração')
+    @click.option('--keep-months', default=1, show_default=True, help='Meses recentes que não são compactados')
+    def extract_parquet(entity, full, compact, keep_months):
+        """Extrai para Parquet as linhas alteradas desde a última execução"""
+        from app.services import parquet_extract
+        directory = app.config['PARQUET_EXTRACT_DIR']
+        entities = ['clients', 'contracts'] if entity == 'all' else [entity]
+        try:
+            for name in entities:
+                result = parquet_extract.extract(name, directory, full=full)
+                print(f"{name}: {result['rows']} linhas em {result['files']} arquivos")
+                if compact:
+                    print(f'{name}: {parquet_extract.compact(name, directory, keep_months)} partições compactadas')
+        except parquet_extract.ExtractError as e:
+            raise click.ClickException(str(e))
+    
+    @app.cli.command('warm-cache')
+    @click.option('--load', is_flag=True, help='Recarrega os snapshots gravados antes de aquecer')
+    @click.option('--save', is_flag=True, help='Grava os snapshots ao final (hand-off para o próximo deploy)')
+    def warm_cache(load, save):
+        """Pré-calcula os resultados do dashboard e do analytics"""
+        from app.services import cache_warmup
+        path = app.config['CACHE_WARMUP_PATH']
+        if load:
+            print(f'Snapshots restaurados: {cache_warmup.load_snapshots(path)}')
+        for name, seconds in cache_warmup.warm_up().items():
+            print(f'{name}: ' + (f'{seconds:.3f}s' if seconds is not None else 'erro'))
+        if save:
+            print(f'Snapshots gravados: {cache_warmup.save_snapshots(path)}')
@@ -2,14 +2,28 @@
 API Routes - Endpoints REST para a aplicação
 """
 
+from flask import stream_with_context
+from sqlalchemy.orm import joinedload
 from app.utils.imports import (
-    datetime, date, timedelta, jsonify, request, current_app
+    datetime, date, jsonify, request, current_app
 )
 from app import db
 from app.models import Client, Contract, User, Notification
 from app.api import bp
 from app.services.dashboard_service import DashboardService
-from app.utils.decorators import handle_route_errors, validate_json
+from app.services.event_stream import DashboardEventStream
+from app.services.search_service import search_index
+from app.services.suggest_service import client_prefix_index
+from app.utils.cache import cache
+from app.utils.query_cache import query_cache
+from app.utils.decorators import handle_route_errors, validate_json, conditional_response
+from app.utils.pagination import keyset_paginate, InvalidCursor
+from app.utils.time_buckets import GRANULARITIES
+from app.constants import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CLIENT_SORT_FIELDS, CONTRACT_SORT_FIELDS,
+    NOTIFICATION_SORT_FIELDS, SUGGEST_DEFAULT_LIMIT, TIME_SERIES_METRICS, TIME_SERIES_MAX_PERIODS,
+    UPCOMING_EXPIRY_DAYS
+)
 
 # Error handlers
 @bp.errorhandler(404)
@@ -31,6 +45,7 @@ def internal_error(error):
 
 # Dashboard endpoints
 @bp.route('/dashboard/data', methods=['GET'])
+@conditional_response(depends_on=('clients', 'contracts'))
 @handle_route_errors(json_response=True)
 def get_dashboard_data():
     """Retorna dados completos do dashboard"""
@@ -77,41 +92,91 @@ def get_dashboard_data():
     
     return jsonify(data)
 
+@bp.route('/dashboard/series', methods=['GET'])
+@conditional_response(depends_on=('contracts',))
+@handle_route_errors(json_response=True)
+def get_dashboard_series():
+    """Série temporal para gráficos (contracts, revenue ou expirations)"""
+    metric = request.args.get('metric', 'contracts', type=str)
+    granularity = request.args.get('granularity', 'month', type=str)
+    periods = request.args.get('periods', 6, type=int)
+    
+    if metric not in TIME_SERIES_METRICS or granularity not in GRANULARITIES \
+            or not 1 <= periods <= TIME_SERIES_MAX_PERIODS:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'Parâmetros inválidos para a série temporal'
+        }), 400
+    
+    return jsonify({
+        'metric': metric,
+        'granularity': granularity,
+        'series': DashboardService.get_time_series(metric, granularity, periods)
+    })
+
+@bp.route('/stream/dashboard', methods=['GET'])
+def stream_dashboard():
+    """Stream SSE com deltas de métricas, vencimentos e notificações"""
+    # TODO: Obter user_id da sessão quando implementar auth
+    user_id = 1  # Temporário
+    
+    events = DashboardEventStream.stream(
+        user_id,
+        current_app.config,
+        last_event_id=request.headers.get('Last-Event-ID')
+    )
+    return current_app.response_class(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Desativa buffering no nginx
+        }
+    )
+
+# Cache endpoints
+@bp.route('/cache/stats', methods=['GET'])
+@handle_route_errors(json_response=True)
+def get_cache_stats():
+    """Retorna contadores do cache (hits, misses, evictions)"""
+    data = cache.get_stats()
+    data['query_cache'] = query_cache.get_stats()
+    return jsonify(data)
+
 # Client endpoints
 @bp.route('/clients', methods=['GET'])
+@conditional_response(depends_on=('clients', 'contracts'))
 def get_clients():
     """Lista todos os clientes"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        per_page = min(request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
         search = request.args.get('search', '', type=str)
         
         query = Client.query
         
         if search:
-            query = query.filter(
-                Client.name.ilike(f'%{search}%') |
-                Client.email.ilike(f'%{search}%')
-            )
-        
-        clients = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+            query = query.filter(search_index.filter_for(Client, search))
+        
+        clients = keyset_paginate(
+            query, Client,
+            sort=request.args.get('sort', 'id', type=str),
+            order=request.args.get('order', 'asc', type=str),
+            cursor=request.args.get('cursor'),
+            per_page=per_page,
+            allowed_sorts=CLIENT_SORT_FIELDS,
+            count_depends_on=('clients',)
         )
         
         return jsonify({
-            'clients': [client.to_dict() for client in clients.items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': clients.total,
-                'pages': clients.pages,
-                'has_next': clients.has_next,
-                'has_prev': clients.has_prev
-            }
+            'clients': Client.to_dict_many(clients.items),
+            'pagination': clients.to_dict()
         })
         
+    except InvalidCursor as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
     except Exception as e:
         current_app.logger.error(f"Erro ao listar clientes: {str(e)}")
         return jsonify({
@@ -119,6 +184,14 @@ def get_clients():
             'message': 'Erro ao listar clientes'
         }), 500
 
+@bp.route('/clients/suggest', methods=['GET'])
+@handle_route_errors(json_response=True)
+def suggest_clients():
+    """Autocompletar de clientes ativos por nome, email ou documento"""
+    query = request.args.get('q', '', type=str)
+    limit = request.args.get('limit', SUGGEST_DEFAULT_LIMIT, type=int)
+    return jsonify({'suggestions': client_prefix_index.suggest(query, limit)})
+
 @bp.route('/clients', methods=['POST'])
 def create_client():
     """Cria um novo cliente"""
@@ -240,43 +313,48 @@ def delete_client(client_id):
 
 # Contract endpoints
 @bp.route('/contracts', methods=['GET'])
+@conditional_response(depends_on=('clients', 'contracts'))
 def get_contracts():
     """Lista todos os contratos"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        per_page = min(request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
         search = request.args.get('search', '', type=str)
         status = request.args.get('status', '', type=str)
+        # Agregados completos do cliente apenas sob demanda (?include=client_stats)
+        include_client_stats = 'client_stats' in request.args.get('include', '', type=str).split(',')
         
-        query = Contract.query
+        query = Contract.query.options(joinedload(Contract.client))
         
         if search:
-            query = query.filter(
-                Contract.title.ilike(f'%{search}%') |
-                Contract.contract_number.ilike(f'%{search}%')
-            )
+            query = query.filter(search_index.filter_for(Contract, search))
         
         if status:
             query = query.filter_by(status=status)
         
-        contracts = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        contracts = keyset_paginate(
+            query, Contract,
+            sort=request.args.get('sort', 'id', type=str),
+            order=request.args.get('order', 'asc', type=str),
+            cursor=request.args.get('cursor'),
+            per_page=per_page,
+            allowed_sorts=CONTRACT_SORT_FIELDS,
+            count_depends_on=('contracts',)
         )
         
         return jsonify({
-            'contracts': [contract.to_dict(include_client=True) for contract in contracts.items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': contracts.total,
-                'pages': contracts.pages,
-                'has_next': contracts.has_next,
-                'has_prev': contracts.has_prev
-            }
+            'contracts': Contract.to_dict_many(
+                contracts.items,
+                include_client=True,
+                include_client_stats=include_client_stats
+            ),
+            'pagination': contracts.to_dict()
         })
         
+    except InvalidCursor as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
     except Exception as e:
         current_app.logger.error(f"Erro ao listar contratos: {str(e)}")
         return jsonify({
@@ -284,36 +362,92 @@ def get_contracts():
             'message': 'Erro ao listar contratos'
         }), 500
 
+# Export endpoints
+@bp.route('/export/<any(clients, contracts):entity>.<any(csv, ndjson):fmt>', methods=['GET'])
+def export_table(entity, fmt):
+    """Exporta a tabela completa em CSV/NDJSON (streaming, gzip sob demanda)"""
+    from app.services import bulk_export
+    
+    compress = 'gzip' in request.accept_encodings
+    try:
+        chunks, mimetype = bulk_export.stream(
+            entity, fmt,
+            compress=compress,
+            search=request.args.get('search', '', type=str),
+            status=request.args.get('status', '', type=str),
+            sort=request.args.get('sort', 'id', type=str),
+            order=request.args.get('order', 'asc', type=str)
+        )
+    except ValueError as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename={entity}-{date.today().isoformat()}.{fmt}',
+        'Cache-Control': 'no-store',
+        'Vary': 'Accept-Encoding',
+        'X-Accel-Buffering': 'no'  # Envia os blocos sem buffering no nginx
+    }
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    
+    # O cursor fica aberto enquanto a resposta é enviada (contexto mantido)
+    return current_app.response_class(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+# Notification endpoints
+@bp.route('/notifications', methods=['GET'])
+@conditional_response(depends_on=('notifications',))
+def get_notifications():
+    """Lista notificações do usuário (mais recentes primeiro)"""
+    try:
+        # TODO: Obter user_id da sessão quando implementar auth
+        user_id = 1  # Temporário
+        per_page = min(request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+        
+        query = Notification.query.filter_by(user_id=user_id, is_active=True)
+        if request.args.get('unread', type=int):
+            query = query.filter_by(is_read=False)
+        
+        notifications = keyset_paginate(
+            query, Notification,
+            sort=request.args.get('sort', 'created_at', type=str),
+            order=request.args.get('order', 'desc', type=str),
+            cursor=request.args.get('cursor'),
+            per_page=per_page,
+            allowed_sorts=NOTIFICATION_SORT_FIELDS,
+            count_depends_on=('notifications',)
+        )
+        
+        return jsonify({
+            'notifications': [notification.to_dict() for notification in notifications.items],
+            'pagination': notifications.to_dict()
+        })
+        
+    except InvalidCursor as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Erro ao listar notificações: {str(e)}")
+        return jsonify({
+            'error': 'Internal Error',
+            'message': 'Erro ao listar notificações'
+        }), 500
+
 # Funções auxiliares
 def calculate_renewal_rate():
     """Calcula taxa de renovação (otimizado)"""
     # Use dashboard service for consistent data
     metrics = DashboardService.get_dashboard_metrics()
-    return metrics['taxa_renovacao']
+    return metrics.taxa_renovacao
 
 def get_upcoming_expirations():
-    """Retorna vencimentos próximos (otimizado)"""
-    today = date.today()
-    dates = []
-    
-    # Use dashboard service for consistent data
-    for i in range(3):
-        future_date = today + timedelta(days=30 * (i + 1))
-        expiring_contracts = DashboardService.get_upcoming_expirations(days=30*(i+1), limit=50)
-        
-        # Filter for specific date range
-        filtered_contracts = [
-            contract for contract in expiring_contracts
-            if contract.end_date <= future_date and contract.end_date >= today
-        ]
-        
-        total_value = sum(contract.value for contract in filtered_contracts)
-        
-        dates.append({
-            'data': future_date.strftime('%Y-%m-%d'),
-            'contratos': len(filtered_contracts),
-            'valor': float(total_value)
-        })
-    
-    return dates
+    """Retorna vencimentos próximos por janela (30/60/90 dias, uma query)"""
+    return [
+        {'data': window.until, 'contratos': window.count, 'valor': window.value}
+        for window in DashboardService.get_expiration_windows(UPCOMING_EXPIRY_DAYS)
+    ]
 
@@ -4,13 +4,50 @@ Constantes da aplicação - Centralização de configurações
 
 # Cache
 CACHE_TIMEOUT = 300  # 5 minutos
+CACHE_VERSIONED_TIMEOUT = 3600  # 1 hora - entradas invalidadas por versão de dados
 CACHE_SIZE_DEFAULT = 32
 CACHE_SIZE_SMALL = 16
 CACHE_SIZE_LARGE = 100
+CACHE_MAX_ENTRIES = 500  # limite de entradas dos backends memory/filesystem
+SNAPSHOT_RETENTION = 86400  # snapshots ficam disponíveis (obsoletos) por até 1 dia
+SNAPSHOT_LOCK_TIMEOUT = 30  # segundos
+SNAPSHOT_POLL_INTERVAL = 0.05  # espera pelo snapshot publicado por outro worker
+QUERY_CACHE_L1_SIZE = 1000  # resultados de queries mantidos na memória de cada processo
+SHARED_MEMORY_SIZE = 16 * 1024 * 1024  # arquivo mmap (dois slots de ~8 MB)
+SHARED_VERSION_SLOTS = 256  # tabelas com versão de dados no arquivo <path>.versions
 
 # Paginação
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
+PAGINATION_COUNT_TIMEOUT = 3600  # totais em cache, invalidados por versão de dados
+CLIENT_SORT_FIELDS = ('id', 'name', 'created_at')
+CONTRACT_SORT_FIELDS = ('id', 'created_at', 'end_date', 'value')
+NOTIFICATION_SORT_FIELDS = ('id', 'created_at')
+
+# Busca textual
+SEARCH_MAX_RESULTS = 1000
+SEARCH_TYPO_THRESHOLD = 0.5  # fração mínima de trigramas em comum
+SEARCH_REINDEX_BATCH = 1000
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+
+# Relatórios exportados
+EXPORT_BATCH_SIZE = 1000  # linhas lidas do cursor por lote
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # acima disso o arquivo gerado vai para o disco
+EXPORT_MAX_COLUMN_WIDTH = 60
+EXPORT_CHUNK_SIZE = 64 * 1024  # bytes por bloco das respostas CSV/NDJSON
+PARQUET_PART_ROWS = 100000  # linhas por arquivo Parquet (limita a memória da extração)
+PDF_CHUNK_ROWS = 1000  # linhas por bloco renderizado de forma independente
+PDF_MAX_ROWS_PER_FILE = 20000  # acima disso o PDF é dividido em partes (.zip)
+PDF_RENDER_WORKERS = 4
+
+# Contadores desnormalizados
+CLIENT_COUNTERS_REPAIR_CHUNK = 500  # clientes por transação no repair
+
+# Séries temporais
+TIME_SERIES_METRICS = ('contracts', 'revenue', 'expirations')
+TIME_SERIES_MAX_PERIODS = 366
+REVENUE_STATUSES = ('ativo', 'suspenso', 'concluído')  # contratos que geram receita
 
 # Rate Limiting
 DEFAULT_RATE_LIMIT = 100  # requisições por minuto
@@ -47,6 +84,9 @@ MAX_NAME_LENGTH = 100
 MAX_EMAIL_LENGTH = 120
 MAX_DOCUMENT_LENGTH = 20
 
+# Server-Sent Events
+SSE_EXPIRING_LIMIT = 20  # contratos a vencer acompanhados no stream
+
 # Datas
 DEFAULT_EXPIRY_DAYS = 30
 UPCOMING_EXPIRY_DAYS = [30, 60, 90]
@@ -6,5 +6,6 @@ from app.models.user import User
 from app.models.client import Client
 from app.models.contract import Contract
 from app.models.notification import Notification
+from app.models.dashboard_aggregate import DashboardAggregate
 
-__all__ = ['User', 'Client', 'Contract', 'Notification']
+__all__ = ['User', 'Client', 'Contract', 'Notification', 'DashboardAggregate']
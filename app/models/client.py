@@ -27,6 +27,12 @@ class Client(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     
+    # Contadores desnormalizados (mantidos por app/services/client_counters.py)
+    contract_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    active_contract_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    contract_value_total = db.Column(db.Numeric(15, 2), default=0, server_default='0', nullable=False)
+    next_expiration_date = db.Column(db.Date)  # menor end_date entre contratos ativos
+    
     # Relacionamentos
     contracts = db.relationship('Contract', backref='client', lazy='dynamic', cascade='all, delete-orphan')
     
@@ -34,6 +40,9 @@ class Client(db.Model):
     __table_args__ = (
         Index('idx_client_name_active', 'name', 'is_active'),
         Index('idx_client_created_by', 'created_by'),
+        # Paginação por cursor: coluna de ordenação + id
+        Index('idx_client_name_id', 'name', 'id'),
+        Index('idx_client_created_at_id', 'created_at', 'id'),
     )
     
     def __init__(self, name, email, created_by, **kwargs):
@@ -45,22 +54,17 @@ class Client(db.Model):
     @property
     def contracts_count(self):
         """Retorna número de contratos do cliente"""
-        return self.contracts.count()
+        return self.contract_count or 0
     
     @property
     def active_contracts_count(self):
         """Retorna número de contratos ativos"""
-        return self.contracts.filter_by(status='ativo').count()
+        return self.active_contract_count or 0
     
     @property
     def total_contract_value(self):
         """Retorna valor total de todos os contratos"""
-        # Import local para evitar circular import
-        from app.models.contract import Contract
-        result = db.session.query(db.func.sum(Contract.value)).filter(
-            Contract.client_id == self.id
-        ).scalar()
-        return float(result) if result else 0.0
+        return float(self.contract_value_total) if self.contract_value_total else 0.0
     
     @property
     def average_contract_value(self):
@@ -70,6 +74,22 @@ class Client(db.Model):
             return 0.0
         return self.total_contract_value / count
     
+    @property
+    def aggregates(self):
+        """Agregados de contratos lidos dos contadores armazenados"""
+        return {
+            'contracts_count': self.contracts_count,
+            'active_contracts_count': self.active_contracts_count,
+            'total_contract_value': self.total_contract_value,
+            'average_contract_value': self.average_contract_value,
+            'next_expiration_date': self.next_expiration_date.isoformat() if self.next_expiration_date else None
+        }
+    
+    @classmethod
+    def to_dict_many(cls, clients):
+        """Serializa uma lista de clientes (agregados já estão nas linhas)"""
+        return [client.to_dict() for client in clients]
+    
     def get_contracts_by_status(self, status):
         """Retorna contratos por status"""
         return self.contracts.filter_by(status=status).all()
@@ -91,8 +111,17 @@ class Client(db.Model):
             Contract.status == 'ativo'
         ).all()
     
-    def to_dict(self, include_contracts=False):
-        """Converte para dicionário (API)"""
+    def to_dict(self, include_contracts=False, aggregates=None):
+        """
+        Converte para dicionário (API)
+        
+        Args:
+            include_contracts (bool): Incluir a lista de contratos
+            aggregates (dict): Agregados já carregados (padrão: contadores do próprio cliente)
+        """
+        if aggregates is None:
+            aggregates = self.aggregates
+        
         data = {
             'id': self.id,
             'name': self.name,
@@ -107,10 +136,7 @@ class Client(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'is_active': self.is_active,
-            'contracts_count': self.contracts_count,
-            'active_contracts_count': self.active_contracts_count,
-            'total_contract_value': self.total_contract_value,
-            'average_contract_value': self.average_contract_value
+            **aggregates
         }
         
         if include_contracts:
@@ -118,6 +144,18 @@ class Client(db.Model):
         
         return data
     
+    def to_summary_dict(self):
+        """Resumo leve do cliente (sem agregados) para embutir em outros recursos"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'document': self.document,
+            'city': self.city,
+            'state': self.state,
+            'is_active': self.is_active
+        }
+    
     def update_from_dict(self, data):
         """Atualiza cliente a partir de dicionário"""
         allowed_fields = ['name', 'email', 'phone', 'document', 'address', 
@@ -134,12 +172,9 @@ class Client(db.Model):
     
     @classmethod
     def search(cls, query, user_id=None):
-        """Busca clientes por nome, email ou documento"""
-        search_filter = cls.name.ilike(f'%{query}%') | \
-                        cls.email.ilike(f'%{query}%') | \
-                        cls.document.ilike(f'%{query}%')
-        
-        base_query = cls.query.filter(search_filter)
+        """Busca clientes por nome, email ou documento (índice de busca)"""
+        from app.services.search_service import search_index
+        base_query = cls.query.filter(search_index.filter_for(cls, query))
         
         if user_id:
             base_query = base_query.filter_by(created_by=user_id)
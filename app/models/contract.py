@@ -56,8 +56,13 @@ class Contract(db.Model):
                        name='check_contract_status'),
         Index('idx_contract_client_status', 'client_id', 'status'),
         Index('idx_contract_dates', 'start_date', 'end_date'),
-        Index('idx_contract_value', 'value'),
         Index('idx_contract_created_by', 'created_by'),
+        # Vencimentos de contratos ativos (janelas do dashboard)
+        Index('idx_contracts_status_end_date', 'status', 'end_date'),
+        # Paginação por cursor: coluna de ordenação + id
+        Index('idx_contract_value_id', 'value', 'id'),
+        Index('idx_contract_end_date_id', 'end_date', 'id'),
+        Index('idx_contract_created_at_id', 'created_at', 'id'),
     )
     
     def __init__(self, title, client_id, value, start_date, end_date, created_by, **kwargs):
@@ -148,8 +153,15 @@ class Contract(db.Model):
             return True
         return False
     
-    def to_dict(self, include_client=False):
-        """Converte para dicionário (API)"""
+    def to_dict(self, include_client=False, client_aggregates=None):
+        """
+        Converte para dicionário (API)
+        
+        Args:
+            include_client (bool): Embutir o resumo do cliente
+            client_aggregates (dict): Agregados do cliente (ver Client.aggregates);
+                quando informado, o cliente é serializado completo
+        """
         data = {
             'id': self.id,
             'title': self.title,
@@ -180,10 +192,29 @@ class Contract(db.Model):
         }
         
         if include_client and self.client:
-            data['client'] = self.client.to_dict()
+            if client_aggregates is not None:
+                data['client'] = self.client.to_dict(aggregates=client_aggregates)
+            else:
+                data['client'] = self.client.to_summary_dict()
         
         return data
     
+    @classmethod
+    def to_dict_many(cls, contracts, include_client=True, include_client_stats=False):
+        """
+        Serializa uma lista de contratos (carregue os clientes com joinedload)
+        
+        Com include_client_stats, o cliente embutido inclui os contadores
+        armazenados (sem queries adicionais).
+        """
+        return [
+            contract.to_dict(
+                include_client=include_client,
+                client_aggregates=contract.client.aggregates if include_client_stats and contract.client else None
+            )
+            for contract in contracts
+        ]
+    
     def update_from_dict(self, data):
         """Atualiza contrato a partir de dicionário"""
         allowed_fields = [
@@ -209,11 +240,9 @@ class Contract(db.Model):
     
     @classmethod
     def search(cls, query, user_id=None):
-        """Busca contratos por título ou número"""
-        search_filter = cls.title.ilike(f'%{query}%') | \
-                        cls.contract_number.ilike(f'%{query}%')
-        
-        base_query = cls.query.filter(search_filter)
+        """Busca contratos por título ou número (índice de busca)"""
+        from app.services.search_service import search_index
+        base_query = cls.query.filter(search_index.filter_for(cls, query))
         
         if user_id:
             base_query = base_query.filter_by(created_by=user_id)
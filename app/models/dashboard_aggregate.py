@@ -0,0 +1,25 @@
+"""
+Model de Agregado do Dashboard - Totais mantidos incrementalmente
+"""
+
+from app.utils.imports import datetime
+from app import db
+
+class DashboardAggregate(db.Model):
+    """
+    Uma linha por métrica do dashboard (contagem e soma de valores)
+
+    Mantida por deltas em app/services/dashboard_aggregates.py a cada escrita
+    de clientes e contratos pelo ORM.
+    """
+
+    __tablename__ = 'dashboard_aggregates'
+
+    # clients, clients:active, contracts:status:<status>, contracts:auto_renew
+    metric = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    value_total = db.Column(db.Numeric(15, 2), default=0, server_default='0', nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DashboardAggregate {self.metric}: {self.count}>'
@@ -2,7 +2,7 @@
 Model de Notificação - Sistema de alertas
 """
 
-from app.utils.imports import datetime
+from app.utils.imports import datetime, Index
 from app import db
 
 class Notification(db.Model):
@@ -34,6 +34,11 @@ class Notification(db.Model):
     # Relacionamentos
     user = db.relationship('User', backref=db.backref('notifications', lazy='dynamic'))
     
+    # Índices compostos (paginação por cursor)
+    __table_args__ = (
+        Index('idx_notification_user_created_id', 'user_id', 'created_at', 'id'),
+    )
+    
     def mark_as_read(self):
         """Marca notificação como lida"""
         if not self.is_read:
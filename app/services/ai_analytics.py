@@ -6,6 +6,8 @@ import random
 from datetime import datetime, timedelta, date
 from app import db
 from app.models import Contract, Client, Notification
+from app.utils.cache import cache
+from app.constants import CACHE_VERSIONED_TIMEOUT
 
 class AIAnalyticsService:
     """Serviço de IA para analytics e recomendações"""
@@ -34,6 +36,28 @@ class AIAnalyticsService:
             ]
         }
     
+    @staticmethod
+    def get_recommendations_cached(limit=5):
+        """Recomendações em cache até clientes ou contratos mudarem ou o dia virar"""
+        return AIAnalyticsService.get_recommendations_for_day(date.today(), limit)
+    
+    @staticmethod
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('clients', 'contracts'))
+    def get_recommendations_for_day(today, limit=5):
+        """Recomendações do dia (today na chave: os prazos dependem da data)"""
+        return AIAnalyticsService().generate_recommendations(limit)
+    
+    @staticmethod
+    def get_risk_analysis_cached():
+        """Análise de risco em cache até clientes ou contratos mudarem ou o dia virar"""
+        return AIAnalyticsService.get_risk_analysis_for_day(date.today())
+    
+    @staticmethod
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('clients', 'contracts'))
+    def get_risk_analysis_for_day(today):
+        """Análise de risco do dia (today na chave: dias até o vencimento e score)"""
+        return AIAnalyticsService().generate_risk_analysis()
+    
     def generate_recommendations(self, limit=5):
         """Gera recomendações personalizadas baseadas nos dados"""
         recommendations = []
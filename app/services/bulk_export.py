@@ -0,0 +1,108 @@
+"""
+Bulk Export - Tabelas completas em CSV/NDJSON direto do cursor
+
+Para cargas diárias de BI: uma query de colunas (sem objetos ORM) lida em
+lotes com yield_per e serializada em blocos pelos geradores de
+app/utils/streaming_export.py. A memória usada não depende do tamanho da
+tabela. Os filtros são os mesmos das listagens da API (search, status,
+sort/order).
+"""
+
+from sqlalchemy import select
+
+from app import db
+from app.models import Client, Contract
+from app.services.search_service import search_index
+from app.utils.streaming_export import iter_csv, iter_ndjson, gzip_chunks
+from app.constants import CLIENT_SORT_FIELDS, CONTRACT_SORT_FIELDS, EXPORT_BATCH_SIZE
+
+FORMATS = {
+    'csv': (iter_csv, 'text/csv'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson')
+}
+
+
+def _client_columns():
+    return [
+        Client.id, Client.name, Client.email, Client.phone, Client.document,
+        Client.address, Client.city, Client.state, Client.postal_code, Client.country,
+        Client.is_active, Client.contract_count, Client.active_contract_count,
+        Client.contract_value_total, Client.next_expiration_date,
+        Client.created_at, Client.updated_at
+    ]
+
+
+def _contract_columns():
+    return [
+        Contract.id, Contract.title, Contract.description, Contract.client_id,
+        Client.name.label('client_name'), Contract.contract_number, Contract.value,
+        Contract.currency, Contract.start_date, Contract.end_date, Contract.signature_date,
+        Contract.status, Contract.contract_type, Contract.auto_renew, Contract.renewal_days,
+        Contract.payment_method, Contract.payment_frequency, Contract.created_by,
+        Contract.created_at, Contract.updated_at
+    ]
+
+
+# entidade -> (modelo, colunas, ordenações permitidas)
+ENTITIES = {
+    'clients': (Client, _client_columns, CLIENT_SORT_FIELDS),
+    'contracts': (Contract, _contract_columns, CONTRACT_SORT_FIELDS)
+}
+
+
+def build_query(entity, search='', status='', sort='id', order='asc'):
+    """
+    Select de colunas da entidade com os filtros das listagens
+
+    Raises:
+        ValueError: Entidade, ordenação ou direção inválida
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f'Exportação inválida: {entity}')
+    model, columns, allowed_sorts = ENTITIES[entity]
+    if sort not in allowed_sorts:
+        raise ValueError(f'Ordenação inválida: {sort}')
+    if order not in ('asc', 'desc'):
+        raise ValueError(f'Direção inválida: {order}')
+
+    statement = select(*columns())
+    if model is Contract:
+        statement = statement.join(Client, Contract.client_id == Client.id)
+        if status:
+            statement = statement.where(Contract.status == status)
+    if search:
+        statement = statement.where(search_index.filter_for(model, search))
+
+    # id como desempate: ordem estável entre execuções
+    keys = [getattr(model, sort)] + ([model.id] if sort != 'id' else [])
+    return statement.order_by(*(key.desc() if order == 'desc' else key.asc() for key in keys))
+
+
+def iter_rows(statement, batch_size=EXPORT_BATCH_SIZE):
+    """Tuplas do cursor lidas em lotes (cursor do servidor onde suportado)"""
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    for row in result:
+        yield tuple(row)
+
+
+def stream(entity, fmt, compress=False, **filters):
+    """
+    Gerador de blocos de bytes da exportação
+
+    Args:
+        entity (str): clients ou contracts
+        fmt (str): csv ou ndjson
+        compress (bool): Comprimir com gzip durante o envio
+        **filters: search, status, sort, order
+
+    Returns:
+        tuple: (gerador, mimetype)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato inválido: {fmt}')
+    serializer, mimetype = FORMATS[fmt]
+
+    statement = build_query(entity, **filters)
+    columns = [column['name'] for column in statement.column_descriptions]
+    chunks = serializer(columns, iter_rows(statement))
+    return (gzip_chunks(chunks) if compress else chunks), mimetype
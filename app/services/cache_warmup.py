@@ -0,0 +1,175 @@
+"""
+Cache Warm-up - Aquecimento na inicialização e hand-off dos snapshots no deploy
+
+Ao encerrar, o processo grava em disco os snapshots do dashboard ainda
+válidos junto com a impressão digital durável das tabelas de que dependem
+(data_versions.fingerprint). Na inicialização seguinte eles são recarregados
+se a impressão digital ainda bater, e os resultados quentes do DashboardService
+e do AIAnalyticsService são recalculados em segundo plano antes das primeiras
+requisições. O aquecimento automático só é iniciado por quem serve requisições
+(hook post_worker_init do gunicorn.conf.py e `python run.py`), nunca por
+comandos da CLI ou pelo deploy; `flask warm-cache` faz o mesmo sob demanda
+(ex.: após o deploy).
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import date
+
+from app.utils import data_versions
+from app.utils.snapshot import snapshots
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+
+
+def _tasks():
+    """Resultados quentes de /, /dashboard e /analytics"""
+    from app.services.ai_analytics import AIAnalyticsService
+    from app.services.dashboard_service import DashboardService
+
+    return (
+        ('basic_stats', DashboardService.get_basic_stats),
+        ('dashboard', DashboardService.get_full_dashboard_data),
+        ('analytics', DashboardService.get_analytics_data),
+        ('ai_recommendations', lambda: AIAnalyticsService.get_recommendations_cached(5)),
+        ('ai_risk_analysis', AIAnalyticsService.get_risk_analysis_cached),
+    )
+
+
+def warm_up():
+    """
+    Calcula os resultados quentes (requer app context)
+
+    Returns:
+        dict: tarefa -> segundos (None se falhou)
+    """
+    timings = {}
+    for name, task in _tasks():
+        started = time.perf_counter()
+        try:
+            task()
+            timings[name] = time.perf_counter() - started
+        except Exception as e:
+            logger.error(f"Falha no aquecimento de {name}: {e}")
+            timings[name] = None
+    return timings
+
+
+def save_snapshots(path):
+    """
+    Grava os snapshots válidos e a impressão digital dos dados (requer app context)
+
+    Returns:
+        int: Snapshots gravados
+    """
+    exported = snapshots.export()
+    if not exported:
+        return 0
+
+    tables = sorted({table for entry in exported.values() for table in entry['depends_on']})
+    payload = {
+        'format': _FORMAT_VERSION,
+        'fingerprint': data_versions.fingerprint(*tables),
+        'snapshots': exported,
+    }
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.warm')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(exported)
+
+
+def load_snapshots(path):
+    """
+    Recarrega os snapshots gravados se os dados não mudaram desde então
+
+    Snapshots de dias anteriores (chaves com a data) são descartados.
+
+    Returns:
+        int: Snapshots restaurados
+    """
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        logger.warning(f"Snapshots persistidos ilegíveis em {path}: {e}")
+        return 0
+
+    if payload.get('format') != _FORMAT_VERSION:
+        return 0
+    fingerprint = payload['fingerprint']
+    if data_versions.fingerprint(*fingerprint) != fingerprint:
+        logger.info("Dados alterados desde o último encerramento; snapshots descartados")
+        return 0
+
+    stale_day = [key for key in payload['snapshots'] if _is_other_day(key)]
+    for key in stale_day:
+        del payload['snapshots'][key]
+    return snapshots.restore(payload['snapshots'])
+
+
+def _is_other_day(key):
+    """Chaves como dashboard:full:2024-01-31 valem apenas para o dia"""
+    suffix = key.rsplit(':', 1)[-1]
+    return len(suffix) == 10 and suffix[4] == '-' and suffix != date.today().isoformat()
+
+
+def start(app):
+    """
+    Restaura snapshots, aquece em segundo plano e grava ao encerrar (CACHE_WARMUP)
+
+    Chamado apenas pelos processos que servem requisições: create_app também
+    roda em `flask db upgrade`, nos demais comandos e no deploy, antes mesmo
+    das tabelas existirem.
+    """
+    if not app.config.get('CACHE_WARMUP'):
+        return
+
+    path = app.config.get('CACHE_WARMUP_PATH')
+
+    def run():
+        try:
+            with app.app_context():
+                if path:
+                    restored = load_snapshots(path)
+                    if restored:
+                        logger.info(f"{restored} snapshots restaurados de {path}")
+                timings = warm_up()
+                logger.info("Cache aquecido: " + ", ".join(
+                    f"{name}={seconds:.3f}s" if seconds is not None else f"{name}=erro"
+                    for name, seconds in timings.items()
+                ))
+        except Exception as e:
+            logger.error(f"Falha no aquecimento do cache: {e}")
+
+    if path:
+        atexit.register(_save_on_exit, app, path)
+
+    threading.Thread(target=run, name='cache-warmup', daemon=True).start()
+
+
+def _save_on_exit(app, path):
+    try:
+        with app.app_context():
+            saved = save_snapshots(path)
+            if saved:
+                logger.info(f"{saved} snapshots gravados em {path}")
+    except Exception as e:
+        logger.error(f"Falha ao gravar snapshots: {e}")
@@ -0,0 +1,166 @@
+"""
+Client Counters - Contadores de contratos desnormalizados em clients
+
+Quando contratos são inseridos, alterados (status, valor, vencimento, cliente)
+ou removidos pelo ORM, os contadores dos clientes afetados são recalculados
+no mesmo flush/transação com um UPDATE por subconsultas indexadas
+(contracts.client_id), depois de travar as linhas dos clientes com FOR NO KEY UPDATE.
+Assim ler o resumo de um cliente é uma busca por chave primária. UPDATE/DELETE em massa ou SQL bruto exigem `flask repair-client-counters`.
+"""
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app import db
+from app.constants import CLIENT_COUNTERS_REPAIR_CHUNK
+
+_SESSION_KEY = 'client_counters'
+
+# Campos do contrato que alteram os contadores do cliente
+_TRACKED_FIELDS = ('client_id', 'status', 'value', 'end_date')
+
+COUNTER_FIELDS = ('contract_count', 'active_contract_count', 'contract_value_total', 'next_expiration_date')
+
+
+def _counter_values():
+    """Subconsultas correlacionadas que recalculam os contadores de cada cliente"""
+    from app.models.client import Client
+    from app.models.contract import Contract
+
+    clients = Client.__table__
+    contracts = Contract.__table__
+    own = contracts.c.client_id == clients.c.id
+    active = contracts.c.status == 'ativo'
+
+    return {
+        'contract_count': select(func.count()).where(own).scalar_subquery(),
+        'active_contract_count': select(func.count()).where(own, active).scalar_subquery(),
+        'contract_value_total': select(func.coalesce(func.sum(contracts.c.value), 0)).where(own).scalar_subquery(),
+        'next_expiration_date': select(func.min(contracts.c.end_date)).where(own, active).scalar_subquery(),
+    }
+
+
+def lock_statement(client_ids):
+    """
+    SELECT ... FOR NO KEY UPDATE das linhas dos clientes, em ordem de id
+
+    FOR NO KEY UPDATE (e não FOR UPDATE) não conflita com o FOR KEY SHARE que a
+    checagem da chave estrangeira contracts.client_id mantém no cliente: dois
+    inserts de contrato do mesmo cliente não entram em deadlock no recálculo.
+    """
+    from app.models.client import Client
+
+    clients = Client.__table__
+    return (select(clients.c.id)
+            .where(clients.c.id.in_(client_ids))
+            .order_by(clients.c.id)
+            .with_for_update(key_share=True))
+
+
+def refresh(connection, client_ids):
+    """Recalcula os contadores dos clientes informados"""
+    from app.models.client import Client
+
+    client_ids = sorted({client_id for client_id in client_ids if client_id is not None})
+    if not client_ids:
+        return 0
+
+    # Trava os clientes (em ordem de id) antes de recalcular: em READ COMMITTED
+    # o UPDATE seguinte usa um snapshot novo, com os contratos de quem segurava
+    # a trava. No SQLite a trava é omitida (a escrita já serializa o banco).
+    connection.execute(lock_statement(client_ids))
+
+    result = connection.execute(
+        update(Client.__table__)
+        .where(Client.__table__.c.id.in_(client_ids))
+        .values(**_counter_values())
+    )
+    return result.rowcount
+
+
+def repair(chunk_size=CLIENT_COUNTERS_REPAIR_CHUNK):
+    """
+    Recalcula os contadores de todos os clientes em blocos de ids
+
+    Cada bloco é confirmado separadamente para não segurar locks longos.
+
+    Returns:
+        int: Clientes atualizados
+    """
+    from app.models.client import Client
+
+    total = 0
+    last_id = 0
+    while True:
+        ids = db.session.execute(
+            select(Client.id).where(Client.id > last_id).order_by(Client.id).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        total += refresh(db.session.connection(), ids)
+        db.session.commit()
+        last_id = ids[-1]
+
+    db.session.expire_all()
+    return total
+
+
+def init_app(app):
+    """Registra a manutenção dos contadores no ORM (idempotente)"""
+    from app.models.contract import Contract
+
+    for name, listener in (('after_flush', _after_flush),
+                           ('after_flush_postexec', _after_flush_postexec)):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+    # active_history: carrega o client_id anterior mesmo se o atributo expirou,
+    # para recalcular também o cliente de origem de um contrato movido
+    if not event.contains(Contract.client_id, 'set', _client_id_set):
+        event.listen(Contract.client_id, 'set', _client_id_set, active_history=True)
+
+
+def _client_id_set(target, value, oldvalue, initiator):
+    """Sem efeito; existe apenas para ativar active_history em client_id"""
+
+
+def _affected_clients(session):
+    from app.models.contract import Contract
+
+    client_ids = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Contract):
+            client_ids.add(obj.client_id)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Contract):
+            continue
+        attrs = inspect(obj).attrs
+        histories = [attrs[field].history for field in _TRACKED_FIELDS]
+        if any(history.has_changes() for history in histories):
+            client_ids.add(obj.client_id)
+            # Contrato movido de cliente: o anterior também muda
+            client_ids.update(attrs.client_id.history.deleted)
+
+    client_ids.discard(None)
+    return client_ids
+
+
+def _after_flush(session, flush_context):
+    """Atualiza os contadores na mesma transação do flush"""
+    client_ids = _affected_clients(session)
+    if client_ids:
+        refresh(session.connection(), client_ids)
+        session.info.setdefault(_SESSION_KEY, set()).update(client_ids)
+
+
+def _after_flush_postexec(session, flush_context):
+    """Expira os contadores dos clientes já carregados na sessão"""
+    from app.models.client import Client
+
+    for client_id in session.info.pop(_SESSION_KEY, ()):
+        client = session.identity_map.get(identity_key(Client, client_id))
+        if client is not None:
+            session.expire(client, COUNTER_FIELDS)
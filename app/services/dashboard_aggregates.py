@@ -0,0 +1,335 @@
+"""
+Dashboard Aggregates - Totais do dashboard mantidos por deltas
+
+A tabela `dashboard_aggregates` guarda uma linha por métrica (contagem e soma
+de valores): total de clientes, clientes ativos, contratos por status e
+contratos com renovação automática. Cada flush que insere, altera ou remove
+clientes/contratos pelo ORM aplica apenas a diferença (upsert com
+count = count + n) na mesma transação, então ler os totais do dashboard não percorre as tabelas.
+Totais de contratos são a soma das linhas por status.
+
+UPDATE/DELETE em massa ou SQL bruto não passam pelos listeners:
+`flask verify-dashboard-aggregates` compara a tabela com um recálculo completo
+e `--fix` a reconstrói.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import case, delete, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+
+_SESSION_KEY = 'dashboard_aggregates'
+
+CLIENTS = 'clients'
+CLIENTS_ACTIVE = 'clients:active'
+CONTRACTS_AUTO_RENEW = 'contracts:auto_renew'
+STATUS_PREFIX = 'contracts:status:'
+
+# Campos que mudam as métricas (active_history para conhecer o valor anterior)
+_CONTRACT_FIELDS = ('status', 'value', 'auto_renew')
+_CLIENT_FIELDS = ('is_active',)
+
+_CENTS = Decimal('0.01')
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(_CENTS)
+
+
+def _contract_metrics(status, value, auto_renew):
+    """Métricas às quais um contrato contribui, com o valor de cada uma"""
+    value = _money(value)
+    metrics = [(f'{STATUS_PREFIX}{status}', value)]
+    if auto_renew:
+        metrics.append((CONTRACTS_AUTO_RENEW, value))
+    return metrics
+
+
+def _client_metrics(is_active):
+    metrics = [(CLIENTS, Decimal('0'))]
+    if is_active:
+        metrics.append((CLIENTS_ACTIVE, Decimal('0')))
+    return metrics
+
+
+def _metrics_for(model_name, values):
+    if model_name == 'Contract':
+        return _contract_metrics(values['status'], values['value'], values['auto_renew'])
+    return _client_metrics(values['is_active'])
+
+
+def _tracked(obj):
+    """(nome do model, campos acompanhados) ou None"""
+    from app.models.client import Client
+    from app.models.contract import Contract
+
+    if isinstance(obj, Contract):
+        return 'Contract', _CONTRACT_FIELDS
+    if isinstance(obj, Client):
+        return 'Client', _CLIENT_FIELDS
+    return None
+
+
+def _table():
+    from app.models.dashboard_aggregate import DashboardAggregate
+    return DashboardAggregate.__table__
+
+
+def _dialect_insert(connection):
+    """insert() com ON CONFLICT do dialeto, ou None se não houver suporte"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif connection.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def apply_deltas(connection, deltas):
+    """
+    Soma os deltas às métricas, criando as linhas que ainda não existem
+
+    Usa um único INSERT ... ON CONFLICT (metric) DO UPDATE por métrica: duas
+    transações criando a mesma métrica (ex.: primeiro contrato de um status)
+    não colidem na chave primária.
+
+    Args:
+        connection: Conexão da transação corrente
+        deltas (dict): métrica -> [delta de contagem, delta de valor]
+    """
+    table = _table()
+    now = datetime.utcnow()
+    dialect_insert = _dialect_insert(connection)
+    for metric, (count, value) in sorted(deltas.items()):
+        if not count and not value:
+            continue
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(metric=metric, count=count, value_total=value, updated_at=now)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.metric],
+                set_={'count': table.c.count + statement.excluded.count,
+                      'value_total': table.c.value_total + statement.excluded.value_total,
+                      'updated_at': statement.excluded.updated_at}
+            ))
+            continue
+
+        result = connection.execute(
+            update(table)
+            .where(table.c.metric == metric)
+            .values(count=table.c.count + count,
+                    value_total=table.c.value_total + value,
+                    updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(table).values(metric=metric, count=count, value_total=value, updated_at=now)
+            )
+
+
+def read(connection=None):
+    """
+    Métricas armazenadas
+
+    Returns:
+        dict: métrica -> (contagem, soma de valores)
+    """
+    table = _table()
+    connection = connection or db.session.connection()
+    rows = connection.execute(select(table.c.metric, table.c.count, table.c.value_total))
+    return {metric: (count, _money(value_total)) for metric, count, value_total in rows}
+
+
+def summary(metrics=None):
+    """
+    Totais do dashboard a partir das métricas armazenadas
+
+    Returns:
+        dict: total_clients, active_clients, total_contracts, total_value,
+              by_status (status -> (contagem, valor)), auto_renew_contracts
+    """
+    metrics = read() if metrics is None else metrics
+    by_status = {
+        metric[len(STATUS_PREFIX):]: values
+        for metric, values in metrics.items()
+        if metric.startswith(STATUS_PREFIX) and values[0]
+    }
+    return {
+        'total_clients': metrics.get(CLIENTS, (0, 0))[0],
+        'active_clients': metrics.get(CLIENTS_ACTIVE, (0, 0))[0],
+        'total_contracts': sum(count for count, _ in by_status.values()),
+        'total_value': sum((value for _, value in by_status.values()), Decimal('0')),
+        'by_status': by_status,
+        'auto_renew_contracts': metrics.get(CONTRACTS_AUTO_RENEW, (0, 0))[0],
+    }
+
+
+def recompute():
+    """
+    Recalcula todas as métricas com varreduras completas
+
+    Returns:
+        dict: métrica -> (contagem, soma de valores)
+    """
+    from app.models.client import Client
+    from app.models.contract import Contract
+
+    metrics = {}
+
+    total, active = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(case((Client.is_active.is_(True), 1), else_=0)), 0))
+        .select_from(Client)
+    ).one()
+    metrics[CLIENTS] = (total, _money(0))
+    metrics[CLIENTS_ACTIVE] = (active, _money(0))
+
+    rows = db.session.execute(
+        select(Contract.status, func.count(), func.coalesce(func.sum(Contract.value), 0))
+        .group_by(Contract.status)
+    )
+    for status, count, value in rows:
+        metrics[f'{STATUS_PREFIX}{status}'] = (count, _money(value))
+
+    count, value = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(Contract.value), 0))
+        .where(Contract.auto_renew.is_(True))
+    ).one()
+    metrics[CONTRACTS_AUTO_RENEW] = (count, _money(value))
+
+    return metrics
+
+
+def verify():
+    """
+    Compara a tabela com o recálculo completo
+
+    Returns:
+        list: (métrica, armazenado, esperado) para cada divergência
+    """
+    stored = read()
+    expected = recompute()
+    empty = (0, _money(0))
+
+    return [
+        (metric, stored.get(metric, empty), expected.get(metric, empty))
+        for metric in sorted(set(stored) | set(expected))
+        if stored.get(metric, empty) != expected.get(metric, empty)
+    ]
+
+
+def rebuild():
+    """
+    Substitui a tabela pelo recálculo completo (numa única transação)
+
+    Returns:
+        int: Métricas gravadas
+    """
+    metrics = recompute()
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    connection.execute(delete(_table()))
+    connection.execute(insert(_table()), [
+        {'metric': metric, 'count': count, 'value_total': value, 'updated_at': now}
+        for metric, (count, value) in metrics.items()
+    ])
+    db.session.commit()
+    return len(metrics)
+
+
+def init_app(app):
+    """Registra a manutenção por deltas no ORM (idempotente)"""
+    from app.models.client import Client
+    from app.models.contract import Contract
+
+    for name, listener in (('before_flush', _before_flush),
+                           ('after_flush', _after_flush),
+                           ('after_rollback', _after_rollback)):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+    # active_history: o valor anterior é carregado mesmo se o atributo expirou
+    for attribute in [getattr(Contract, field) for field in _CONTRACT_FIELDS] + \
+                     [getattr(Client, field) for field in _CLIENT_FIELDS]:
+        if not event.contains(attribute, 'set', _attribute_set):
+            event.listen(attribute, 'set', _attribute_set, active_history=True)
+
+
+def _attribute_set(target, value, oldvalue, initiator):
+    """Sem efeito; existe apenas para ativar active_history"""
+
+
+def _before_flush(session, flush_context, instances):
+    """Guarda os valores dos objetos a remover enquanto a linha ainda existe"""
+    removed = session.info.setdefault(_SESSION_KEY, {})
+    for obj in session.deleted:
+        tracked = _tracked(obj)
+        if tracked and id(obj) not in removed:
+            model_name, fields = tracked
+            removed[id(obj)] = {field: getattr(obj, field) for field in fields}
+
+
+def _previous_values(obj, fields):
+    """Valores antes das alterações pendentes (None se o objeto não mudou)"""
+    attrs = inspect(obj).attrs
+    histories = {field: attrs[field].history for field in fields}
+    if not any(history.has_changes() for history in histories.values()):
+        return None
+
+    previous = {}
+    for field, history in histories.items():
+        if history.deleted:
+            previous[field] = history.deleted[0]
+        elif history.added:
+            previous[field] = None
+        else:
+            previous[field] = attrs[field].value
+    return previous
+
+
+def _after_flush(session, flush_context):
+    """Aplica os deltas do flush na mesma transação"""
+    removed = session.info.pop(_SESSION_KEY, {})
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+
+    def add(model_name, values, sign):
+        for metric, value in _metrics_for(model_name, values):
+            deltas[metric][0] += sign
+            deltas[metric][1] += sign * value
+
+    for obj in session.new:
+        tracked = _tracked(obj)
+        if tracked:
+            model_name, fields = tracked
+            add(model_name, {field: getattr(obj, field) for field in fields}, 1)
+
+    for obj in session.dirty:
+        tracked = _tracked(obj)
+        if not tracked:
+            continue
+        model_name, fields = tracked
+        previous = _previous_values(obj, fields)
+        if previous is not None:
+            add(model_name, previous, -1)
+            add(model_name, {field: getattr(obj, field) for field in fields}, 1)
+
+    for obj in session.deleted:
+        tracked = _tracked(obj)
+        if tracked:
+            model_name, fields = tracked
+            values = removed.get(id(obj))
+            if values is None:
+                # Removido por cascata durante o flush: usa o que está carregado
+                state = inspect(obj).dict
+                values = {field: state.get(field) for field in fields}
+            add(model_name, values, -1)
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -2,82 +2,67 @@
 Dashboard Service - Centralized dashboard data queries with optimization
 """
 
-from datetime import datetime, date, timedelta
-from functools import lru_cache
+from datetime import date, timedelta
 from flask import current_app
-from sqlalchemy import text
+from sqlalchemy.orm import joinedload
 from app import db
 from app.models import Client, Contract, Notification
-from app.constants import CACHE_TIMEOUT, CACHE_SIZE_DEFAULT, CACHE_SIZE_SMALL, DEFAULT_EXPIRY_DAYS
+from app.services import dashboard_aggregates
+from app.services.dto import BasicStats, DashboardMetrics, ClientValue, StatusCount, ExpirationWindow
+from app.utils import time_buckets
+from app.utils.cache import cache
+from app.utils.parallel import QueryGroup
+from app.utils.snapshot import snapshots
+from app.constants import CACHE_TIMEOUT, CACHE_VERSIONED_TIMEOUT, DEFAULT_EXPIRY_DAYS, REVENUE_STATUSES, UPCOMING_EXPIRY_DAYS
 
 
 class DashboardService:
     """Service for optimized dashboard data retrieval"""
     
     @staticmethod
-    @lru_cache(maxsize=CACHE_SIZE_DEFAULT)
-    def get_basic_stats_cached():
-        """Get basic statistics with caching - optimized queries"""
-        # Use direct COUNT instead of subqueries for better performance
-        today = date.today()
-        results = db.session.execute(
-            text("""
-            SELECT 
-                COUNT(*) as total_clients,
-                (SELECT COUNT(*) FROM contracts) as total_contracts,
-                (SELECT COUNT(*) FROM contracts WHERE status = 'ativo') as active_contracts,
-                (SELECT COALESCE(SUM(value), 0) FROM contracts) as total_value,
-                (SELECT COUNT(*) FROM contracts 
-                 WHERE end_date <= :end_date AND end_date >= :start_date AND status = 'ativo') as expiring_contracts
-            FROM clients
-            LIMIT 1
-            """),
-            {'end_date': today + timedelta(days=DEFAULT_EXPIRY_DAYS), 'start_date': today}
-        ).fetchone()
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('clients', 'contracts'))
+    def get_basic_stats_cached(today=None):
+        """Get basic statistics with caching - totals from dashboard_aggregates"""
+        today = today or date.today()
+        totals = dashboard_aggregates.summary()
+        # Depends on the current day, so it stays an indexed query (status, end_date)
+        expiring_contracts = DashboardService.get_expiration_windows((DEFAULT_EXPIRY_DAYS,), today)[0].count
         
-        return {
-            'total_clients': results.total_clients,
-            'total_contracts': results.total_contracts,
-            'active_contracts': results.active_contracts,
-            'total_value': float(results.total_value),
-            'expiring_contracts': results.expiring_contracts
-        }
+        return BasicStats(
+            total_clients=totals['total_clients'],
+            total_contracts=totals['total_contracts'],
+            active_contracts=totals['by_status'].get('ativo', (0, 0))[0],
+            total_value=float(totals['total_value']),
+            expiring_contracts=expiring_contracts
+        )
     
     @staticmethod
     def get_basic_stats():
         """Get basic statistics (wrapper for caching)"""
         try:
-            return DashboardService.get_basic_stats_cached()
+            # Expiring count depends on the current day, so it is part of the key
+            return DashboardService.get_basic_stats_cached(date.today())
         except Exception as e:
             current_app.logger.error(f"Cache miss for basic stats: {e}")
             # Clear cache and retry
             DashboardService.get_basic_stats_cached.cache_clear()
-            return DashboardService.get_basic_stats_cached()
+            return DashboardService.get_basic_stats_cached(date.today())
     
     @staticmethod
-    @lru_cache(maxsize=CACHE_SIZE_SMALL)
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('contracts',))
     def get_dashboard_metrics_cached():
-        """Get dashboard metrics efficiently with caching - optimized queries"""
-        # Use a single query with conditional aggregation for better performance
-        results = db.session.execute(
-            text("""
-            SELECT 
-                COUNT(*) as total_contracts,
-                COUNT(CASE WHEN status = 'ativo' THEN 1 END) as active_contracts,
-                COUNT(CASE WHEN auto_renew = 1 THEN 1 END) as auto_renew_contracts,
-                COALESCE(SUM(value), 0) as total_value
-            FROM contracts
-            """)
-        ).fetchone()
+        """Get dashboard metrics with caching - read from dashboard_aggregates"""
+        totals = dashboard_aggregates.summary()
+        total_contracts = totals['total_contracts']
         
-        return {
-            'total_contratos': results.total_contracts,
-            'contratos_ativos': results.active_contracts,
-            'valor_total': float(results.total_value),
-            'taxa_renovacao': (results.auto_renew_contracts / results.total_contracts * 100) if results.total_contracts > 0 else 0,
-            'crescimento_mensal': 5.2,  # Simulated
-            'inadimplencia': 0.0  # Simulated
-        }
+        return DashboardMetrics(
+            total_contratos=total_contracts,
+            contratos_ativos=totals['by_status'].get('ativo', (0, 0))[0],
+            valor_total=float(totals['total_value']),
+            taxa_renovacao=(totals['auto_renew_contracts'] / total_contracts * 100) if total_contracts > 0 else 0,
+            crescimento_mensal=5.2,  # Simulated
+            inadimplencia=0.0  # Simulated
+        )
     
     @staticmethod
     def get_dashboard_metrics():
@@ -90,15 +75,17 @@ class DashboardService:
             return DashboardService.get_dashboard_metrics_cached()
     
     @staticmethod
-    @lru_cache(maxsize=CACHE_SIZE_DEFAULT)
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('clients', 'contracts'))
     def get_top_clients_cached(limit=10):
         """Get top clients by contract value with caching"""
-        return db.session.query(
+        rows = db.session.query(
             Client.name,
             db.func.sum(Contract.value).label('total_value')
         ).join(Contract).group_by(Client.id, Client.name).order_by(
             db.func.sum(Contract.value).desc()
         ).limit(limit).all()
+        # Immutable DTOs so the result can be shared and stored in any cache backend
+        return tuple(ClientValue(name, float(total_value or 0)) for name, total_value in rows)
     
     @staticmethod
     def get_top_clients(limit=10):
@@ -111,13 +98,11 @@ class DashboardService:
             return DashboardService.get_top_clients_cached(limit)
     
     @staticmethod
-    @lru_cache(maxsize=CACHE_SIZE_SMALL)
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('contracts',))
     def get_status_distribution_cached():
         """Get contract status distribution with caching"""
-        return db.session.query(
-            Contract.status,
-            db.func.count(Contract.id).label('count')
-        ).group_by(Contract.status).all()
+        by_status = dashboard_aggregates.summary()['by_status']
+        return tuple(StatusCount(status, count) for status, (count, _) in sorted(by_status.items()))
     
     @staticmethod
     def get_status_distribution():
@@ -132,61 +117,131 @@ class DashboardService:
     @staticmethod
     def get_upcoming_expirations(days=30, limit=5):
         """Get upcoming contract expirations"""
-        return Contract.query.filter(
+        return Contract.query.options(joinedload(Contract.client)).filter(
             Contract.end_date <= date.today() + timedelta(days=days),
             Contract.end_date >= date.today(),
             Contract.status == 'ativo'
         ).order_by(Contract.end_date.asc()).limit(limit).all()
     
+    @staticmethod
+    def get_upcoming_expirations_data(days=30, limit=5):
+        """Get upcoming contract expirations serialized (safe to compute in a worker thread)"""
+        return [
+            contract.to_dict(include_client=True)
+            for contract in DashboardService.get_upcoming_expirations(days, limit)
+        ]
+    
+    @staticmethod
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('contracts',))
+    def get_expiration_windows_cached(windows, today):
+        """Count and value of active contracts expiring within each window - one query"""
+        horizon = today + timedelta(days=windows[-1])
+        columns = []
+        for days in windows:
+            inside = Contract.end_date <= today + timedelta(days=days)
+            columns.append(db.func.count(db.case((inside, Contract.id))))
+            columns.append(db.func.coalesce(db.func.sum(db.case((inside, Contract.value))), 0))
+        
+        # Range on (status, end_date); windows are conditional aggregates of the same scan
+        row = db.session.execute(
+            db.select(*columns).where(
+                Contract.status == 'ativo',
+                Contract.end_date >= today,
+                Contract.end_date <= horizon
+            )
+        ).one()
+        
+        return tuple(
+            ExpirationWindow(
+                days=days,
+                until=(today + timedelta(days=days)).isoformat(),
+                count=row[2 * i],
+                value=float(row[2 * i + 1])
+            )
+            for i, days in enumerate(windows)
+        )
+    
+    @staticmethod
+    def get_expiration_windows(windows=UPCOMING_EXPIRY_DAYS, today=None):
+        """
+        Cumulative expiration windows (e.g. 30/60/90 days from today)
+        
+        Returns:
+            tuple: ExpirationWindow per window, in ascending order
+        """
+        windows = tuple(sorted(set(windows)))
+        if not windows:
+            return ()
+        return DashboardService.get_expiration_windows_cached(windows, today or date.today())
+    
     @staticmethod
     def get_recent_contracts(limit=5):
         """Get recent contracts"""
-        return Contract.query.order_by(
+        return Contract.query.options(joinedload(Contract.client)).order_by(
             Contract.created_at.desc()
         ).limit(limit).all()
     
     @staticmethod
-    def get_contracts_by_month(months=6):
-        """Get contracts created by month for the last N months"""
-        contracts_by_month = []
-        today = datetime.now()
+    def get_time_series(metric, granularity='month', periods=6, today=None):
+        """
+        Time series for charts - one grouped query on SQLite or Postgres
         
-        # More efficient query using date functions
-        start_date = today.replace(day=1) - timedelta(days=months*30)
-        monthly_data = db.session.execute(
-            text("""
-            SELECT 
-                DATE_TRUNC('month', created_at) as month,
-                COUNT(*) as count
-            FROM contracts 
-            WHERE created_at >= :start_date
-            GROUP BY DATE_TRUNC('month', created_at)
-            ORDER BY month DESC
-            LIMIT :limit
-            """),
-            {'start_date': start_date, 'limit': months}
-        ).fetchall()
+        Args:
+            metric: contracts (created), revenue (started) or expirations (active, ending)
+            granularity: day, week, month or quarter
+            periods: Number of periods (past ones, or upcoming ones for expirations)
+        """
+        today = today or date.today()
+        current = time_buckets.bucket_start(today, granularity)
         
-        # Format results
-        for row in monthly_data:
-            contracts_by_month.append({
-                'month': row.month.strftime('%b'),
-                'count': row.count
-            })
+        if metric == 'contracts':
+            column, filters = Contract.created_at, ()
+            measures = {'count': db.func.count(Contract.id)}
+        elif metric == 'revenue':
+            column, filters = Contract.start_date, (Contract.status.in_(REVENUE_STATUSES),)
+            measures = {'count': db.func.count(Contract.id), 'value': db.func.coalesce(db.func.sum(Contract.value), 0)}
+        elif metric == 'expirations':
+            column, filters = Contract.end_date, (Contract.status == 'ativo',)
+            measures = {'count': db.func.count(Contract.id), 'value': db.func.coalesce(db.func.sum(Contract.value), 0)}
+        else:
+            raise ValueError(f'Invalid metric: {metric}')
         
-        # Ensure we have all months (fill missing with 0)
-        result = []
-        for i in range(months-1, -1, -1):
-            month_date = (today.replace(day=1) - timedelta(days=i*30))
-            month_str = month_date.strftime('%b')
-            
-            # Find matching data or use 0
-            count = next((item['count'] for item in contracts_by_month if item['month'] == month_str), 0)
-            result.append({'month': month_str, 'count': count})
+        # Past metrics end at the current period, expirations start at it
+        start = current if metric == 'expirations' else time_buckets.shift(current, granularity, -(periods - 1))
+        series = time_buckets.time_series(column, granularity, start, periods, measures, filters)
         
-        return result
+        for point in series:
+            if 'value' in point:
+                point['value'] = float(point['value'])
+            point['period'] = point['period'].isoformat()
+        return series
+    
+    @staticmethod
+    def get_contracts_by_month(months=6, today=None):
+        """Get contracts created by month for the last N months"""
+        return [
+            {'month': date.fromisoformat(point['period']).strftime('%b'), **point}
+            for point in DashboardService.get_time_series('contracts', 'month', months, today)
+        ]
     
     @staticmethod
+    def get_revenue_by_month(months=6, today=None):
+        """Get contract value by start month for the last N months"""
+        return [
+            {'month': date.fromisoformat(point['period']).strftime('%b'), **point}
+            for point in DashboardService.get_time_series('revenue', 'month', months, today)
+        ]
+    
+    @staticmethod
+    def get_expiration_timeline(months=12, today=None):
+        """Get active contracts expiring per month for the next N months"""
+        return [
+            {'month': date.fromisoformat(point['period']).strftime('%b/%y'), **point}
+            for point in DashboardService.get_time_series('expirations', 'month', months, today)
+        ]
+    
+    @staticmethod
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('notifications',))
     def get_unread_notifications_count(user_id):
         """Get count of unread notifications for user"""
         return db.session.query(Notification).filter(
@@ -196,16 +251,38 @@ class DashboardService:
     
     @staticmethod
     def get_full_dashboard_data():
-        """Get complete dashboard data with optimized queries"""
-        # Execute all queries in parallel where possible
-        basic_stats = DashboardService.get_basic_stats()
-        dashboard_metrics = DashboardService.get_dashboard_metrics()
-        top_clients = DashboardService.get_top_clients(5)
-        status_distribution = DashboardService.get_status_distribution()
-        upcoming_expirations = DashboardService.get_upcoming_expirations(30, 5)
+        """Get complete dashboard data (stale-while-revalidate snapshot when enabled)"""
+        if not current_app.config.get('DASHBOARD_SNAPSHOT_MODE'):
+            return DashboardService.build_full_dashboard_data()
+        
+        # Upcoming expirations depend on the current day
+        return snapshots.get(
+            f'dashboard:full:{date.today().isoformat()}',
+            DashboardService.build_full_dashboard_data,
+            depends_on=('clients', 'contracts'),
+            max_age=current_app.config.get('DASHBOARD_SNAPSHOT_MAX_AGE', CACHE_TIMEOUT),
+            wait_timeout=current_app.config.get('DASHBOARD_SNAPSHOT_WAIT_TIMEOUT')
+        )
+    
+    @staticmethod
+    def build_full_dashboard_data():
+        """Compute complete dashboard data with optimized queries"""
+        # Independent reads run concurrently on separate pooled connections
+        results = (QueryGroup()
+                   .add('basic_stats', DashboardService.get_basic_stats)
+                   .add('dashboard_metrics', DashboardService.get_dashboard_metrics)
+                   .add('top_clients', DashboardService.get_top_clients, 5)
+                   .add('status_distribution', DashboardService.get_status_distribution)
+                   .add('upcoming_expirations', DashboardService.get_upcoming_expirations_data, 30, 5)
+                   .run())
+        basic_stats = results['basic_stats']
+        dashboard_metrics = results['dashboard_metrics']
+        top_clients = results['top_clients']
+        status_distribution = results['status_distribution']
+        upcoming_expirations = results['upcoming_expirations']
         
         return {
-            'metricas': dashboard_metrics,
+            'metricas': dashboard_metrics.to_dict(),
             'top_clientes': [
                 {'cliente': name, 'valor': float(value)} 
                 for name, value in top_clients
@@ -214,30 +291,48 @@ class DashboardService:
                 {'status': status, 'quantidade': count, 'cor': DashboardService.get_status_color(status)}
                 for status, count in status_distribution
             ],
-            'vencimentos_proximos': [contract.to_dict(include_client=True) for contract in upcoming_expirations],
-            'expiring_contracts': basic_stats['expiring_contracts']
+            'vencimentos_proximos': upcoming_expirations,
+            'expiring_contracts': basic_stats.expiring_contracts
         }
     
     @staticmethod
     def get_analytics_data():
-        """Get analytics data with optimized queries"""
-        # Batch multiple queries
-        basic_stats = DashboardService.get_basic_stats()
-        contracts_by_month = DashboardService.get_contracts_by_month(6)
-        status_distribution = DashboardService.get_status_distribution()
-        top_clients = DashboardService.get_top_clients(5)
+        """Get analytics data with optimized queries (wrapper for caching)"""
+        # Time series and expiration timeline depend on the current day
+        return DashboardService.get_analytics_data_cached(date.today())
+    
+    @staticmethod
+    @cache.memoize(timeout=CACHE_VERSIONED_TIMEOUT, depends_on=('clients', 'contracts'))
+    def get_analytics_data_cached(today):
+        """Get analytics data for the given day - today is part of the cache key"""
+        results = (QueryGroup()
+                   .add('basic_stats', DashboardService.get_basic_stats)
+                   .add('contracts_by_month', DashboardService.get_contracts_by_month, 6, today)
+                   .add('revenue_by_month', DashboardService.get_revenue_by_month, 6, today)
+                   .add('expiration_timeline', DashboardService.get_expiration_timeline, 12, today)
+                   .add('status_distribution', DashboardService.get_status_distribution)
+                   .add('top_clients', DashboardService.get_top_clients, 5)
+                   .run())
+        basic_stats = results['basic_stats']
+        contracts_by_month = results['contracts_by_month']
+        revenue_by_month = results['revenue_by_month']
+        expiration_timeline = results['expiration_timeline']
+        status_distribution = results['status_distribution']
+        top_clients = results['top_clients']
         
         return {
             'metrics': {
-                'total_contracts': basic_stats['total_contracts'],
-                'active_contracts': basic_stats['active_contracts'],
-                'total_clients': basic_stats['total_clients'],
-                'total_value': basic_stats['total_value'],
-                'avg_contract_value': basic_stats['total_value'] / basic_stats['total_contracts'] if basic_stats['total_contracts'] > 0 else 0
+                'total_contracts': basic_stats.total_contracts,
+                'active_contracts': basic_stats.active_contracts,
+                'total_clients': basic_stats.total_clients,
+                'total_value': basic_stats.total_value,
+                'avg_contract_value': basic_stats.total_value / basic_stats.total_contracts if basic_stats.total_contracts > 0 else 0
             },
             'contracts_by_month': contracts_by_month,
+            'revenue_by_month': revenue_by_month,
+            'expiration_timeline': expiration_timeline,
             'status_distribution': [
-                {'status': status, 'count': count, 'percentage': (count / basic_stats['total_contracts'] * 100) if basic_stats['total_contracts'] > 0 else 0}
+                {'status': status, 'count': count, 'percentage': (count / basic_stats.total_contracts * 100) if basic_stats.total_contracts > 0 else 0}
                 for status, count in status_distribution
             ],
             'top_clients': [
@@ -0,0 +1,74 @@
+"""
+DTOs - Resultados imutáveis dos serviços em cache
+
+NamedTuples (sem __dict__ por instância) com apenas tipos primitivos: podem ser
+compartilhados entre threads, serializados para caches externos sem estado do
+ORM e convertidos para JSON com `to_dict()` / `jsonable()`.
+"""
+
+from typing import NamedTuple
+
+
+class BasicStats(NamedTuple):
+    """Totais da página inicial e do dashboard"""
+    total_clients: int
+    total_contracts: int
+    active_contracts: int
+    total_value: float
+    expiring_contracts: int
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class DashboardMetrics(NamedTuple):
+    """Métricas do card principal do dashboard"""
+    total_contratos: int
+    contratos_ativos: int
+    valor_total: float
+    taxa_renovacao: float
+    crescimento_mensal: float
+    inadimplencia: float
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class ClientValue(NamedTuple):
+    """Cliente e soma dos valores dos seus contratos"""
+    name: str
+    value: float
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class StatusCount(NamedTuple):
+    """Quantidade de contratos em um status"""
+    status: str
+    count: int
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class ExpirationWindow(NamedTuple):
+    """Contratos ativos vencendo em até `days` dias (até a data `until`)"""
+    days: int
+    until: str
+    count: int
+    value: float
+
+    def to_dict(self):
+        return self._asdict()
+
+
+def jsonable(value):
+    """Converte DTOs (inclusive em listas/dicts) para estruturas JSON"""
+    if hasattr(value, '_asdict'):
+        return {key: jsonable(item) for key, item in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: jsonable(item) for key, item in value.items()}
+    return value
@@ -0,0 +1,130 @@
+"""
+Event Stream Service - Server-Sent Events com deltas do dashboard
+
+Cada conexão observa apenas as versões de dados no cache compartilhado (sem
+tocar o banco). Quando contratos, clientes ou notificações mudam, o estado é
+recalculado a partir dos resultados em cache e só as diferenças são enviadas.
+"""
+
+import json
+import time
+
+from app import db
+from app.services.dashboard_service import DashboardService
+from app.utils import data_versions
+from app.constants import SSE_EXPIRING_LIMIT
+
+
+class DashboardEventStream:
+    """Gera eventos SSE com as mudanças do dashboard"""
+
+    @staticmethod
+    def build_state(user_id):
+        """Estado observado pelos clientes (apenas dados pequenos e cacheados)"""
+        try:
+            basic_stats = DashboardService.get_basic_stats()
+            expiring = DashboardService.get_upcoming_expirations(limit=SSE_EXPIRING_LIMIT)
+
+            return {
+                'metricas': DashboardService.get_dashboard_metrics().to_dict(),
+                'expiring_contracts': basic_stats.expiring_contracts,
+                'distribuicao_status': [
+                    {'status': status, 'quantidade': count, 'cor': DashboardService.get_status_color(status)}
+                    for status, count in DashboardService.get_status_distribution()
+                ],
+                'top_clientes': [
+                    {'cliente': name, 'valor': float(value)}
+                    for name, value in DashboardService.get_top_clients(5)
+                ],
+                'vencimentos_proximos': {
+                    contract.id: contract.to_dict(include_client=True) for contract in expiring
+                },
+                'unread_count': DashboardService.get_unread_notifications_count(user_id)
+            }
+        finally:
+            # Não segurar conexão do pool (nem snapshot de leitura) entre eventos
+            db.session.remove()
+
+    @staticmethod
+    def diff(previous, current):
+        """Retorna a lista de (evento, payload) entre dois estados"""
+        events = []
+
+        changed_metrics = {
+            key: value for key, value in current['metricas'].items()
+            if previous['metricas'].get(key) != value
+        }
+        if current['expiring_contracts'] != previous['expiring_contracts']:
+            changed_metrics['expiring_contracts'] = current['expiring_contracts']
+        if changed_metrics:
+            events.append(('metrics', changed_metrics))
+
+        if current['distribuicao_status'] != previous['distribuicao_status']:
+            events.append(('status', current['distribuicao_status']))
+
+        if current['top_clientes'] != previous['top_clientes']:
+            events.append(('top_clients', current['top_clientes']))
+
+        before, after = previous['vencimentos_proximos'], current['vencimentos_proximos']
+        added = [contract for contract_id, contract in after.items() if contract_id not in before]
+        removed = [contract_id for contract_id in before if contract_id not in after]
+        if added or removed:
+            events.append(('expiring', {'added': added, 'removed': removed}))
+
+        if current['unread_count'] != previous['unread_count']:
+            events.append(('unread', {'unread_count': current['unread_count']}))
+
+        return events
+
+    @staticmethod
+    def format_event(event, data, event_id=None):
+        """Serializa um evento no formato text/event-stream"""
+        lines = []
+        if event_id:
+            lines.append(f'id: {event_id}')
+        lines.append(f'event: {event}')
+        lines.append(f'data: {json.dumps(data, default=str)}')
+        return '\n'.join(lines) + '\n\n'
+
+    @staticmethod
+    def stream(user_id, config, last_event_id=None):
+        """
+        Gerador de eventos SSE
+
+        Args:
+            user_id (int): Usuário das notificações
+            config (dict): app.config (SSE_POLL_INTERVAL, SSE_HEARTBEAT, ...)
+            last_event_id (str): Header Last-Event-ID enviado na reconexão
+        """
+        poll_interval = config.get('SSE_POLL_INTERVAL', 2)
+        heartbeat = config.get('SSE_HEARTBEAT', 15)
+        deadline = time.monotonic() + config.get('SSE_MAX_DURATION', 300)
+
+        versions = data_versions.get_versions(fresh=True)
+        event_id = '.'.join(versions)
+        state = DashboardEventStream.build_state(user_id)
+
+        yield f"retry: {config.get('SSE_RETRY_MS', 3000)}\n\n"
+        if last_event_id and last_event_id != event_id:
+            # Mudanças ocorreram enquanto o cliente estava desconectado
+            yield DashboardEventStream.format_event('resync', {}, event_id)
+        else:
+            yield DashboardEventStream.format_event('hello', {'unread_count': state['unread_count']}, event_id)
+
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+
+            current_versions = data_versions.get_versions(fresh=True)
+            if current_versions != versions:
+                versions = current_versions
+                event_id = '.'.join(versions)
+                new_state = DashboardEventStream.build_state(user_id)
+                for event, payload in DashboardEventStream.diff(state, new_state):
+                    yield DashboardEventStream.format_event(event, payload, event_id)
+                    last_sent = time.monotonic()
+                state = new_state
+
+            if time.monotonic() - last_sent >= heartbeat:
+                yield ': ping\n\n'
+                last_sent = time.monotonic()
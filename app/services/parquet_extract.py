@@ -0,0 +1,312 @@
+"""
+Parquet Extract - Extração incremental colunar para análise
+
+Cada execução grava apenas as linhas com updated_at posterior à marca d'água
+(watermark) da execução anterior, em arquivos Parquet particionados pelo mês
+de created_at (layout Hive, lido direto por pandas/pyarrow/DuckDB):
+
+    <PARQUET_EXTRACT_DIR>/contracts/month=2026-03/part-20261017T020000-0.parquet
+
+A marca d'água é o par (updated_at, id) da última linha gravada, então
+linhas com o mesmo updated_at não se perdem entre execuções. Como updated_at
+vem do relógio da aplicação no flush, e não do commit, uma transação longa pode
+confirmar linhas já atrás da marca d'água: cada execução relê também a janela
+PARQUET_WATERMARK_OVERLAP anterior à marca e pula as linhas (id, updated_at)
+dessa janela que já foram gravadas (guardadas junto com a marca). Uma linha
+alterada aparece em uma nova parte da sua partição; `compact()` junta as
+partes das partições antigas mantendo a versão mais recente de cada id.
+Remoções não alteram updated_at: use uma extração completa (full=True)
+para refletir exclusões.
+
+Requer pyarrow (dependência opcional, em requirements-optional.txt).
+"""
+
+import json
+import os
+import tempfile
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_, select
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = pq = None
+
+from app import db
+from app.models import Client, Contract
+from app.constants import EXPORT_BATCH_SIZE, PARQUET_PART_ROWS
+
+WATERMARKS_FILE = '_watermarks.json'
+UNKNOWN_PARTITION = 'month=unknown'
+
+ENTITIES = {
+    'clients': Client,
+    'contracts': Contract
+}
+
+# Colunas de baixa cardinalidade gravadas como dicionário (categoria no pandas)
+_DICTIONARY_COLUMNS = {'status', 'currency', 'contract_type', 'payment_method',
+                       'payment_frequency', 'state', 'country'}
+
+
+class ExtractError(RuntimeError):
+    """Extração indisponível (pyarrow ausente) ou entidade inválida"""
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ExtractError('pyarrow não está instalado (pip install pyarrow)')
+
+
+def _model(entity):
+    if entity not in ENTITIES:
+        raise ExtractError(f'Entidade inválida: {entity}')
+    return ENTITIES[entity]
+
+
+def _columns(model):
+    """Colunas exportadas (anexos binários/JSON ficam de fora)"""
+    return [column for column in model.__table__.columns if column.name != 'attachments']
+
+
+def _arrow_type(column):
+    """Tipo Arrow equivalente ao tipo SQLAlchemy da coluna"""
+    sql_type = column.type
+    if column.name in _DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int16(), pa.string())
+    if isinstance(sql_type, db.Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, db.Integer):
+        return pa.int64()
+    if isinstance(sql_type, db.Numeric):
+        return pa.decimal128(sql_type.precision or 18, sql_type.scale or 2)
+    if isinstance(sql_type, db.DateTime):
+        return pa.timestamp('us')
+    if isinstance(sql_type, db.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def schema_for(entity):
+    """Schema Arrow da entidade"""
+    _require_pyarrow()
+    return pa.schema([pa.field(column.name, _arrow_type(column)) for column in _columns(_model(entity))])
+
+
+def partition_of(created_at):
+    """Diretório da partição (mês de created_at)"""
+    if created_at is None:
+        return UNKNOWN_PARTITION
+    return f'month={created_at:%Y-%m}'
+
+
+def load_watermarks(directory):
+    """Marcas d'água gravadas: entidade -> {'updated_at': iso, 'id': int, 'seen': {id: iso}}"""
+    path = os.path.join(directory, WATERMARKS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_watermarks(directory, watermarks):
+    """Grava as marcas d'água de forma atômica"""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.watermarks')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(directory, WATERMARKS_FILE))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def changed_rows(entity, watermark=None, batch_size=EXPORT_BATCH_SIZE, overlap=timedelta(0)):
+    """
+    Linhas alteradas desde a marca d'água, em ordem de (updated_at, id)
+
+    Args:
+        entity (str): clients ou contracts
+        watermark (dict): {'updated_at': iso, 'id': int, 'seen': {id: iso}} ou
+            None (tudo). Com 'seen', relê desde updated_at - overlap e pula as
+            linhas cujo updated_at já foi gravado
+        overlap (timedelta): Janela relida atrás da marca d'água
+
+    Yields:
+        dict: coluna -> valor
+    """
+    model = _model(entity)
+    columns = _columns(model)
+    statement = select(*columns).order_by(model.updated_at, model.id)
+
+    seen = {}
+    if watermark:
+        since = datetime.fromisoformat(watermark['updated_at'])
+        if 'seen' in watermark:
+            seen = watermark['seen']
+            statement = statement.where(model.updated_at >= since - overlap)
+        else:
+            # Marca d'água sem a janela (gravada por versões anteriores)
+            statement = statement.where(or_(
+                model.updated_at > since,
+                and_(model.updated_at == since, model.id > watermark['id'])
+            ))
+
+    names = [column.name for column in columns]
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    for row in result:
+        values = dict(zip(names, row))
+        if seen and seen.get(str(values['id'])) == values['updated_at'].isoformat():
+            continue
+        yield values
+
+
+def _advance(watermark, rows, overlap):
+    """
+    Nova marca d'água após gravar `rows` (em ordem de updated_at, id)
+
+    Guarda em 'seen' as linhas gravadas dentro da janela `overlap` atrás da
+    marca, para a próxima execução relê-las sem duplicar.
+    """
+    marks = [(row['updated_at'], row['id']) for row in rows if row['updated_at'] is not None]
+    if watermark:
+        marks.append((datetime.fromisoformat(watermark['updated_at']), watermark['id']))
+    if not marks:
+        return watermark
+
+    since, last_id = max(marks)
+    seen = {key: datetime.fromisoformat(value) for key, value in (watermark or {}).get('seen', {}).items()}
+    for row in rows:
+        if row['updated_at'] is not None:
+            seen[str(row['id'])] = row['updated_at']
+
+    return {
+        'updated_at': since.isoformat(),
+        'id': last_id,
+        'seen': {key: value.isoformat() for key, value in seen.items() if value >= since - overlap},
+    }
+
+
+def _write_part(directory, partition, rows, schema, run_id, sequence):
+    path = os.path.join(directory, partition)
+    os.makedirs(path, exist_ok=True)
+    filename = os.path.join(path, f'part-{run_id}-{sequence}.parquet')
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), filename)
+    return filename
+
+
+def extract(entity, directory, full=False, part_rows=PARQUET_PART_ROWS, overlap=None):
+    """
+    Grava as linhas alteradas da entidade e avança a marca d'água
+
+    Args:
+        entity (str): clients ou contracts
+        directory (str): Diretório raiz das extrações
+        full (bool): Ignora a marca d'água e recria as partições da entidade
+        overlap (int): Segundos relidos atrás da marca d'água
+            (padrão: PARQUET_WATERMARK_OVERLAP)
+
+    Returns:
+        dict: {'rows': linhas gravadas, 'files': arquivos criados}
+    """
+    _require_pyarrow()
+    schema = schema_for(entity)
+    root = os.path.join(directory, entity)
+    watermarks = load_watermarks(directory)
+    if overlap is None:
+        overlap = current_app.config.get('PARQUET_WATERMARK_OVERLAP', 0)
+    overlap = timedelta(seconds=overlap)
+
+    if full:
+        _remove_parts(root)
+        watermarks.pop(entity, None)
+
+    run_id = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+    buffers = defaultdict(list)
+    files, total, written = [], 0, []
+
+    for row in changed_rows(entity, watermarks.get(entity), overlap=overlap):
+        partition = partition_of(row['created_at'])
+        buffers[partition].append(row)
+        total += 1
+        written.append({'id': row['id'], 'updated_at': row['updated_at']})
+        # Uma parte por partição a cada part_rows linhas: memória limitada
+        if len(buffers[partition]) >= part_rows:
+            files.append(_write_part(root, partition, buffers.pop(partition), schema, run_id, len(files)))
+
+    for partition, rows in buffers.items():
+        files.append(_write_part(root, partition, rows, schema, run_id, len(files)))
+
+    # A marca d'água só avança depois que todos os arquivos foram gravados
+    watermark = _advance(watermarks.get(entity), written, overlap)
+    if watermark is not None and watermark != watermarks.get(entity):
+        watermarks[entity] = watermark
+        save_watermarks(directory, watermarks)
+    elif full:
+        save_watermarks(directory, watermarks)
+
+    return {'rows': total, 'files': len(files)}
+
+
+def _remove_parts(root):
+    if not os.path.isdir(root):
+        return
+    for partition in os.listdir(root):
+        path = os.path.join(root, partition)
+        for name in os.listdir(path):
+            if name.endswith('.parquet'):
+                os.remove(os.path.join(path, name))
+
+
+def compact(entity, directory, keep_months=1, today=None):
+    """
+    Junta as partes das partições antigas em um único arquivo
+
+    Mantém a versão mais recente (maior updated_at) de cada id. Partições dos
+    últimos `keep_months` meses continuam recebendo partes e não são tocadas.
+
+    Returns:
+        int: Partições compactadas
+    """
+    _require_pyarrow()
+    schema = schema_for(entity)
+    root = os.path.join(directory, entity)
+    if not os.path.isdir(root):
+        return 0
+
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1 - keep_months
+    cutoff = f'month={index // 12:04d}-{index % 12 + 1:02d}'
+
+    compacted = 0
+    for partition in sorted(os.listdir(root)):
+        path = os.path.join(root, partition)
+        parts = sorted(name for name in os.listdir(path) if name.endswith('.parquet'))
+        if len(parts) < 2 or (partition != UNKNOWN_PARTITION and partition > cutoff):
+            continue
+
+        latest = {}
+        for name in parts:
+            for row in pq.read_table(os.path.join(path, name), schema=schema).to_pylist():
+                current = latest.get(row['id'])
+                if current is None or (row['updated_at'] or datetime.min) >= (current['updated_at'] or datetime.min):
+                    latest[row['id']] = row
+
+        rows = [latest[key] for key in sorted(latest)]
+        target = os.path.join(path, 'part-compacted.parquet')
+        tmp_path = os.path.join(path, '.part-compacted.tmp')
+        pq.write_table(pa.Table.from_pylist(rows, schema=schema), tmp_path)
+        # Troca atômica antes de remover as partes: uma falha no meio deixa
+        # linhas repetidas (resolvidas na próxima compactação), nunca perdidas
+        os.replace(tmp_path, target)
+        for name in parts:
+            if name != os.path.basename(target):
+                os.remove(os.path.join(path, name))
+        compacted += 1
+    return compacted
@@ -3,12 +3,42 @@ Sistema de Geração de Relatórios
 Exportação para PDF e Excel de clientes e contratos
 """
 
-from app.utils.imports import (
-    os, io, datetime, date, timedelta, Flask, send_file, jsonify, text,
-    pd, letter, A4, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
-    getSampleStyleSheet, ParagraphStyle, colors, inch, pdfmetrics, TTFont
-)
-from app.models import db, Client, Contract
+import itertools
+
+from app.utils.imports import os, io, datetime, date, timedelta
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from app import db
+from app.models import Client, Contract
+from app.utils.query_cache import query_cache
+from app.utils.streaming_export import write_xlsx
+from app.utils.pdf_tables import render_table_pdf
+from app.constants import EXPORT_BATCH_SIZE
+
+COLUNAS_CLIENTES = [
+    'ID', 'Nome', 'Email', 'Telefone', 'CNPJ/CPF', 'Endereço', 'Cidade', 'Estado',
+    'Nº Contratos', 'Valor Total', 'Data Cadastro', 'Última Atualização'
+]
+COLUNAS_CONTRATOS = [
+    'ID', 'Nº Contrato', 'Cliente', 'Descrição', 'Valor', 'Data Início', 'Data Fim',
+    'Dias até Vencimento', 'Status', 'Método Pagamento', 'Frequência',
+    'Data Cadastro', 'Última Atualização'
+]
+
+
+def _com_primeira_linha(linhas):
+    """Gerador com a primeira linha já lida, ou None se estiver vazio"""
+    primeira = next(linhas, None)
+    if primeira is None:
+        return None
+    return itertools.chain([primeira], linhas)
+
 
 class RelatorioGenerator:
     """Classe para geração de relatórios em PDF e Excel"""
@@ -38,95 +68,104 @@ class RelatorioGenerator:
             textColor=colors.darkgray
         )
     
+    def _iter_clientes(self, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Linhas do relatório de clientes em ordem de id, sem hidratar o ORM
+
+        Uma única query de colunas com os contadores armazenados no cliente
+        (contract_count / contract_value_total), lida em lotes do cursor.
+        """
+        statement = db.select(
+            Client.id, Client.name, Client.email, Client.phone, Client.document,
+            Client.address, Client.city, Client.state,
+            Client.contract_count, Client.contract_value_total,
+            Client.created_at, Client.updated_at
+        ).order_by(Client.id).execution_options(yield_per=batch_size)
+
+        for (client_id, name, email, phone, document, address, city, state,
+             num_contratos, valor_total, created_at, updated_at) in db.session.execute(statement):
+            yield {
+                'ID': client_id,
+                'Nome': name,
+                'Email': email,
+                'Telefone': phone or '',
+                'CNPJ/CPF': document or '',
+                'Endereço': address or '',
+                'Cidade': city or '',
+                'Estado': state or '',
+                'Nº Contratos': num_contratos or 0,
+                'Valor Total': f"R$ {valor_total or 0:,.2f}",
+                'Data Cadastro': created_at.strftime('%d/%m/%Y') if created_at else '',
+                'Última Atualização': updated_at.strftime('%d/%m/%Y') if updated_at else ''
+            }
+    
     def gerar_relatorio_clientes_excel(self, formato='excel'):
         """Gera relatório de clientes em Excel ou PDF"""
         try:
-            # Buscar dados dos clientes
-            clientes = Client.query.all()
+            linhas = _com_primeira_linha(self._iter_clientes())
             
-            if not clientes:
+            if linhas is None:
                 return None, "Nenhum cliente encontrado"
             
-            # Preparar dados para DataFrame
-            dados_clientes = []
-            for cliente in clientes:
-                # Contar contratos do cliente
-                num_contratos = Contract.query.filter_by(client_id=cliente.id).count()
-                # Calcular valor total dos contratos
-                valor_total = db.session.query(db.func.sum(Contract.value)).filter_by(client_id=cliente.id).scalar() or 0
-                
-                dados_clientes.append({
-                    'ID': cliente.id,
-                    'Nome': cliente.name,
-                    'Email': cliente.email,
-                    'Telefone': cliente.phone or '',
-                    'CNPJ/CPF': cliente.cnpj_cpf,
-                    'Endereço': cliente.address or '',
-                    'Cidade': cliente.city or '',
-                    'Estado': cliente.state or '',
-                    'Setor': cliente.sector or '',
-                    'Nº Contratos': num_contratos,
-                    'Valor Total': f"R$ {valor_total:,.2f}",
-                    'Data Cadastro': cliente.created_at.strftime('%d/%m/%Y') if cliente.created_at else '',
-                    'Última Atualização': cliente.updated_at.strftime('%d/%m/%Y') if cliente.updated_at else ''
-                })
-            
-            df = pd.DataFrame(dados_clientes)
-            
             if formato == 'excel':
-                return self._exportar_excel(df, 'clientes')
+                return self._exportar_excel(COLUNAS_CLIENTES, linhas, 'clientes')
             else:
-                return self._exportar_pdf_clientes(dados_clientes)
+                return self._exportar_pdf_clientes(linhas)
                 
         except Exception as e:
             return None, f"Erro ao gerar relatório: {str(e)}"
     
+    def _iter_contratos(self, batch_size=EXPORT_BATCH_SIZE):
+        """Linhas do relatório de contratos (com o nome do cliente) em ordem de id"""
+        statement = db.select(
+            Contract.id, Contract.contract_number, Client.name, Contract.description,
+            Contract.value, Contract.start_date, Contract.end_date, Contract.status,
+            Contract.payment_method, Contract.payment_frequency,
+            Contract.created_at, Contract.updated_at
+        ).join(Client, Contract.client_id == Client.id)\
+        .order_by(Contract.id).execution_options(yield_per=batch_size)
+        
+        hoje = date.today()
+        for (contract_id, numero, cliente, descricao, valor, inicio, fim, status,
+             pagamento, frequencia, created_at, updated_at) in db.session.execute(statement):
+            # Calcular dias até vencimento
+            dias_ate_vencimento = (fim - hoje).days if fim else 0
+            
+            # Status do contrato
+            status_display = status
+            if dias_ate_vencimento < 0 and status == 'ativo':
+                status_display = 'Vencido'
+            elif dias_ate_vencimento <= 30 and status == 'ativo':
+                status_display = 'A Vencer'
+            
+            yield {
+                'ID': contract_id,
+                'Nº Contrato': numero,
+                'Cliente': cliente,
+                'Descrição': descricao,
+                'Valor': f"R$ {valor or 0:,.2f}",
+                'Data Início': inicio.strftime('%d/%m/%Y') if inicio else '',
+                'Data Fim': fim.strftime('%d/%m/%Y') if fim else '',
+                'Dias até Vencimento': dias_ate_vencimento,
+                'Status': status_display,
+                'Método Pagamento': pagamento or '',
+                'Frequência': frequencia or '',
+                'Data Cadastro': created_at.strftime('%d/%m/%Y') if created_at else '',
+                'Última Atualização': updated_at.strftime('%d/%m/%Y') if updated_at else ''
+            }
+    
     def gerar_relatorio_contratos_excel(self, formato='excel'):
         """Gera relatório de contratos em Excel ou PDF"""
         try:
-            # Buscar dados dos contratos com informações do cliente
-            contratos = db.session.query(
-                Contract, Client
-            ).join(Client, Contract.client_id == Client.id).all()
+            linhas = _com_primeira_linha(self._iter_contratos())
             
-            if not contratos:
+            if linhas is None:
                 return None, "Nenhum contrato encontrado"
             
-            dados_contratos = []
-            for contrato, cliente in contratos:
-                # Calcular dias até vencimento
-                dias_ate_vencimento = (contrato.end_date - date.today()).days if contrato.end_date else 0
-                
-                # Status do contrato
-                status_display = contrato.status
-                if dias_ate_vencimento < 0 and contrato.status == 'Ativo':
-                    status_display = 'Vencido'
-                elif dias_ate_vencimento <= 30 and contrato.status == 'Ativo':
-                    status_display = 'A Vencer'
-                
-                dados_contratos.append({
-                    'ID': contrato.id,
-                    'Nº Contrato': contrato.contract_number,
-                    'Cliente': cliente.name,
-                    'Descrição': contrato.description,
-                    'Valor': f"R$ {contrato.value:,.2f}",
-                    'Data Início': contrato.start_date.strftime('%d/%m/%Y') if contrato.start_date else '',
-                    'Data Fim': contrato.end_date.strftime('%d/%m/%Y') if contrato.end_date else '',
-                    'Dias até Vencimento': dias_ate_vencimento,
-                    'Status': status_display,
-                    'Método Pagamento': contrato.payment_method or '',
-                    'Frequência': contrato.payment_frequency or '',
-                    'Data Renovação': contrato.renewal_date.strftime('%d/%m/%Y') if contrato.renewal_date else '',
-                    'Data Cadastro': contrato.created_at.strftime('%d/%m/%Y') if contrato.created_at else '',
-                    'Última Atualização': contrato.updated_at.strftime('%d/%m/%Y') if contrato.updated_at else ''
-                })
-            
-            df = pd.DataFrame(dados_contratos)
-            
             if formato == 'excel':
-                return self._exportar_excel(df, 'contratos')
+                return self._exportar_excel(COLUNAS_CONTRATOS, linhas, 'contratos')
             else:
-                return self._exportar_pdf_contratos(dados_contratos)
+                return self._exportar_pdf_contratos(linhas)
                 
         except Exception as e:
             return None, f"Erro ao gerar relatório: {str(e)}"
@@ -134,54 +173,55 @@ class RelatorioGenerator:
     def gerar_relatorio_resumo_geral(self, formato='excel'):
         """Gera relatório resumo com estatísticas gerais"""
         try:
-            # Estatísticas de clientes
-            total_clientes = Client.query.count()
+            # Agregados repetidos entre gerações: servidos pelo cache de queries
+            # até a próxima escrita em clients/contracts
+            total_clientes = query_cache.scalar(db.select(db.func.count(Client.id)))
             
             # Estatísticas de contratos
-            total_contratos = Contract.query.count()
-            valor_total = db.session.query(db.func.sum(Contract.value)).scalar() or 0
+            total_contratos = query_cache.scalar(db.select(db.func.count(Contract.id)))
+            valor_total = query_cache.scalar(db.select(db.func.sum(Contract.value))) or 0
             
             # Contratos por status
-            contratos_ativos = Contract.query.filter_by(status='Ativo').count()
-            contratos_concluidos = Contract.query.filter_by(status='Concluído').count()
-            contratos_suspensos = Contract.query.filter_by(status='Suspenso').count()
-            contratos_cancelados = Contract.query.filter_by(status='Cancelado').count()
+            por_status = dict(query_cache.execute(
+                db.select(Contract.status, db.func.count(Contract.id)).group_by(Contract.status)
+            ).all())
+            contratos_ativos = por_status.get('ativo', 0)
+            contratos_concluidos = por_status.get('concluído', 0)
+            contratos_suspensos = por_status.get('suspenso', 0)
+            contratos_cancelados = por_status.get('cancelado', 0)
             
             # Contratos vencidos
             hoje = date.today()
-            contratos_vencidos = Contract.query.filter(Contract.end_date < hoje, Contract.status == 'Ativo').count()
+            contratos_vencidos = query_cache.scalar(
+                db.select(db.func.count(Contract.id)).where(Contract.end_date < hoje, Contract.status == 'ativo')
+            )
             
-            # Contratos para renovação (próximos 30 dias)
+            # Contratos para renovação (vencem nos próximos 30 dias)
             data_renovacao = hoje + timedelta(days=30)
-            contratos_renovar = Contract.query.filter(
-                Contract.renewal_date <= data_renovacao,
-                Contract.renewal_date >= hoje,
-                Contract.status == 'Ativo'
-            ).count()
+            contratos_renovar = query_cache.scalar(
+                db.select(db.func.count(Contract.id)).where(
+                    Contract.end_date <= data_renovacao,
+                    Contract.end_date >= hoje,
+                    Contract.status == 'ativo'
+                )
+            )
             
             # Top 5 clientes por valor
-            top_clientes = db.session.query(
-                Client.name,
-                db.func.sum(Contract.value).label('total_valor'),
-                db.func.count(Contract.id).label('num_contratos')
-            ).join(Contract, Client.id == Contract.client_id)\
-            .group_by(Client.id, Client.name)\
-            .order_by(db.desc('total_valor'))\
-            .limit(5).all()
-            
-            # Contratos por setor
-            contratos_setor = db.session.query(
-                Client.sector,
-                db.func.count(Contract.id).label('num_contratos'),
-                db.func.sum(Contract.value).label('total_valor')
-            ).join(Contract, Client.id == Contract.client_id)\
-            .group_by(Client.sector)\
-            .order_by(db.desc('total_valor')).all()
+            top_clientes = query_cache.execute(
+                db.select(
+                    Client.name,
+                    db.func.sum(Contract.value).label('total_valor'),
+                    db.func.count(Contract.id).label('num_contratos')
+                ).join(Contract, Client.id == Contract.client_id)
+                .group_by(Client.id, Client.name)
+                .order_by(db.desc('total_valor'))
+                .limit(5)
+            ).all()
             
             if formato == 'excel':
                 # Criar DataFrames separados para cada seção
                 dados_resumo = {
-                    'Estatísticas Gerais': pd.DataFrame([
+                    'Estatísticas Gerais': (['Métrica', 'Valor'], [
                         ['Total de Clientes', total_clientes],
                         ['Total de Contratos', total_contratos],
                         ['Valor Total dos Contratos', f"R$ {valor_total:,.2f}"],
@@ -191,17 +231,12 @@ class RelatorioGenerator:
                         ['Contratos Cancelados', contratos_cancelados],
                         ['Contratos Vencidos', contratos_vencidos],
                         ['Contratos para Renovação', contratos_renovar]
-                    ], columns=['Métrica', 'Valor']),
+                    ]),
                     
-                    'Top 5 Clientes': pd.DataFrame([
+                    'Top 5 Clientes': (['Cliente', 'Valor Total', 'Nº Contratos'], [
                         [cliente[0], f"R$ {cliente[1]:,.2f}", cliente[2]]
                         for cliente in top_clientes
-                    ], columns=['Cliente', 'Valor Total', 'Nº Contratos']),
-                    
-                    'Contratos por Setor': pd.DataFrame([
-                        [setor[0] or 'Não Informado', setor[1], f"R$ {setor[2]:,.2f}"]
-                        for setor in contratos_setor
-                    ], columns=['Setor', 'Nº Contratos', 'Valor Total'])
+                    ])
                 }
                 
                 return self._exportar_excel_multiplanilha(dados_resumo, 'resumo_geral')
@@ -218,106 +253,32 @@ class RelatorioGenerator:
                         ('Contratos Vencidos', contratos_vencidos),
                         ('Contratos para Renovação', contratos_renovar)
                     ],
-                    'top_clientes': [(c[0], f"R$ {c[1]:,.2f}", c[2]) for c in top_clientes],
-                    'setores': [(s[0] or 'Não Informado', s[1], f"R$ {s[2]:,.2f}") for s in contratos_setor]
+                    'top_clientes': [(c[0], f"R$ {c[1]:,.2f}", c[2]) for c in top_clientes]
                 })
                 
         except Exception as e:
             return None, f"Erro ao gerar relatório: {str(e)}"
     
-    def _exportar_excel(self, df, nome_arquivo):
-        """Exporta DataFrame para Excel"""
-        try:
-            output = io.BytesIO()
-            
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='Dados', index=False)
-                
-                # Obter o workbook e worksheet para formatação
-                workbook = writer.book
-                worksheet = writer.sheets['Dados']
-                
-                # Formatos
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#D7E4BC',
-                    'border': 1
-                })
-                
-                money_format = workbook.add_format({'num_format': 'R$ #,##0.00'})
-                
-                # Aplicar formato ao cabeçalho
-                for col_num, value in enumerate(df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                
-                # Ajustar largura das colunas
-                for i, col in enumerate(df.columns):
-                    max_len = max(
-                        df[col].astype(str).map(len).max(),
-                        len(col)
-                    ) + 2
-                    worksheet.set_column(i, i, max_len)
-                
-                # Aplicar formato de moeda às colunas de valor
-                for i, col in enumerate(df.columns):
-                    if 'Valor' in col or 'valor' in col.lower():
-                        worksheet.set_column(i, i, None, money_format)
-            
-            output.seek(0)
-            
-            # Gerar nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"relatorio_{nome_arquivo}_{timestamp}.xlsx"
-            
-            return output, filename
-            
-        except Exception as e:
-            return None, f"Erro ao exportar Excel: {str(e)}"
+    def _exportar_excel(self, colunas, linhas, nome_arquivo):
+        """Exporta as linhas (gerador de dicts) para Excel em streaming"""
+        return self._exportar_excel_multiplanilha({'Dados': (colunas, linhas)}, nome_arquivo)
     
     def _exportar_excel_multiplanilha(self, dados_dict, nome_arquivo):
-        """Exporta múltiplas planilhas para Excel"""
+        """Exporta múltiplas planilhas ({nome: (colunas, linhas)}) para Excel"""
         try:
-            output = io.BytesIO()
-            
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                for nome_planilha, df in dados_dict.items():
-                    df.to_excel(writer, sheet_name=nome_planilha, index=False)
-                    
-                    # Formatação
-                    workbook = writer.book
-                    worksheet = writer.sheets[nome_planilha]
-                    
-                    header_format = workbook.add_format({
-                        'bold': True,
-                        'text_wrap': True,
-                        'valign': 'top',
-                        'fg_color': '#D7E4BC',
-                        'border': 1
-                    })
-                    
-                    # Aplicar formato ao cabeçalho
-                    for col_num, value in enumerate(df.columns.values):
-                        worksheet.write(0, col_num, value, header_format)
-                    
-                    # Ajustar largura das colunas
-                    for i, col in enumerate(df.columns):
-                        max_len = max(
-                            df[col].astype(str).map(len).max(),
-                            len(col)
-                        ) + 2
-                        worksheet.set_column(i, i, max_len)
-            
-            output.seek(0)
+            output = write_xlsx(
+                (nome_planilha, colunas, linhas)
+                for nome_planilha, (colunas, linhas) in dados_dict.items()
+            )
             
+            # Gerar nome do arquivo com timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"relatorio_{nome_arquivo}_{timestamp}.xlsx"
             
             return output, filename
             
         except Exception as e:
-            return None, f"Erro ao exportar Excel multiplanilha: {str(e)}"
+            return None, f"Erro ao exportar Excel: {str(e)}"
     
     def _finalizar_pdf(self, doc, output, nome_base, story):
         """Finaliza a geração do PDF e retorna o arquivo com timestamp"""
@@ -333,141 +294,58 @@ class RelatorioGenerator:
         except Exception as e:
             return None, f"Erro ao exportar PDF: {str(e)}"
     
-    def _exportar_pdf_clientes(self, dados_clientes):
-        """Exporta relatório de clientes para PDF"""
+    def _exportar_pdf_tabela(self, titulo, headers, linhas, rodape, nome_base):
+        """Exporta uma tabela grande para PDF (em blocos; .zip acima do limite de linhas)"""
         try:
-            output = io.BytesIO()
-            doc = SimpleDocTemplate(output, pagesize=A4)
-            story = []
-            
-            # Título
-            title = Paragraph("Relatório de Clientes", self.title_style)
-            story.append(title)
-            story.append(Spacer(1, 12))
-            
-            # Data de geração
-            data_geracao = f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-            story.append(Paragraph(data_geracao, self.styles['Normal']))
-            story.append(Spacer(1, 20))
-            
-            # Tabela de dados
-            if dados_clientes:
-                # Cabeçalho da tabela
-                headers = ['ID', 'Nome', 'Email', 'Telefone', 'CNPJ/CPF', 'Cidade', 'Estado', 'Setor', 'Contratos', 'Valor Total']
-                
-                # Dados da tabela
-                table_data = [headers]
-                for cliente in dados_clientes:
-                    row = [
-                        str(cliente['ID']),
-                        cliente['Nome'][:30],  # Limitar tamanho
-                        cliente['Email'][:25],
-                        cliente['Telefone'] or '',
-                        cliente['CNPJ/CPF'],
-                        cliente['Cidade'][:20] if cliente['Cidade'] else '',
-                        cliente['Estado'] or '',
-                        cliente['Setor'][:15] if cliente['Setor'] else '',
-                        str(cliente['Nº Contratos']),
-                        cliente['Valor Total']
-                    ]
-                    table_data.append(row)
-                
-                # Criar tabela
-                table = Table(table_data, repeatRows=1)
-                
-                # Estilo da tabela
-                style = TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ])
-                
-                table.setStyle(style)
-                story.append(table)
+            output, extensao = render_table_pdf(titulo, headers, linhas, footer=rodape,
+                                                base_name=f"relatorio_{nome_base}")
             
-            # Rodapé
-            story.append(Spacer(1, 20))
-            total_clientes = len(dados_clientes)
-            footer = Paragraph(f"Total de Clientes: {total_clientes}", self.styles['Normal'])
-            story.append(footer)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"relatorio_{nome_base}_{timestamp}{extensao}"
             
-            return self._finalizar_pdf(doc, output, "clientes", story)
+            return output, filename
             
         except Exception as e:
             return None, f"Erro ao exportar PDF: {str(e)}"
     
+    def _exportar_pdf_clientes(self, dados_clientes):
+        """Exporta relatório de clientes para PDF"""
+        headers = ['ID', 'Nome', 'Email', 'Telefone', 'CNPJ/CPF', 'Cidade', 'Estado', 'Contratos', 'Valor Total']
+        linhas = (
+            [
+                str(cliente['ID']),
+                cliente['Nome'][:30],  # Limitar tamanho
+                (cliente['Email'] or '')[:25],
+                cliente['Telefone'] or '',
+                cliente['CNPJ/CPF'],
+                cliente['Cidade'][:20] if cliente['Cidade'] else '',
+                cliente['Estado'] or '',
+                str(cliente['Nº Contratos']),
+                cliente['Valor Total']
+            ]
+            for cliente in dados_clientes
+        )
+        return self._exportar_pdf_tabela("Relatório de Clientes", headers, linhas,
+                                         "Total de Clientes: {total}", "clientes")
+    
     def _exportar_pdf_contratos(self, dados_contratos):
         """Exporta relatório de contratos para PDF"""
-        try:
-            output = io.BytesIO()
-            doc = SimpleDocTemplate(output, pagesize=A4)
-            story = []
-            
-            # Título
-            title = Paragraph("Relatório de Contratos", self.title_style)
-            story.append(title)
-            story.append(Spacer(1, 12))
-            
-            # Data de geração
-            data_geracao = f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-            story.append(Paragraph(data_geracao, self.styles['Normal']))
-            story.append(Spacer(1, 20))
-            
-            # Tabela de dados
-            if dados_contratos:
-                # Cabeçalho da tabela
-                headers = ['ID', 'Contrato', 'Cliente', 'Valor', 'Início', 'Fim', 'Status', 'Pagamento']
-                
-                # Dados da tabela
-                table_data = [headers]
-                for contrato in dados_contratos:
-                    row = [
-                        str(contrato['ID']),
-                        contrato['Nº Contrato'][:15],
-                        contrato['Cliente'][:25],
-                        contrato['Valor'],
-                        contrato['Data Início'],
-                        contrato['Data Fim'],
-                        contrato['Status'],
-                        contrato['Método Pagamento'][:15] if contrato['Método Pagamento'] else ''
-                    ]
-                    table_data.append(row)
-                
-                # Criar tabela
-                table = Table(table_data, repeatRows=1)
-                
-                # Estilo da tabela
-                style = TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ])
-                
-                table.setStyle(style)
-                story.append(table)
-            
-            # Rodapé
-            story.append(Spacer(1, 20))
-            total_contratos = len(dados_contratos)
-            footer = Paragraph(f"Total de Contratos: {total_contratos}", self.styles['Normal'])
-            story.append(footer)
-            
-            return self._finalizar_pdf(doc, output, "contratos", story)
-            
-        except Exception as e:
-            return None, f"Erro ao exportar PDF: {str(e)}"
+        headers = ['ID', 'Contrato', 'Cliente', 'Valor', 'Início', 'Fim', 'Status', 'Pagamento']
+        linhas = (
+            [
+                str(contrato['ID']),
+                (contrato['Nº Contrato'] or '')[:15],
+                contrato['Cliente'][:25],
+                contrato['Valor'],
+                contrato['Data Início'],
+                contrato['Data Fim'],
+                contrato['Status'],
+                contrato['Método Pagamento'][:15] if contrato['Método Pagamento'] else ''
+            ]
+            for contrato in dados_contratos
+        )
+        return self._exportar_pdf_tabela("Relatório de Contratos", headers, linhas,
+                                         "Total de Contratos: {total}", "contratos")
     
     def _exportar_pdf_resumo(self, dados):
         """Exporta relatório resumo para PDF"""
@@ -536,32 +414,6 @@ class RelatorioGenerator:
             clientes_table.setStyle(clientes_style)
             story.append(clientes_table)
             
-            story.append(Spacer(1, 20))
-            
-            # Contratos por Setor
-            subtitle3 = Paragraph("Contratos por Setor", self.subtitle_style)
-            story.append(subtitle3)
-            story.append(Spacer(1, 12))
-            
-            # Tabela setores
-            setores_data = [['Setor', 'Nº Contratos', 'Valor Total']]
-            setores_data.extend(dados['setores'])
-            
-            setores_table = Table(setores_data)
-            setores_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ])
-            setores_table.setStyle(setores_style)
-            story.append(setores_table)
-            
             return self._finalizar_pdf(doc, output, "resumo_geral", story)
             
         except Exception as e:
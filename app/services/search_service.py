@@ -0,0 +1,432 @@
+"""
+Search Service - Índice de busca textual para clientes e contratos
+
+O backend é escolhido pelo dialeto do banco:
+- SQLite: tabelas FTS5 (palavras com prefixo + trigramas para erros de digitação)
+- PostgreSQL: tsvector (portuguese) + pg_trgm
+- Outros (ou SEARCH_BACKEND='like'): ILIKE nos campos do model
+
+O texto é normalizado em Python (minúsculas, sem acentos) antes de indexar e
+de consultar. O índice é atualizado no mesmo flush/transação das escritas do
+ORM; UPDATE/DELETE em massa ou SQL bruto exigem `flask reindex-search`.
+"""
+
+import logging
+import re
+import unicodedata
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app import db
+from app.constants import SEARCH_MAX_RESULTS, SEARCH_TYPO_THRESHOLD, SEARCH_REINDEX_BATCH
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(value):
+    """Minúsculas e sem acentos ('João' -> 'joao')"""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(value):
+    return _TOKEN_RE.findall(normalize(value))
+
+
+def trigrams(tokens):
+    grams = set()
+    for token in tokens:
+        grams.update(token[i:i + 3] for i in range(len(token) - 2))
+    return grams
+
+
+def _indexed_models():
+    """{doc_type: (model, campos)} - import local para evitar circular import"""
+    from app.models.client import Client
+    from app.models.contract import Contract
+    return {
+        'client': (Client, ('name', 'email', 'document')),
+        'contract': (Contract, ('title', 'contract_number')),
+    }
+
+
+def document_content(obj, fields):
+    """Texto indexado do objeto (documentos também sem pontuação)"""
+    parts = [getattr(obj, field) or '' for field in fields]
+    document = getattr(obj, 'document', None)
+    if document:
+        parts.append(re.sub(r'\D', '', document))
+    return normalize(' '.join(parts))
+
+
+class LikeBackend:
+    """Sem índice: o chamador usa ILIKE"""
+
+    name = 'like'
+
+    def ensure_schema(self, connection):
+        return False
+
+    def upsert(self, connection, doc_type, rows):
+        pass
+
+    def delete(self, connection, doc_type, ids):
+        pass
+
+    def clear(self, connection):
+        pass
+
+    def matching(self, doc_type, tokens):
+        return None
+
+    def typo_matching(self, doc_type, tokens):
+        return None
+
+    def search(self, connection, doc_type, query, limit):
+        return None
+
+
+class SQLiteFTSBackend:
+    """FTS5 com tokenizer unicode61 (prefixo) e trigram (tolerância a erros)"""
+
+    name = 'sqlite-fts5'
+
+    # rowid determinístico: atualização/remoção por chave, sem varrer a tabela
+    TYPE_CODES = {'client': 1, 'contract': 2}
+
+    def ensure_schema(self, connection):
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_words'"
+        )).first()
+        if exists:
+            return False
+
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE search_words USING fts5("
+            "doc_type UNINDEXED, doc_id UNINDEXED, content, tokenize = 'unicode61')"
+        ))
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE search_trigrams USING fts5("
+            "doc_type UNINDEXED, doc_id UNINDEXED, content, tokenize = 'trigram')"
+        ))
+        return True
+
+    def _rowid(self, doc_type, doc_id):
+        return doc_id * 8 + self.TYPE_CODES[doc_type]
+
+    def upsert(self, connection, doc_type, rows):
+        if not rows:
+            return
+        self.delete(connection, doc_type, [doc_id for doc_id, _ in rows])
+        params = [
+            {'rowid': self._rowid(doc_type, doc_id), 'doc_type': doc_type, 'doc_id': doc_id, 'content': content}
+            for doc_id, content in rows
+        ]
+        for table in ('search_words', 'search_trigrams'):
+            connection.execute(text(
+                f"INSERT INTO {table} (rowid, doc_type, doc_id, content) "
+                "VALUES (:rowid, :doc_type, :doc_id, :content)"
+            ), params)
+
+    def delete(self, connection, doc_type, ids):
+        if not ids:
+            return
+        params = [{'rowid': self._rowid(doc_type, doc_id)} for doc_id in ids]
+        for table in ('search_words', 'search_trigrams'):
+            connection.execute(text(f"DELETE FROM {table} WHERE rowid = :rowid"), params)
+
+    def clear(self, connection):
+        connection.execute(text("DELETE FROM search_words"))
+        connection.execute(text("DELETE FROM search_trigrams"))
+
+    def matching(self, doc_type, tokens):
+        """SQL (sem LIMIT) dos doc_id que contêm todas as palavras como prefixo"""
+        return (
+            "SELECT doc_id FROM search_words "
+            "WHERE search_words MATCH :search_match AND doc_type = :search_doc_type",
+            {'search_match': ' '.join(f'"{token}"*' for token in tokens), 'search_doc_type': doc_type}
+        )
+
+    def typo_matching(self, doc_type, tokens):
+        """Sem SQL equivalente: a proporção de trigramas é calculada em Python"""
+        return None
+
+    def search(self, connection, doc_type, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Todas as palavras como prefixo, ordenado por bm25
+        sql, params = self.matching(doc_type, tokens)
+        ids = connection.execute(text(f"{sql} ORDER BY rank LIMIT :limit"),
+                                 {**params, 'limit': limit}).scalars().all()
+        if ids:
+            return ids
+        return self.typo_ids(connection, doc_type, tokens, limit)
+
+    def typo_ids(self, connection, doc_type, tokens, limit=None):
+        """Candidatos que compartilham trigramas (limit=None: todos)"""
+        query_grams = trigrams(tokens)
+        if not query_grams:
+            return []
+        sql = ("SELECT doc_id, content FROM search_trigrams "
+               "WHERE search_trigrams MATCH :match AND doc_type = :doc_type")
+        params = {'match': ' OR '.join(f'"{gram}"' for gram in sorted(query_grams)), 'doc_type': doc_type}
+        if limit is not None:
+            sql += " ORDER BY rank LIMIT :limit"
+            params['limit'] = limit
+        return _rank_by_trigrams(connection.execute(text(sql), params).all(), query_grams)
+
+
+class PostgresBackend:
+    """tsvector (portuguese) para prefixo/ranking e pg_trgm para erros de digitação"""
+
+    name = 'postgresql'
+
+    def ensure_schema(self, connection):
+        exists = connection.execute(text("SELECT to_regclass('search_documents')")).scalar()
+        if exists:
+            return False
+
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(
+            "CREATE TABLE search_documents ("
+            "doc_type VARCHAR(20) NOT NULL, "
+            "doc_id INTEGER NOT NULL, "
+            "content TEXT NOT NULL, "
+            "tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('portuguese', content)) STORED, "
+            "PRIMARY KEY (doc_type, doc_id))"
+        ))
+        connection.execute(text(
+            "CREATE INDEX idx_search_documents_tsv ON search_documents USING GIN (tsv)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX idx_search_documents_trgm ON search_documents USING GIN (content gin_trgm_ops)"
+        ))
+        return True
+
+    def upsert(self, connection, doc_type, rows):
+        if not rows:
+            return
+        connection.execute(text(
+            "INSERT INTO search_documents (doc_type, doc_id, content) "
+            "VALUES (:doc_type, :doc_id, :content) "
+            "ON CONFLICT (doc_type, doc_id) DO UPDATE SET content = EXCLUDED.content"
+        ), [{'doc_type': doc_type, 'doc_id': doc_id, 'content': content} for doc_id, content in rows])
+
+    def delete(self, connection, doc_type, ids):
+        if not ids:
+            return
+        connection.execute(text(
+            "DELETE FROM search_documents WHERE doc_type = :doc_type AND doc_id = ANY(:ids)"
+        ), {'doc_type': doc_type, 'ids': list(ids)})
+
+    def clear(self, connection):
+        connection.execute(text("TRUNCATE search_documents"))
+
+    def matching(self, doc_type, tokens):
+        """SQL (sem LIMIT) dos doc_id cujo tsvector casa com todas as palavras"""
+        return (
+            "SELECT doc_id FROM search_documents "
+            "WHERE doc_type = :search_doc_type AND tsv @@ to_tsquery('portuguese', :search_tsquery)",
+            {'search_tsquery': ' & '.join(f'{token}:*' for token in tokens), 'search_doc_type': doc_type}
+        )
+
+    def search(self, connection, doc_type, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        sql, params = self.matching(doc_type, tokens)
+        ids = connection.execute(text(
+            f"{sql} ORDER BY ts_rank(tsv, to_tsquery('portuguese', :search_tsquery)) DESC LIMIT :limit"
+        ), {**params, 'limit': limit}).scalars().all()
+        if ids:
+            return ids
+        return self.typo_ids(connection, doc_type, tokens, limit)
+
+    def typo_matching(self, doc_type, tokens):
+        """SQL (sem LIMIT) dos doc_id parecidos pelo pg_trgm"""
+        return (
+            "SELECT doc_id FROM search_documents "
+            "WHERE doc_type = :search_doc_type AND :search_query <% content",
+            {'search_query': ' '.join(tokens), 'search_doc_type': doc_type}
+        )
+
+    def typo_ids(self, connection, doc_type, tokens, limit=None):
+        """Documentos parecidos pelo pg_trgm (limit=None: todos)"""
+        sql, params = self.typo_matching(doc_type, tokens)
+        sql += " ORDER BY word_similarity(:search_query, content) DESC"
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params['limit'] = limit
+        return connection.execute(text(sql), params).scalars().all()
+
+
+def _rank_by_trigrams(rows, query_grams):
+    """Mantém candidatos com trigramas suficientes em comum, do mais parecido ao menos"""
+    scored = []
+    for doc_id, content in rows:
+        score = len(query_grams & trigrams(tokenize(content))) / len(query_grams)
+        if score >= SEARCH_TYPO_THRESHOLD:
+            scored.append((score, doc_id))
+    scored.sort(key=lambda item: -item[0])
+    return [doc_id for _, doc_id in scored]
+
+
+_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresBackend,
+}
+
+
+class SearchIndex:
+    """Índice de busca compartilhado pela aplicação"""
+
+    def __init__(self):
+        self.enabled = True
+        self._backends = {}
+
+    def init_app(self, app):
+        """Registra a sincronização com o ORM (idempotente)"""
+        self.enabled = app.config.get('SEARCH_BACKEND', 'auto') != 'like'
+        if not event.contains(Session, 'after_flush', _after_flush):
+            event.listen(Session, 'after_flush', _after_flush)
+
+    def backend_for(self, connection):
+        """Backend do dialeto da conexão, criando o schema na primeira vez"""
+        if not self.enabled:
+            return LikeBackend()
+
+        engine_key = str(connection.engine.url)
+        backend = self._backends.get(engine_key)
+        if backend is not None:
+            return backend
+
+        backend = _BACKENDS.get(connection.dialect.name, LikeBackend)()
+        try:
+            with connection.begin_nested():
+                created = backend.ensure_schema(connection)
+                if created:
+                    self._populate(connection, backend)
+        except Exception as e:
+            logger.warning(f"Índice de busca indisponível ({backend.name}): {e}")
+            backend = LikeBackend()
+
+        self._backends[engine_key] = backend
+        return backend
+
+    def search(self, doc_type, query, limit=SEARCH_MAX_RESULTS):
+        """
+        Retorna ids ordenados por relevância, ou None se não houver índice
+
+        Lista ranqueada e limitada (sugestões); para filtrar consultas use
+        `filter_for`, que não tem limite.
+
+        Args:
+            doc_type (str): 'client' ou 'contract'
+            query (str): Texto digitado pelo usuário
+            limit (int): Máximo de resultados
+        """
+        connection = db.session.connection()
+        return self.backend_for(connection).search(connection, doc_type, query, limit)
+
+    def filter_for(self, model, query):
+        """
+        Expressão de filtro para a busca (índice ou ILIKE como fallback)
+
+        Ao contrário de `search`, não há limite de resultados: o filtro é um
+        semi-join (`id IN (SELECT doc_id ...)`) contra o índice, então
+        paginação e totais enxergam todos os registros encontrados. Sem
+        correspondência exata, a tolerância a erros também é um semi-join no
+        PostgreSQL (pg_trgm); no SQLite a proporção de trigramas é calculada em
+        Python e a lista de ids fica limitada a SEARCH_MAX_RESULTS, dos mais
+        parecidos aos menos.
+        """
+        doc_type, fields = next(
+            (doc_type, fields) for doc_type, (indexed, fields) in _indexed_models().items()
+            if indexed is model
+        )
+        connection = db.session.connection()
+        backend = self.backend_for(connection)
+        tokens = tokenize(query)
+        matching = backend.matching(doc_type, tokens) if tokens else None
+
+        if matching is None:
+            if isinstance(backend, LikeBackend):
+                condition = None
+                for field in fields:
+                    clause = getattr(model, field).ilike(f'%{query}%')
+                    condition = clause if condition is None else condition | clause
+                return condition
+            return model.id.in_([])
+
+        sql, params = matching
+        if connection.execute(text(f"{sql} LIMIT 1"), params).first() is not None:
+            return model.id.in_(text(sql).bindparams(**params).columns(doc_id=db.Integer))
+
+        # Nenhuma correspondência exata: candidatos tolerantes a erros
+        typo_matching = backend.typo_matching(doc_type, tokens)
+        if typo_matching is not None:
+            sql, params = typo_matching
+            return model.id.in_(text(sql).bindparams(**params).columns(doc_id=db.Integer))
+        return model.id.in_(backend.typo_ids(connection, doc_type, tokens, SEARCH_MAX_RESULTS))
+
+    def reindex(self):
+        """Reconstrói o índice a partir das tabelas (retorna total indexado)"""
+        connection = db.session.connection()
+        backend = self.backend_for(connection)
+        backend.clear(connection)
+        total = self._populate(connection, backend)
+        db.session.commit()
+        return total
+
+    def _populate(self, connection, backend):
+        total = 0
+        for doc_type, (model, fields) in _indexed_models().items():
+            columns = [model.id] + [getattr(model, field) for field in fields]
+            if 'document' not in fields and hasattr(model, 'document'):
+                columns.append(model.document)
+            result = connection.execute(db.select(*columns).execution_options(yield_per=SEARCH_REINDEX_BATCH))
+            for rows in result.partitions():
+                backend.upsert(connection, doc_type, [
+                    (row.id, document_content(row, fields)) for row in rows
+                ])
+                total += len(rows)
+        return total
+
+
+def _after_flush(session, flush_context):
+    """Atualiza o índice dentro da mesma transação do flush"""
+    if not search_index.enabled:
+        return
+
+    models = _indexed_models()
+    upserts = {doc_type: [] for doc_type in models}
+    deletes = {doc_type: [] for doc_type in models}
+
+    for doc_type, (model, fields) in models.items():
+        for obj in session.new:
+            if isinstance(obj, model):
+                upserts[doc_type].append((obj.id, document_content(obj, fields)))
+        for obj in session.dirty:
+            if isinstance(obj, model) and session.is_modified(obj, include_collections=False):
+                upserts[doc_type].append((obj.id, document_content(obj, fields)))
+        for obj in session.deleted:
+            if isinstance(obj, model):
+                deletes[doc_type].append(obj.id)
+
+    if not any(upserts.values()) and not any(deletes.values()):
+        return
+
+    connection = session.connection()
+    backend = search_index.backend_for(connection)
+    for doc_type in models:
+        backend.upsert(connection, doc_type, upserts[doc_type])
+        backend.delete(connection, doc_type, deletes[doc_type])
+
+
+search_index = SearchIndex()
@@ -0,0 +1,233 @@
+"""
+Suggest Service - Autocompletar de clientes com índice de prefixos em memória
+
+Cada processo mantém uma lista ordenada de (chave, client_id) com as palavras
+do nome, o email e o documento (só dígitos) dos clientes ativos. A busca por
+prefixo é uma bisseção, sem tocar o banco. Commits deste processo atualizam o
+índice incrementalmente e adotam o token de versão gerado pelo próprio commit
+quando o token anterior era o do índice. Mudanças feitas por outros workers
+deixam a versão de dados de `clients` diferente da do índice e disparam uma
+reconstrução em segundo plano (o índice anterior continua respondendo enquanto
+isso).
+"""
+
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.services.search_service import normalize, tokenize
+from app.utils import data_versions
+from app.constants import SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = 'suggest_clients'
+
+# Cópia dos campos no flush (após o commit os atributos do ORM expiram)
+ClientRow = namedtuple('ClientRow', 'id name email document is_active')
+
+
+def _entry_for(client):
+    """Dados exibidos na sugestão"""
+    return {
+        'id': client.id,
+        'name': client.name,
+        'document': client.document,
+        'email': client.email
+    }
+
+
+def _keys_for(client):
+    keys = set(tokenize(client.name))
+    keys.add(normalize(client.name))
+    if client.email:
+        keys.add(normalize(client.email))
+    if client.document:
+        keys.add(re.sub(r'\D', '', client.document))
+    keys.discard('')
+    return keys
+
+
+class ClientPrefixIndex:
+    """Índice de prefixos dos clientes ativos"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []          # [(chave, client_id)] ordenada
+        self._entries = {}       # client_id -> dados da sugestão
+        self._client_keys = {}   # client_id -> chaves indexadas
+        self._version = None
+        self._loaded = False
+        self._rebuilding = False
+
+    def init_app(self, app):
+        """Registra a atualização incremental (idempotente)"""
+        # Os tokens do commit são gerados pelo after_commit de data_versions,
+        # que precisa estar registrado antes deste
+        data_versions.init_app(app)
+        for name, listener in (('after_flush', _after_flush),
+                               ('after_commit', _after_commit),
+                               ('after_rollback', _after_rollback)):
+            if not event.contains(Session, name, listener):
+                event.listen(Session, name, listener)
+
+    def suggest(self, query, limit=SUGGEST_DEFAULT_LIMIT):
+        """
+        Clientes cujo nome, email ou documento começam com o texto digitado
+
+        Args:
+            query (str): Texto digitado (várias palavras = todas devem casar)
+            limit (int): Máximo de sugestões
+        """
+        self._ensure_current()
+
+        normalized = normalize(query).strip()
+        if re.fullmatch(r'[\d.\-/\s]+', normalized):
+            # CPF/CNPJ digitado com ou sem pontuação
+            normalized = re.sub(r'\D', '', normalized)
+        tokens = tokenize(normalized)
+        if not tokens:
+            return []
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+
+        with self._lock:
+            # Nome completo, email ou documento começando com o texto
+            ids = self._prefix_ids(normalized)
+            # Ou cada palavra digitada prefixando alguma palavra do cliente
+            for client_id in self._prefix_ids(tokens[0]) - ids:
+                keys = self._client_keys[client_id]
+                if all(any(key.startswith(token) for key in keys) for token in tokens[1:]):
+                    ids.add(client_id)
+            matches = [self._entries[client_id] for client_id in ids]
+
+        matches.sort(key=lambda entry: (
+            not normalize(entry['name']).startswith(normalized),
+            normalize(entry['name'])
+        ))
+        return matches[:limit]
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            ids.add(self._keys[position][1])
+            position += 1
+        return ids
+
+    def apply(self, clients, deleted_ids, versions=None):
+        """
+        Aplica mudanças confirmadas deste processo
+
+        Args:
+            clients: ClientRow inseridos ou alterados
+            deleted_ids: ids removidos
+            versions (tuple): (token anterior, token novo) de `clients` gerados
+                pelo commit; o novo só é adotado se o anterior era o do índice
+                (senão houve commits de outros workers e a reconstrução cuida)
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            for client_id in deleted_ids:
+                self._remove(client_id)
+            for client in clients:
+                self._remove(client.id)
+                if client.is_active:
+                    self._add(client)
+            if versions and versions[0] is not None and (versions[0],) == self._version:
+                self._version = (versions[1],)
+
+    def rebuild(self):
+        """Recarrega todos os clientes ativos"""
+        from app.models.client import Client
+
+        version = data_versions.get_versions('clients', fresh=True)
+        rows = db.session.query(
+            Client.id, Client.name, Client.email, Client.document
+        ).filter(Client.is_active.is_(True)).all()
+
+        keys, entries, client_keys = [], {}, {}
+        for row in rows:
+            entries[row.id] = _entry_for(row)
+            client_keys[row.id] = _keys_for(row)
+            keys.extend((key, row.id) for key in client_keys[row.id])
+        keys.sort()
+
+        with self._lock:
+            self._keys, self._entries, self._client_keys = keys, entries, client_keys
+            self._version = version
+            self._loaded = True
+
+    def _add(self, client):
+        self._entries[client.id] = _entry_for(client)
+        self._client_keys[client.id] = _keys_for(client)
+        for key in self._client_keys[client.id]:
+            insort(self._keys, (key, client.id))
+
+    def _remove(self, client_id):
+        self._entries.pop(client_id, None)
+        for key in self._client_keys.pop(client_id, ()):
+            position = bisect_left(self._keys, (key, client_id))
+            if position < len(self._keys) and self._keys[position] == (key, client_id):
+                del self._keys[position]
+
+    def _ensure_current(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.rebuild()
+            return
+
+        if data_versions.get_versions('clients') == self._version or self._rebuilding:
+            return
+
+        # Outro worker alterou clientes: reconstrói sem bloquear as sugestões
+        self._rebuilding = True
+        app = current_app._get_current_object()
+
+        def rebuild():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                logger.error(f"Falha ao reconstruir índice de sugestões: {e}")
+            finally:
+                self._rebuilding = False
+
+        threading.Thread(target=rebuild, name='client-suggest-rebuild', daemon=True).start()
+
+
+def _after_flush(session, flush_context):
+    from app.models.client import Client
+
+    changes = session.info.setdefault(_SESSION_KEY, {'clients': {}, 'deleted': set()})
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Client):
+            changes['clients'][obj.id] = ClientRow(obj.id, obj.name, obj.email, obj.document, obj.is_active)
+    for obj in session.deleted:
+        if isinstance(obj, Client):
+            changes['deleted'].add(obj.id)
+
+
+def _after_commit(session):
+    changes = session.info.pop(_SESSION_KEY, None)
+    if changes:
+        try:
+            versions = session.info.get(data_versions.BUMPED_KEY, {}).get('clients')
+            client_prefix_index.apply(changes['clients'].values(), changes['deleted'], versions)
+        except Exception as e:
+            logger.error(f"Falha ao atualizar índice de sugestões: {e}")
+
+
+def _after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+client_prefix_index = ClientPrefixIndex()
@@ -0,0 +1,981 @@
+"""
+Cache compartilhado - backends plugáveis selecionados por configuração
+
+Tipos suportados em CACHE_TYPE:
+    simple / memory  -> memória do processo, TTL + LRU
+    filesystem       -> arquivos em CACHE_DIR (compartilhado entre workers do host)
+    redis            -> servidor Redis (compartilhado pelo cluster); com
+                        CACHE_REDIS_URL='memory://' usa um stand-in local (testes)
+    null             -> desativa o cache
+
+Com SHARED_MEMORY_PATH, snapshots do dashboard ficam em um arquivo mmap
+compartilhado pelos workers do host (SharedMemoryCache) e as versões de dados
+em uma tabela mmap própria e pequena (SharedVersionTable, `<path>.versions`),
+mesmo com o cache principal em memória do processo.
+"""
+
+import os
+import mmap
+import pickle
+import struct
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: sem SharedMemoryCache
+    fcntl = None
+
+from flask import g, has_request_context
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - dependência opcional
+    redis = None
+
+from app.constants import CACHE_TIMEOUT, CACHE_MAX_ENTRIES, SHARED_MEMORY_SIZE, SHARED_VERSION_SLOTS
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheStats:
+    """Contadores de acesso ao cache (por processo)"""
+
+    FIELDS = ('hits', 'misses', 'sets', 'deletes', 'evictions', 'expirations', 'errors')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field, amount=1):
+        with self._lock:
+            self._counters[field] += amount
+
+    def as_dict(self):
+        with self._lock:
+            data = dict(self._counters)
+        lookups = data['hits'] + data['misses']
+        data['hit_rate'] = round(data['hits'] / lookups * 100, 2) if lookups else 0.0
+        return data
+
+
+class BaseCache:
+    """Interface comum dos backends de cache"""
+
+    backend_name = 'base'
+
+    def __init__(self, default_timeout=CACHE_TIMEOUT):
+        self.default_timeout = default_timeout
+        self.stats = CacheStats()
+
+    def _expires_at(self, timeout):
+        """Converte timeout em instante de expiração (0 = nunca expira)"""
+        if timeout is None:
+            timeout = self.default_timeout
+        return time.time() + timeout if timeout > 0 else 0
+
+    def get(self, key, default=None):
+        raise NotImplementedError
+
+    def set(self, key, value, timeout=None):
+        raise NotImplementedError
+
+    def add(self, key, value, timeout=None):
+        """Grava apenas se a chave não existir (usado como lock leve)"""
+        if self.get(key, _MISSING) is not _MISSING:
+            return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_stats(self):
+        """Retorna contadores e informações do backend"""
+        data = self.stats.as_dict()
+        data['backend'] = self.backend_name
+        return data
+
+
+class NullCache(BaseCache):
+    """Backend que não armazena nada (cache desativado)"""
+
+    backend_name = 'null'
+
+    def get(self, key, default=None):
+        self.stats.incr('misses')
+        return default
+
+    def set(self, key, value, timeout=None):
+        return True
+
+    def delete(self, key):
+        return False
+
+    def clear(self):
+        return True
+
+
+class MemoryCache(BaseCache):
+    """Cache em memória do processo com TTL e descarte LRU"""
+
+    backend_name = 'memory'
+
+    def __init__(self, default_timeout=CACHE_TIMEOUT, max_entries=CACHE_MAX_ENTRIES):
+        super().__init__(default_timeout)
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.incr('misses')
+                return default
+
+            expires_at, value = entry
+            if expires_at and expires_at <= time.time():
+                del self._data[key]
+                self.stats.incr('expirations')
+                self.stats.incr('misses')
+                return default
+
+            self._data.move_to_end(key)
+            self.stats.incr('hits')
+            return value
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._data[key] = (self._expires_at(timeout), value)
+            self._data.move_to_end(key)
+            self.stats.incr('sets')
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.incr('evictions')
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            return super().add(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            removed = self._data.pop(key, _MISSING) is not _MISSING
+        if removed:
+            self.stats.incr('deletes')
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        return True
+
+    def get_stats(self):
+        data = super().get_stats()
+        with self._lock:
+            data['entries'] = len(self._data)
+        data['max_entries'] = self.max_entries
+        return data
+
+
+class FileSystemCache(BaseCache):
+    """Cache em arquivos - compartilhado entre os workers de um mesmo host"""
+
+    backend_name = 'filesystem'
+
+    def __init__(self, cache_dir, default_timeout=CACHE_TIMEOUT, max_entries=CACHE_MAX_ENTRIES):
+        super().__init__(default_timeout)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _list_files(self):
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if not name.startswith('.')
+        ]
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            self.stats.incr('misses')
+            return default
+        except Exception as e:
+            logger.warning(f"Falha ao ler cache {path}: {e}")
+            self.stats.incr('errors')
+            self.stats.incr('misses')
+            return default
+
+        if expires_at and expires_at <= time.time():
+            self._remove(path)
+            self.stats.incr('expirations')
+            self.stats.incr('misses')
+            return default
+
+        self.stats.incr('hits')
+        return value
+
+    def set(self, key, value, timeout=None):
+        self._prune()
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self._expires_at(timeout), value), f, pickle.HIGHEST_PROTOCOL)
+            # os.replace é atômico: leitores nunca veem arquivo pela metade
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"Falha ao gravar cache: {e}")
+            self.stats.incr('errors')
+            self._remove(tmp_path)
+            return False
+        self.stats.incr('sets')
+        return True
+
+    def delete(self, key):
+        removed = self._remove(self._path(key))
+        if removed:
+            self.stats.incr('deletes')
+        return removed
+
+    def clear(self):
+        for path in self._list_files():
+            self._remove(path)
+        return True
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _prune(self):
+        """Remove arquivos mais antigos quando o limite de entradas é atingido"""
+        files = self._list_files()
+        if len(files) < self.max_entries:
+            return
+
+        files.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        for path in files[:len(files) - self.max_entries + 1]:
+            if self._remove(path):
+                self.stats.incr('evictions')
+
+    def get_stats(self):
+        data = super().get_stats()
+        data['entries'] = len(self._list_files())
+        data['max_entries'] = self.max_entries
+        return data
+
+
+class SharedMemoryCache(BaseCache):
+    """
+    Cache em arquivo mapeado em memória (mmap) compartilhado pelos workers do host
+
+    Pensado para poucas chaves grandes e lidas com frequência (snapshots do
+    dashboard) em hosts sem Redis; as versões de dados ficam à parte, em
+    SharedVersionTable. Todas as entradas formam
+    um único dicionário serializado em um de dois slots do arquivo:
+
+        cabeçalho | slot 0 | slot 1
+
+    Quem publica segura flock no arquivo, grava o dicionário no slot inativo
+    e só então troca o slot ativo e incrementa a sequência no cabeçalho, então
+    a publicação é atômica. Leitores não bloqueiam (seqlock): leem a sequência,
+    desserializam direto do mmap (memoryview, sem cópia) e conferem se a
+    sequência não mudou. O dicionário decodificado fica em memória do processo
+    até a sequência mudar, então leituras repetidas custam só o cabeçalho.
+    """
+
+    backend_name = 'shared_memory'
+
+    _MAGIC = b'MBSM'
+    _HEADER = struct.Struct('<4sQQIQQ')  # magic, slot_size, seq, active, len0, len1
+    _HEADER_SIZE = 64
+    _READ_RETRIES = 5
+
+    def __init__(self, path, size=SHARED_MEMORY_SIZE, default_timeout=CACHE_TIMEOUT):
+        super().__init__(default_timeout)
+        self.path = path
+        self.size = size
+        self._pid = None
+        self._file = None
+        self._mmap = None
+        self._slot_size = 0
+        self._lock = threading.Lock()
+        self._decoded = (None, {})  # (sequência, entradas)
+
+    def _open(self):
+        """Mapeia o arquivo (de novo após fork: flock não exclui fds herdados)"""
+        if self._pid == os.getpid():
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        f = open(self.path, 'a+b')
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_size < self.size:
+                f.truncate(self.size)
+            mm = mmap.mmap(f.fileno(), os.fstat(f.fileno()).st_size)
+            magic, slot_size = self._HEADER.unpack_from(mm, 0)[:2]
+            if magic != self._MAGIC:
+                slot_size = (len(mm) - self._HEADER_SIZE) // 2
+                empty = pickle.dumps({}, pickle.HIGHEST_PROTOCOL)
+                mm[self._HEADER_SIZE:self._HEADER_SIZE + len(empty)] = empty
+                self._HEADER.pack_into(mm, 0, self._MAGIC, slot_size, 0, 0, len(empty), 0)
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+        self._file, self._mmap, self._slot_size = f, mm, slot_size
+        self._decoded = (None, {})
+        self._pid = os.getpid()
+
+    def _decode(self, active, length):
+        start = self._HEADER_SIZE + active * self._slot_size
+        view = memoryview(self._mmap)
+        try:
+            chunk = view[start:start + length]
+            try:
+                return pickle.loads(chunk)
+            finally:
+                chunk.release()
+        finally:
+            view.release()
+
+    def _entries(self):
+        """Dicionário publicado mais recente (sem lock para leitura)"""
+        self._open()
+        for _ in range(self._READ_RETRIES):
+            _, _, seq, active, len0, len1 = self._HEADER.unpack_from(self._mmap, 0)
+            decoded_seq, entries = self._decoded
+            if seq == decoded_seq:
+                return entries
+            try:
+                entries = self._decode(active, (len0, len1)[active])
+            except Exception:
+                entries = None
+            # Publicação concorrente: o slot pode ter sido sobrescrito
+            if entries is not None and self._HEADER.unpack_from(self._mmap, 0)[2] == seq:
+                self._decoded = (seq, entries)
+                return entries
+
+        with self._locked():
+            return self._entries_locked()
+
+    def _entries_locked(self):
+        _, _, seq, active, len0, len1 = self._HEADER.unpack_from(self._mmap, 0)
+        if seq != self._decoded[0]:
+            self._decoded = (seq, self._decode(active, (len0, len1)[active]))
+        return self._decoded[1]
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def _publish(self, mutate):
+        """Aplica `mutate(entradas)` e publica o novo dicionário atomicamente"""
+        try:
+            with self._locked():
+                entries = dict(self._entries_locked())
+                result = mutate(entries)
+                now = time.time()
+                for key in [k for k, (expires_at, _) in entries.items() if expires_at and expires_at <= now]:
+                    del entries[key]
+                    self.stats.incr('expirations')
+
+                data = pickle.dumps(entries, pickle.HIGHEST_PROTOCOL)
+                if len(data) > self._slot_size:
+                    logger.warning(f"Cache compartilhado cheio ({len(data)} > {self._slot_size} bytes)")
+                    self.stats.incr('errors')
+                    return False
+
+                _, _, seq, active, len0, len1 = self._HEADER.unpack_from(self._mmap, 0)
+                target = 1 - active
+                start = self._HEADER_SIZE + target * self._slot_size
+                self._mmap[start:start + len(data)] = data
+                lengths = (len(data), len1) if target == 0 else (len0, len(data))
+                # Slot e tamanhos primeiro; a sequência por último confirma a publicação
+                self._HEADER.pack_into(self._mmap, 0, self._MAGIC, self._slot_size, seq, target, *lengths)
+                self._HEADER.pack_into(self._mmap, 0, self._MAGIC, self._slot_size, seq + 1, target, *lengths)
+                self._decoded = (seq + 1, entries)
+                return result
+        except Exception as e:
+            logger.warning(f"Falha ao gravar cache compartilhado: {e}")
+            self.stats.incr('errors')
+            return False
+
+    def get(self, key, default=None):
+        try:
+            entry = self._entries().get(key, _MISSING)
+        except Exception as e:
+            logger.warning(f"Falha ao ler cache compartilhado: {e}")
+            self.stats.incr('errors')
+            entry = _MISSING
+
+        if entry is _MISSING:
+            self.stats.incr('misses')
+            return default
+
+        expires_at, value = entry
+        if expires_at and expires_at <= time.time():
+            self.stats.incr('expirations')
+            self.stats.incr('misses')
+            return default
+
+        self.stats.incr('hits')
+        return value
+
+    def set(self, key, value, timeout=None):
+        def mutate(entries):
+            entries[key] = (self._expires_at(timeout), value)
+            return True
+
+        stored = self._publish(mutate)
+        if stored:
+            self.stats.incr('sets')
+        return stored
+
+    def add(self, key, value, timeout=None):
+        def mutate(entries):
+            entry = entries.get(key)
+            if entry is not None and (not entry[0] or entry[0] > time.time()):
+                return False
+            entries[key] = (self._expires_at(timeout), value)
+            return True
+
+        return self._publish(mutate)
+
+    def delete(self, key):
+        removed = self._publish(lambda entries: entries.pop(key, _MISSING) is not _MISSING)
+        if removed:
+            self.stats.incr('deletes')
+        return removed
+
+    def clear(self):
+        return self._publish(lambda entries: entries.clear() or True)
+
+    def get_stats(self):
+        data = super().get_stats()
+        try:
+            data['entries'] = len(self._entries())
+            _, _, _, active, len0, len1 = self._HEADER.unpack_from(self._mmap, 0)
+            data['used_bytes'] = (len0, len1)[active]
+            data['slot_bytes'] = self._slot_size
+        except Exception as e:
+            logger.warning(f"Falha ao ler cache compartilhado: {e}")
+        data['path'] = self.path
+        return data
+
+
+class VersionTableFull(RuntimeError):
+    """Sem slots livres na tabela de versões compartilhada"""
+
+
+class SharedVersionTable:
+    """
+    Tokens de versão de dados em um arquivo mmap de slots fixos
+
+    Separada dos snapshots: gerar uma versão grava só o slot da tabela (sem
+    reserializar o dicionário de snapshots) e ler uma versão é desempacotar
+    72 bytes direto do mmap, sem pickle:
+
+        cabeçalho | slot 0 | slot 1 | ...    slot = seq, nome, token
+
+    Escritores seguram flock; cada slot tem seu seqlock (seq ímpar durante a
+    gravação), então leitores não bloqueiam. Slots nunca são liberados: a
+    posição de cada tabela fica em cache no processo.
+    """
+
+    _MAGIC = b'MBSV'
+    _HEADER_SIZE = 8
+    _SLOT = struct.Struct('<Q48s16s')  # seq, nome, token
+    _READ_RETRIES = 5
+
+    def __init__(self, path, slots=SHARED_VERSION_SLOTS):
+        self.path = path
+        self.slots = slots
+        self._pid = None
+        self._file = None
+        self._mmap = None
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Mapeia o arquivo (de novo após fork: flock não exclui fds herdados)"""
+        if self._pid == os.getpid():
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = self._HEADER_SIZE + self.slots * self._SLOT.size
+        f = open(self.path, 'a+b')
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)
+            mm = mmap.mmap(f.fileno(), os.fstat(f.fileno()).st_size)
+            if mm[:4] != self._MAGIC:
+                mm[:size] = bytes(size)
+                mm[:4] = self._MAGIC
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+        self._file, self._mmap = f, mm
+        self.slots = (len(mm) - self._HEADER_SIZE) // self._SLOT.size
+        self._positions = {}
+        self._pid = os.getpid()
+
+    def _offset(self, index):
+        return self._HEADER_SIZE + index * self._SLOT.size
+
+    def _used(self, index):
+        return bool(self._SLOT.unpack_from(self._mmap, self._offset(index))[1].rstrip(b'\0'))
+
+    def _read_slot(self, index):
+        """(nome, token) consistente do slot, ou None se estiver sendo gravado"""
+        for _ in range(self._READ_RETRIES):
+            seq, name, token = self._SLOT.unpack_from(self._mmap, self._offset(index))
+            if seq % 2 == 0 and self._SLOT.unpack_from(self._mmap, self._offset(index))[0] == seq:
+                return name.rstrip(b'\0').decode('utf-8'), token.rstrip(b'\0').decode('ascii')
+        return None
+
+    def _find(self, key):
+        """Índice do slot da chave (ou None); slots preenchidos em ordem"""
+        index = self._positions.get(key)
+        if index is not None:
+            return index
+        for index in range(self.slots):
+            entry = self._read_slot(index)
+            if entry is None:
+                continue
+            name, _ = entry
+            if not name:
+                return None
+            self._positions[name] = index
+            if name == key:
+                return index
+        return None
+
+    def get(self, key, default=None):
+        self._open()
+        index = self._find(key)
+        if index is None:
+            return default
+        entry = self._read_slot(index)
+        if entry is None:
+            # Gravação em andamento demorando: lê com o lock dos escritores
+            with self._locked():
+                entry = self._read_slot(index)
+        return entry[1] or default
+
+    def set(self, key, token):
+        """
+        Grava o token da chave; VersionTableFull se não houver slot livre
+
+        Returns:
+            str: Token anterior (None se a chave não existia), lido sob o
+                 mesmo lock da gravação
+        """
+        encoded = key.encode('utf-8')
+        if len(encoded) > 48 or len(token) > 16:
+            raise ValueError(f'Chave ou token de versão grande demais: {key}')
+
+        with self._locked():
+            index = self._find(key)
+            previous = None
+            if index is None:
+                index = next((i for i in range(self.slots) if not self._used(i)), None)
+                if index is None:
+                    raise VersionTableFull(f'Tabela de versões cheia ({self.slots} slots) em {self.path}')
+            else:
+                previous = self._read_slot(index)[1] or None
+            offset = self._offset(index)
+            seq = self._SLOT.unpack_from(self._mmap, offset)[0]
+            self._SLOT.pack_into(self._mmap, offset, seq + 1, encoded, token.encode('ascii'))
+            self._SLOT.pack_into(self._mmap, offset, seq + 2, encoded, token.encode('ascii'))
+            self._positions[key] = index
+        return previous
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def get_stats(self):
+        self._open()
+        used = sum(1 for i in range(self.slots) if self._used(i))
+        return {'path': self.path, 'slots': self.slots, 'used_slots': used}
+
+
+class LocalRedis:
+    """
+    Stand-in em processo para o subconjunto da API do redis-py usado pelo
+    RedisCache. Usado com CACHE_REDIS_URL='memory://' (testes/desenvolvimento).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, name):
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at <= time.time():
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name):
+        with self._lock:
+            return self._alive(name)
+
+    def set(self, name, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._alive(name) is not None:
+                return None
+            self._data[name] = (time.time() + ex if ex else 0, value)
+            return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def scan_iter(self, match=None):
+        prefix = match.rstrip('*') if match else ''
+        with self._lock:
+            keys = [name for name in self._data if name.startswith(prefix)]
+        return iter(keys)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+class RedisCache(BaseCache):
+    """Cache em Redis - compartilhado por todos os workers do cluster"""
+
+    backend_name = 'redis'
+
+    def __init__(self, client, default_timeout=CACHE_TIMEOUT, key_prefix='mobius:'):
+        super().__init__(default_timeout)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Cria o backend a partir de uma URL (memory:// usa o stand-in local)"""
+        if url.startswith('memory://'):
+            return cls(LocalRedis(), **kwargs)
+        if redis is None:
+            raise RuntimeError("CACHE_TYPE='redis' requer o pacote redis instalado")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, key):
+        return f'{self.key_prefix}{key}'
+
+    def get(self, key, default=None):
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            # Fail-open: indisponibilidade do Redis vira cache miss
+            logger.warning(f"Redis indisponível (get): {e}")
+            self.stats.incr('errors')
+            self.stats.incr('misses')
+            return default
+
+        if raw is None:
+            self.stats.incr('misses')
+            return default
+
+        self.stats.incr('hits')
+        return pickle.loads(raw)
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        try:
+            self.client.set(
+                self._key(key),
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                ex=int(timeout) if timeout > 0 else None
+            )
+        except Exception as e:
+            logger.warning(f"Redis indisponível (set): {e}")
+            self.stats.incr('errors')
+            return False
+        self.stats.incr('sets')
+        return True
+
+    def add(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        try:
+            added = self.client.set(
+                self._key(key),
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                ex=int(timeout) if timeout > 0 else None,
+                nx=True
+            )
+        except Exception as e:
+            logger.warning(f"Redis indisponível (add): {e}")
+            self.stats.incr('errors')
+            return False
+        if added:
+            self.stats.incr('sets')
+        return bool(added)
+
+    def delete(self, key):
+        try:
+            removed = bool(self.client.delete(self._key(key)))
+        except Exception as e:
+            logger.warning(f"Redis indisponível (delete): {e}")
+            self.stats.incr('errors')
+            return False
+        if removed:
+            self.stats.incr('deletes')
+        return removed
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=f'{self.key_prefix}*'))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis indisponível (clear): {e}")
+            self.stats.incr('errors')
+            return False
+        return True
+
+
+def create_backend(config):
+    """Instancia o backend configurado em CACHE_TYPE"""
+    cache_type = (config.get('CACHE_TYPE') or 'simple').lower()
+    timeout = config.get('CACHE_DEFAULT_TIMEOUT', CACHE_TIMEOUT)
+    max_entries = config.get('CACHE_THRESHOLD', CACHE_MAX_ENTRIES)
+
+    if cache_type in ('simple', 'memory'):
+        return MemoryCache(default_timeout=timeout, max_entries=max_entries)
+    if cache_type == 'filesystem':
+        return FileSystemCache(config['CACHE_DIR'], default_timeout=timeout, max_entries=max_entries)
+    if cache_type == 'redis':
+        return RedisCache.from_url(
+            config.get('CACHE_REDIS_URL', 'memory://'),
+            default_timeout=timeout,
+            key_prefix=config.get('CACHE_KEY_PREFIX', 'mobius:')
+        )
+    if cache_type == 'null':
+        return NullCache(default_timeout=timeout)
+
+    raise ValueError(f"CACHE_TYPE desconhecido: {cache_type}")
+
+
+class Cache:
+    """
+    Extensão de cache da aplicação
+
+    Usage:
+        cache.init_app(app)
+
+        @cache.memoize(timeout=60)
+        def expensive(arg):
+            ...
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryCache()
+        self.shared = None  # SharedMemoryCache quando SHARED_MEMORY_PATH está configurado
+        self.shared_versions = None  # SharedVersionTable no mesmo caso
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura o backend a partir de app.config"""
+        self.backend = create_backend(app.config)
+        path = app.config.get('SHARED_MEMORY_PATH')
+        if path and fcntl is None:
+            logger.warning("SHARED_MEMORY_PATH ignorado: fcntl indisponível nesta plataforma")
+        elif path:
+            self.use_shared_memory(path, app.config.get('SHARED_MEMORY_SIZE', SHARED_MEMORY_SIZE))
+        app.extensions['cache'] = self
+
+    def use_shared_memory(self, path, size=SHARED_MEMORY_SIZE):
+        """Snapshots em `path` e versões de dados em `path`.versions"""
+        self.shared = SharedMemoryCache(path, size=size)
+        self.shared_versions = SharedVersionTable(f'{path}.versions')
+
+    def get(self, key, default=None):
+        return self.backend.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        return self.backend.set(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        return self.backend.add(key, value, timeout)
+
+    def delete(self, key):
+        return self.backend.delete(key)
+
+    def clear(self):
+        return self.backend.clear()
+
+    def get_stats(self):
+        data = self.backend.get_stats()
+        if self.shared is not None:
+            data['shared_memory'] = self.shared.get_stats()
+        if self.shared_versions is not None:
+            data['shared_versions'] = self.shared_versions.get_stats()
+        return data
+
+    def get_versions(self, tables, fresh=False):
+        """
+        Retorna os tokens de versão de dados das tabelas (na ordem informada)
+
+        Os tokens ficam no backend sem expiração e são lidos uma vez por
+        requisição (fresh=True força nova leitura). Um token ausente (ex.: descartado pelo LRU) é recriado com
+        valor novo, o que invalida as entradas antigas em vez de reaproveitá-las.
+        """
+        local = g.setdefault('_data_versions', {}) if has_request_context() else {}
+        versions = []
+        for table in tables:
+            token = None if fresh else local.get(table)
+            if token is None:
+                token = self._read_version(table)
+                if token is None:
+                    token = self._new_version(table)
+                local[table] = token
+            versions.append(token)
+        return tuple(versions)
+
+    def bump_versions(self, tables):
+        """
+        Gera novas versões para as tabelas alteradas
+
+        Returns:
+            dict: tabela -> (token anterior, token novo)
+        """
+        local = g.setdefault('_data_versions', {}) if has_request_context() else {}
+        bumped = {}
+        for table in tables:
+            bumped[table] = self._write_version(table)
+            local[table] = bumped[table][1]
+        return bumped
+
+    def _read_version(self, table):
+        if self.shared_versions is not None:
+            return self.shared_versions.get(table)
+        return self.backend.get(f'dv:{table}')
+
+    def _new_version(self, table):
+        """Grava um token novo para a tabela"""
+        return self._write_version(table)[1]
+
+    def _write_version(self, table):
+        """
+        Grava um token novo para a tabela e retorna (anterior, novo)
+
+        Na tabela compartilhada a troca é atômica; nos demais backends o token
+        anterior é lido antes da gravação (outro worker pode gravar entre as
+        duas operações). Com a tabela compartilhada cheia, VersionTableFull é
+        propagada: um token que não foi gravado deixaria cada worker com uma
+        versão diferente.
+        """
+        token = uuid.uuid4().hex[:16]
+        if self.shared_versions is not None:
+            return self.shared_versions.set(table, token), token
+
+        previous = self.backend.get(f'dv:{table}')
+        if not self.backend.set(f'dv:{table}', token, timeout=0):
+            # Backend indisponível: o token vale só para este processo até a
+            # próxima leitura, que gera outro (nada é reaproveitado de versões antigas)
+            logger.error(f"Versão de dados de '{table}' não gravada no cache ({self.backend.backend_name})")
+            previous = None
+        return previous, token
+
+    @staticmethod
+    def make_key(prefix, args, kwargs):
+        """Gera chave estável a partir dos argumentos da função"""
+        raw = repr((args, sorted(kwargs.items())))
+        return f"{prefix}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+    def memoize(self, timeout=None, key_prefix=None, depends_on=()):
+        """
+        Decorator que armazena o resultado da função no backend configurado
+
+        Args:
+            timeout (int): Tempo em segundos (None = CACHE_DEFAULT_TIMEOUT)
+            key_prefix (str): Prefixo da chave (padrão: módulo.função)
+            depends_on (tuple): Tabelas cujas versões de dados compõem a chave;
+                qualquer escrita nelas gera uma chave nova
+
+        O wrapper expõe cache_clear() para invalidar as chaves geradas neste processo.
+        """
+        def decorator(func):
+            prefix = key_prefix or f'{func.__module__}.{func.__qualname__}'
+            known_keys = {}
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                base_key = key = self.make_key(prefix, args, kwargs)
+                if depends_on:
+                    key = f"{base_key}:{'.'.join(self.get_versions(depends_on))}"
+                value = self.backend.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                value = func(*args, **kwargs)
+                self.backend.set(key, value, timeout)
+                known_keys[base_key] = key
+                return value
+
+            def cache_clear():
+                for key in list(known_keys.values()):
+                    self.backend.delete(key)
+                known_keys.clear()
+
+            wrapper.cache_clear = cache_clear
+            wrapper.uncached = func
+            return wrapper
+        return decorator
+
+
+cache = Cache()
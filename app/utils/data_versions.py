@@ -0,0 +1,106 @@
+"""
+Versões de dados por tabela - invalidação de cache dirigida por escrita
+
+Cada commit que altera clients, contracts ou notifications gera uma nova
+versão para a tabela. Resultados em cache usam essas versões na chave
+(cache.memoize(depends_on=...)), então podem ter TTL longo sem servir
+números desatualizados.
+"""
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.utils.cache import cache
+
+TRACKED_TABLES = ('clients', 'contracts', 'notifications')
+
+_SESSION_KEY = 'changed_tables'
+
+# Tokens trocados no último commit da sessão, para listeners registrados depois
+# deste módulo (ex.: índice de sugestões) saberem se só o próprio commit mudou
+BUMPED_KEY = 'bumped_versions'
+
+
+def get_versions(*tables, fresh=False):
+    """Retorna as versões atuais das tabelas informadas"""
+    return cache.get_versions(tables or TRACKED_TABLES, fresh=fresh)
+
+
+def fingerprint(*tables):
+    """
+    Impressão digital durável das tabelas (sobrevive a reinícios)
+
+    COUNT, MAX(id) e a última alteração (updated_at/read_at) de cada tabela:
+    detecta inserções, remoções e edições feitas pelo ORM, ao contrário dos
+    tokens de versão, que são gerados por processo/backend de cache.
+    """
+    from app import db
+
+    result = {}
+    for name in tables or TRACKED_TABLES:
+        table = db.metadata.tables[name]
+        columns = [func.count(), func.max(table.c.id)]
+        columns += [func.max(table.c[column]) for column in ('updated_at', 'read_at') if column in table.c]
+        row = db.session.execute(select(*columns).select_from(table)).one()
+        result[name] = tuple(str(value) for value in row)
+    return result
+
+
+def bump(*tables):
+    """
+    Invalida manualmente as tabelas (ex.: após SQL bruto via text())
+
+    Returns:
+        dict: tabela -> (token anterior, token novo)
+    """
+    return cache.bump_versions(tables)
+
+
+def _mark(session, tables):
+    session.info.setdefault(_SESSION_KEY, set()).update(tables)
+
+
+def _after_flush(session, flush_context):
+    """Registra as tabelas alteradas no flush; a versão só muda no commit"""
+    tables = set()
+    for obj in session.new | session.deleted:
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(obj.__table__.name)
+
+    tracked = tables.intersection(TRACKED_TABLES)
+    if tracked:
+        _mark(session, tracked)
+
+
+def _do_orm_execute(orm_execute_state):
+    """Captura UPDATE/DELETE em massa (query.update(), query.delete())"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and table.name in TRACKED_TABLES:
+            _mark(orm_execute_state.session, {table.name})
+
+
+def _after_commit(session):
+    tables = session.info.pop(_SESSION_KEY, None)
+    session.info[BUMPED_KEY] = bump(*sorted(tables)) if tables else {}
+
+
+def _after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+_LISTENERS = (
+    ('after_flush', _after_flush),
+    ('do_orm_execute', _do_orm_execute),
+    ('after_commit', _after_commit),
+    ('after_rollback', _after_rollback),
+)
+
+
+def init_app(app):
+    """Registra os hooks de sessão do SQLAlchemy (idempotente)"""
+    for name, listener in _LISTENERS:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
@@ -2,9 +2,12 @@
 Decorators úteis para a aplicação
 """
 
+import hashlib
+from datetime import date
 from functools import wraps
-from flask import render_template, flash, current_app, jsonify
+from flask import render_template, flash, current_app, jsonify, make_response, g
 from app.utils.imports import request
+from app.utils.cache import cache
 
 
 def handle_route_errors(template_name='errors/error.html', json_response=False):
@@ -80,7 +83,7 @@ def validate_json(required_fields=None):
 
 def cache_response(timeout=300, key_prefix=None):
     """
-    Decorator para cache de respostas (simplificado)
+    Decorator para cache de respostas no backend configurado (CACHE_TYPE)
     
     Args:
         timeout (int): Tempo em segundos
@@ -92,20 +95,71 @@ def cache_response(timeout=300, key_prefix=None):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Cache simples em memória (em produção, usar Redis)
-            cache_key = f"{key_prefix or func.__name__}_{hash(str(args) + str(kwargs))}"
+            cache_key = cache.make_key(
+                f"view:{key_prefix or func.__name__}",
+                (request.full_path,) + args,
+                kwargs
+            )
             
-            # Implementação básica - substituir por Flask-Caching em produção
-            if not hasattr(cache_response, '_cache'):
-                cache_response._cache = {}
+            cached = cache.get(cache_key)
+            if cached is not None:
+                body, status, headers = cached
+                return current_app.response_class(body, status=status, headers=headers)
             
-            cached_result = cache_response._cache.get(cache_key)
-            if cached_result:
-                return cached_result
+            response = make_response(func(*args, **kwargs))
             
-            result = func(*args, **kwargs)
-            cache_response._cache[cache_key] = result
-            return result
+            # Apenas respostas de sucesso são armazenadas (sem objetos Response no cache)
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(cache_key, (
+                    response.get_data(),
+                    response.status_code,
+                    {'Content-Type': response.content_type}
+                ), timeout)
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional_response(depends_on, key_prefix=None):
+    """
+    Decorator para GET condicional (ETag forte / 304 Not Modified)
+    
+    A ETag é derivada das versões de dados das tabelas, da URL com os
+    parâmetros e da data atual, então é calculada sem consultar o banco.
+    Se o cliente envia If-None-Match com a mesma ETag, a view nem é executada.
+    
+    Args:
+        depends_on (tuple): Tabelas que compõem a resposta
+        key_prefix (str): Prefixo da ETag (padrão: nome da função)
+    
+    Usage:
+        @conditional_response(depends_on=('clients', 'contracts'))
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            raw = repr((
+                key_prefix or func.__name__,
+                request.path,
+                sorted(request.args.items(multi=True)),
+                date.today().isoformat(),
+                cache.get_versions(depends_on)
+            ))
+            etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+            
+            if etag in request.if_none_match:
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+            
+            response = make_response(func(*args, **kwargs))
+            
+            # Snapshot antigo servido durante revalidação não recebe a ETag atual
+            if response.status_code == 200 and not g.get('stale_snapshot'):
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+            return response
         return wrapper
     return decorator
 
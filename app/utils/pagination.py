@@ -0,0 +1,192 @@
+"""
+Paginação por cursor (keyset) com totais em cache
+
+Em vez de OFFSET, cada página continua a partir da chave de ordenação do
+último item (coluna indexada + id como desempate), então páginas profundas
+custam o mesmo que a primeira. O cursor é opaco (base64 de JSON) e o total
+vem de um COUNT em cache, recalculado apenas quando as tabelas mudam.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, or_
+
+from app.utils.cache import cache
+from app.constants import PAGINATION_COUNT_TIMEOUT
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou gerado para outra ordenação"""
+
+
+class KeysetPage:
+    """Página de resultados com cursores para a próxima/anterior"""
+
+    def __init__(self, items, per_page, sort, order, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.sort = sort
+        self.order = order
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def to_dict(self):
+        """Metadados de paginação para respostas da API"""
+        return {
+            'per_page': self.per_page,
+            'total': self.total,
+            'sort': self.sort,
+            'order': self.order,
+            'next_cursor': self.next_cursor,
+            'prev_cursor': self.prev_cursor,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev
+        }
+
+
+def _to_json(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(value, column):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort, order, values, backwards=False):
+    """Gera cursor opaco a partir dos valores de ordenação do item"""
+    payload = {'s': sort, 'o': order, 'k': [_to_json(value) for value in values]}
+    if backwards:
+        payload['b'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, order, columns):
+    """
+    Decodifica o cursor e valida que pertence à mesma ordenação
+
+    Returns:
+        tuple: (valores de ordenação, é_página_anterior)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload['s'] != sort or payload['o'] != order or len(payload['k']) != len(columns):
+            raise InvalidCursor('Cursor não corresponde à ordenação solicitada')
+        values = tuple(_from_json(value, column) for value, column in zip(payload['k'], columns))
+        return values, bool(payload.get('b'))
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor('Cursor inválido') from e
+
+
+def cached_count(query, depends_on=(), timeout=PAGINATION_COUNT_TIMEOUT):
+    """
+    COUNT(*) da query em cache
+
+    A chave inclui o SQL, os parâmetros e as versões de dados das tabelas,
+    então o total só é recontado depois de uma escrita (ou do timeout).
+    """
+    compiled = query.statement.compile()
+    key = cache.make_key('count', (str(compiled),), compiled.params)
+    if depends_on:
+        key = f"{key}:{'.'.join(cache.get_versions(depends_on))}"
+
+    total = cache.get(key)
+    if total is None:
+        total = query.order_by(None).count()
+        cache.set(key, total, timeout)
+    return total
+
+
+def keyset_paginate(query, model, sort='id', order='asc', cursor=None, per_page=20,
+                    allowed_sorts=('id',), count_depends_on=()):
+    """
+    Pagina a query por keyset
+
+    Args:
+        query: Query filtrada (sem ORDER BY)
+        model: Model com a coluna de ordenação e `id` para desempate
+        sort (str): Coluna de ordenação (deve estar em allowed_sorts e indexada com id)
+        order (str): 'asc' ou 'desc'
+        cursor (str): Cursor recebido de uma página anterior
+        per_page (int): Itens por página
+        allowed_sorts (tuple): Colunas permitidas
+        count_depends_on (tuple): Tabelas cujas versões invalidam o total
+
+    Raises:
+        InvalidCursor: Cursor, ordenação ou direção inválidos
+    """
+    if sort not in allowed_sorts:
+        raise InvalidCursor(f'Ordenação inválida: {sort}')
+    if order not in ('asc', 'desc'):
+        raise InvalidCursor(f'Direção inválida: {order}')
+
+    sort_column = getattr(model, sort)
+    columns = (sort_column,) if sort == 'id' else (sort_column, model.id)
+
+    total = cached_count(query, count_depends_on)
+
+    backwards = False
+    if cursor:
+        values, backwards = decode_cursor(cursor, sort, order, columns)
+        # Página anterior percorre o índice no sentido inverso
+        ascending = (order == 'asc') != backwards
+        query = query.filter(_after(columns, values, ascending))
+    else:
+        ascending = order == 'asc'
+
+    query = query.order_by(*(column.asc() if ascending else column.desc() for column in columns))
+    rows = query.limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    if backwards:
+        items.reverse()
+
+    def key_of(item):
+        return [getattr(item, column.key) for column in columns]
+
+    next_cursor = prev_cursor = None
+    if items:
+        # Voltando, sempre há a página de onde viemos; avançando, sempre há a anterior
+        if has_more or backwards:
+            next_cursor = encode_cursor(sort, order, key_of(items[-1]))
+        if (has_more and backwards) or (cursor and not backwards):
+            prev_cursor = encode_cursor(sort, order, key_of(items[0]), backwards=True)
+
+    return KeysetPage(items, per_page, sort, order, next_cursor, prev_cursor, total)
+
+
+def _after(columns, values, ascending):
+    """Condição (col, id) > (v, id_v) expandida para usar o índice composto"""
+    column, value = columns[0], values[0]
+    beyond = column > value if ascending else column < value
+    if len(columns) == 1:
+        return beyond
+    return or_(beyond, and_(column == value, _after(columns[1:], values[1:], ascending)))
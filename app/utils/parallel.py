@@ -0,0 +1,124 @@
+"""
+Execução paralela de queries de leitura independentes
+
+Cada tarefa de um `QueryGroup` roda em uma thread de um pool compartilhado
+pelo processo, dentro do seu próprio app context. A sessão do Flask-SQLAlchemy
+é escopada por app context, então cada tarefa usa uma conexão própria do pool
+do engine e a devolve ao terminar. O tempo total tende ao da query mais lenta
+em vez da soma.
+
+    results = (QueryGroup()
+               .add('stats', DashboardService.get_basic_stats)
+               .add('top', DashboardService.get_top_clients, 5)
+               .run())
+
+As tarefas devem retornar dados prontos (dicts, tuplas), não objetos ORM: a
+sessão da thread é fechada ao final da tarefa. Sem paralelismo possível
+(desativado, SQLite em memória ou grupo aninhado) o grupo roda em sequência.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+class QueryTimeout(TimeoutError):
+    """Tarefas do grupo não terminaram dentro do tempo limite"""
+
+
+def _get_executor(max_workers):
+    """Pool de threads do processo (criado no primeiro uso)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='query-group')
+    return _executor
+
+
+def _shares_single_connection():
+    """SQLite em memória: cada conexão veria um banco diferente"""
+    url = db.engine.url
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+class QueryGroup:
+    """Grupo de queries de leitura independentes executadas em paralelo"""
+
+    def __init__(self, max_concurrency=None, timeout=None):
+        """
+        Args:
+            max_concurrency (int): Tarefas simultâneas deste grupo
+                (padrão PARALLEL_QUERY_CONCURRENCY)
+            timeout (float): Segundos para o grupo inteiro terminar
+                (padrão PARALLEL_QUERY_TIMEOUT)
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._tasks = []
+
+    def add(self, name, func, *args, **kwargs):
+        """Declara uma tarefa; o resultado fica em results[name]"""
+        self._tasks.append((name, func, args, kwargs))
+        return self
+
+    def run(self):
+        """
+        Executa as tarefas e retorna {nome: resultado}
+
+        Raises:
+            QueryTimeout: Se o grupo exceder o tempo limite
+            Exception: A primeira exceção levantada por uma tarefa
+        """
+        config = current_app.config
+        if (len(self._tasks) < 2 or not config.get('PARALLEL_QUERIES', True)
+                or getattr(_local, 'in_worker', False) or _shares_single_connection()):
+            return {name: func(*args, **kwargs) for name, func, args, kwargs in self._tasks}
+
+        app = current_app._get_current_object()
+        executor = _get_executor(config.get('PARALLEL_QUERY_WORKERS', 8))
+        limit = threading.BoundedSemaphore(self.max_concurrency or config.get('PARALLEL_QUERY_CONCURRENCY', 4))
+        timeout = self.timeout if self.timeout is not None else config.get('PARALLEL_QUERY_TIMEOUT', 10)
+        deadline = time.monotonic() + timeout
+
+        futures = {}
+        try:
+            for name, func, args, kwargs in self._tasks:
+                # Limite por grupo: só submete quando houver vaga
+                if not limit.acquire(timeout=max(0, deadline - time.monotonic())):
+                    raise QueryTimeout(f'Tempo esgotado aguardando vaga para {name}')
+                future = executor.submit(_call, app, func, args, kwargs)
+                future.add_done_callback(lambda _, limit=limit: limit.release())
+                futures[future] = name
+
+            done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()))
+            if pending:
+                raise QueryTimeout('Tempo esgotado em: ' + ', '.join(sorted(futures[f] for f in pending)))
+        except QueryTimeout:
+            for future in futures:
+                future.cancel()
+            logger.warning('Grupo de queries excedeu %ss', timeout)
+            raise
+
+        return {name: future.result() for future, name in futures.items()}
+
+
+def _call(app, func, args, kwargs):
+    """Executa a tarefa em um app context (e sessão/conexão) próprio"""
+    with app.app_context():
+        _local.in_worker = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.in_worker = False
@@ -0,0 +1,219 @@
+"""
+PDF de tabelas grandes - blocos de linhas renderizados em paralelo
+
+O reportlab fica lento com uma única `Table` de dezenas de milhares de linhas
+(a quebra de página mede e divide a tabela inteira repetidamente). Aqui as
+linhas são divididas em blocos de PDF_CHUNK_ROWS, cada bloco vira uma
+`LongTable` com larguras de coluna fixas (calculadas uma vez) e o cabeçalho
+repetido a cada página:
+
+    - com pypdf: os blocos são renderizados em um pool de processos (fora do
+      GIL dos workers web) e os PDFs resultantes são concatenados
+    - sem pypdf: os blocos são renderizados em sequência no mesmo documento
+
+Acima de PDF_MAX_ROWS_PER_FILE linhas o relatório é dividido em vários PDFs
+entregues em um arquivo .zip.
+"""
+
+import atexit
+import io
+import logging
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover - dependência opcional
+    pypdf = None
+
+from app.constants import PDF_CHUNK_ROWS, PDF_MAX_ROWS_PER_FILE, PDF_RENDER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+]
+
+_MARGIN = 72  # margens padrão do SimpleDocTemplate (1 polegada)
+_WIDTH_SAMPLE = 500  # linhas usadas para estimar as larguras das colunas
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    """Pool de processos (spawn: não herda locks/conexões do processo web)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=max_workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+                atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _discard_executor():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _setting(name, default):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def column_widths(headers, rows, total_width=A4[0] - 2 * _MARGIN):
+    """Larguras proporcionais ao maior texto de cada coluna (amostra das linhas)"""
+    sizes = [max(len(str(header)), 4) for header in headers]
+    for row in rows[:_WIDTH_SAMPLE]:
+        for i, value in enumerate(row):
+            sizes[i] = max(sizes[i], len(str(value)))
+    total = sum(sizes)
+    return [total_width * size / total for size in sizes]
+
+
+def _styles():
+    styles = getSampleStyleSheet()
+    title = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18,
+                           spaceAfter=30, textColor=colors.darkblue, alignment=1)
+    return styles, title
+
+
+def _story(chunk):
+    """Flowables de um bloco (título no primeiro, rodapé no último)"""
+    styles, title_style = _styles()
+    story = []
+    if chunk['first']:
+        story.append(Paragraph(chunk['title'], title_style))
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(chunk['subtitle'], styles['Normal']))
+        story.append(Spacer(1, 20))
+    if chunk['rows']:
+        table = LongTable([chunk['headers']] + chunk['rows'], colWidths=chunk['col_widths'], repeatRows=1)
+        table.setStyle(TableStyle(TABLE_STYLE))
+        story.append(table)
+    if chunk['footer']:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph(chunk['footer'], styles['Normal']))
+    return story
+
+
+def _render_chunk(chunk):
+    """Renderiza um bloco como PDF independente (executa no pool de processos)"""
+    output = io.BytesIO()
+    SimpleDocTemplate(output, pagesize=A4).build(_story(chunk))
+    return output.getvalue()
+
+
+def _render_sequential(chunks):
+    output = io.BytesIO()
+    story = []
+    for chunk in chunks:
+        story.extend(_story(chunk))
+    SimpleDocTemplate(output, pagesize=A4).build(story)
+    return output.getvalue()
+
+
+def _merge(parts):
+    writer = pypdf.PdfWriter()
+    for part in parts:
+        writer.append(io.BytesIO(part))
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _chunks_for_file(title, subtitle, headers, rows, widths, footer, chunk_rows):
+    chunks = []
+    starts = range(0, len(rows), chunk_rows) if rows else [0]
+    for n, start in enumerate(starts):
+        chunks.append({
+            'title': title,
+            'subtitle': subtitle,
+            'headers': headers,
+            'rows': rows[start:start + chunk_rows],
+            'col_widths': widths,
+            'first': n == 0,
+            'footer': footer if n == len(starts) - 1 else None,
+        })
+    return chunks
+
+
+def render_table_pdf(title, headers, rows, footer=None, base_name='relatorio'):
+    """
+    Gera o PDF de uma tabela grande
+
+    Args:
+        title (str): Título do relatório
+        headers (list): Cabeçalho da tabela
+        rows: Iterável de linhas (listas de textos já formatados)
+        footer (str): Rodapé; '{total}' é substituído pelo total de linhas
+        base_name (str): Nome base dos PDFs dentro do .zip
+
+    Returns:
+        tuple: (BytesIO, extensão) - '.pdf' ou '.zip' quando dividido
+    """
+    rows = list(rows)
+    chunk_rows = _setting('PDF_CHUNK_ROWS', PDF_CHUNK_ROWS)
+    max_rows = _setting('PDF_MAX_ROWS_PER_FILE', PDF_MAX_ROWS_PER_FILE)
+    widths = column_widths(headers, rows)
+    generated = f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+    footer = footer.format(total=len(rows)) if footer else None
+
+    groups = [rows[start:start + max_rows] for start in range(0, len(rows), max_rows)] or [[]]
+    files = []
+    for n, group in enumerate(groups, start=1):
+        subtitle = generated if len(groups) == 1 else f'{generated} - Parte {n} de {len(groups)}'
+        files.append(_chunks_for_file(title, subtitle, headers, group, widths, footer, chunk_rows))
+
+    pdfs = _render_files(files)
+    if len(pdfs) == 1:
+        return io.BytesIO(pdfs[0]), '.pdf'
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for n, pdf in enumerate(pdfs, start=1):
+            archive.writestr(f'{base_name}_parte{n:02d}.pdf', pdf)
+    output.seek(0)
+    return output, '.zip'
+
+
+def _render_files(files):
+    """PDF de cada arquivo: blocos em paralelo + concatenação, ou em sequência"""
+    total_chunks = sum(len(chunks) for chunks in files)
+    if pypdf is None or total_chunks < 2 or not _setting('PDF_PARALLEL', True):
+        return [_render_sequential(chunks) for chunks in files]
+
+    try:
+        executor = _get_executor(_setting('PDF_RENDER_WORKERS', PDF_RENDER_WORKERS))
+        flat = [chunk for chunks in files for chunk in chunks]
+        rendered = iter(executor.map(_render_chunk, flat))
+        return [_merge([next(rendered) for _ in chunks]) for chunks in files]
+    except Exception as e:
+        # Pool indisponível (ex.: processo sem permissão para criar filhos);
+        # um pool quebrado é descartado e recriado na próxima chamada
+        if isinstance(e, BrokenProcessPool):
+            _discard_executor()
+        logger.warning(f'Renderização paralela de PDF falhou, usando sequencial: {e}')
+        return [_render_sequential(chunks) for chunks in files]
@@ -0,0 +1,167 @@
+"""
+Cache de resultados de queries (L1 no processo + L2 compartilhado)
+
+Opt-in por query: troque `db.session.execute(stmt)` por
+`query_cache.execute(stmt)` em leituras repetidas entre requisições.
+
+    rows = query_cache.execute(
+        select(Contract.status, func.count()).group_by(Contract.status)
+    ).all()
+
+A chave é o SQL compilado para o dialeto do engine mais os parâmetros, e
+cada entrada leva as versões de dados (app/utils/data_versions.py) das
+tabelas usadas pela query: um commit em qualquer uma delas gera chaves novas
+e as entradas antigas deixam de ser lidas (expiram por TTL/LRU).
+
+    L1: MemoryCache do processo - sem serialização nem rede
+    L2: backend do `cache` (filesystem/redis) - compartilhado entre workers;
+        ignorado quando o backend já é a memória do processo
+
+O resultado é um `FrozenResult` do SQLAlchemy: cada chamada recebe um
+`Result` novo (.all(), .scalar(), .one(), .mappings()...). Apenas selects de
+colunas são aceitos; entidades ORM ficam presas à sessão que as carregou.
+"""
+
+import hashlib
+import logging
+import threading
+
+from flask import current_app
+from sqlalchemy.sql.util import find_tables
+
+from app import db
+from app.utils.cache import cache, MemoryCache, _MISSING
+from app.utils.data_versions import TRACKED_TABLES, _SESSION_KEY
+from app.constants import CACHE_VERSIONED_TIMEOUT, QUERY_CACHE_L1_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Cache em dois níveis para resultados de selects do SQLAlchemy"""
+
+    FIELDS = ('l1_hits', 'l2_hits', 'misses', 'bypasses')
+
+    def __init__(self, cache_ext, l1_size=QUERY_CACHE_L1_SIZE):
+        self.cache = cache_ext
+        self.l1 = MemoryCache(default_timeout=CACHE_VERSIONED_TIMEOUT, max_entries=l1_size)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def init_app(self, app):
+        """Dimensiona o L1 a partir de app.config"""
+        self.l1 = MemoryCache(
+            default_timeout=app.config.get('QUERY_CACHE_TIMEOUT', CACHE_VERSIONED_TIMEOUT),
+            max_entries=app.config.get('QUERY_CACHE_L1_SIZE', QUERY_CACHE_L1_SIZE)
+        )
+        app.extensions['query_cache'] = self
+
+    @property
+    def l2(self):
+        """Backend compartilhado (None se for a própria memória do processo)"""
+        backend = self.cache.backend
+        if backend.backend_name in ('memory', 'null'):
+            return None
+        return backend
+
+    def execute(self, statement, timeout=None, tables=None):
+        """
+        Executa o select ou devolve o resultado em cache
+
+        Args:
+            statement: select() do SQLAlchemy (somente colunas/expressões)
+            timeout (int): TTL das entradas (None = QUERY_CACHE_TIMEOUT)
+            tables (tuple): Tabelas que invalidam a entrada; por padrão as
+                encontradas no statement (todas devem ter versão de dados)
+
+        Returns:
+            Result: resultado novo a cada chamada
+
+        Raises:
+            ValueError: Select de entidades ORM ou tabela sem versão de dados
+        """
+        tables = tuple(sorted(tables)) if tables is not None else self.tables_for(statement)
+
+        if not self._enabled() or self._has_pending_writes(tables):
+            self._incr('bypasses')
+            return db.session.execute(statement)
+
+        key = self.make_key(statement, tables)
+        frozen = self.l1.get(key, _MISSING)
+        if frozen is not _MISSING:
+            self._incr('l1_hits')
+            return frozen()
+
+        l2 = self.l2
+        frozen = l2.get(key, _MISSING) if l2 is not None else _MISSING
+        if frozen is not _MISSING:
+            self._incr('l2_hits')
+        else:
+            self._incr('misses')
+            frozen = db.session.execute(statement).freeze()
+            if l2 is not None:
+                l2.set(key, frozen, timeout)
+        self.l1.set(key, frozen, timeout)
+        return frozen()
+
+    def scalar(self, statement, **kwargs):
+        """Atalho para execute(...).scalar()"""
+        return self.execute(statement, **kwargs).scalar()
+
+    @staticmethod
+    def tables_for(statement):
+        """Tabelas lidas pelo statement (inclusive joins e subqueries)"""
+        for column in statement.column_descriptions:
+            if isinstance(column['type'], type):
+                raise ValueError(f"query_cache aceita apenas colunas, não entidades ORM ({column['name']})")
+
+        tables = {table.name for table in find_tables(statement, include_joins=True, include_aliases=True)}
+        untracked = tables.difference(TRACKED_TABLES)
+        if untracked:
+            raise ValueError(f"Tabelas sem versão de dados: {', '.join(sorted(untracked))} (informe tables=...)")
+        return tuple(sorted(tables))
+
+    def make_key(self, statement, tables):
+        """SQL compilado + parâmetros + versões das tabelas"""
+        compiled = statement.compile(dialect=db.engine.dialect)
+        raw = f"{compiled}\x00{sorted(compiled.params.items())!r}"
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        versions = '.'.join(self.cache.get_versions(tables)) if tables else ''
+        return f'qc:{digest}:{versions}'
+
+    def clear(self):
+        """Esvazia o L1 (entradas do L2 são invalidadas pelas versões)"""
+        self.l1.clear()
+
+    def get_stats(self):
+        """Acertos por nível, misses e leituras que ignoraram o cache"""
+        with self._lock:
+            data = dict(self._counters)
+        lookups = data['l1_hits'] + data['l2_hits'] + data['misses']
+        data['hit_rate'] = round((data['l1_hits'] + data['l2_hits']) / lookups * 100, 2) if lookups else 0.0
+        data['l1_entries'] = self.l1.get_stats()['entries']
+        data['l2_backend'] = self.l2.backend_name if self.l2 is not None else None
+        return data
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def _incr(self, field):
+        with self._lock:
+            self._counters[field] += 1
+
+    def _enabled(self):
+        return current_app.config.get('QUERY_CACHE', True) and self.cache.backend.backend_name != 'null'
+
+    @staticmethod
+    def _has_pending_writes(tables):
+        """A sessão atual alterou as tabelas e ainda não fez commit"""
+        session = db.session()
+        pending = set(session.info.get(_SESSION_KEY, ()))
+        for obj in session.new | session.dirty | session.deleted:
+            pending.add(obj.__table__.name)
+        return not pending.isdisjoint(tables)
+
+
+query_cache = QueryCache(cache)
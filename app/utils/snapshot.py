@@ -0,0 +1,194 @@
+"""
+Snapshots stale-while-revalidate com recomputação single-flight
+
+Leitores recebem imediatamente o último snapshot bom. Quando ele envelhece
+(idade > max_age ou versão de dados alterada) uma única atualização roda em
+segundo plano por chave; sem snapshot algum, apenas um chamador calcula e os
+demais aguardam o mesmo resultado em vez de repetir as queries.
+
+Com SHARED_MEMORY_PATH os snapshots e os locks ficam no arquivo mmap do host
+(cache.shared): um worker publica e todos leem o mesmo snapshot, com uma
+recomputação por host mesmo sem Redis.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app, g, has_request_context
+
+from app.utils.cache import cache
+from app.constants import CACHE_TIMEOUT, SNAPSHOT_RETENTION, SNAPSHOT_LOCK_TIMEOUT, SNAPSHOT_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """Snapshots armazenados no cache compartilhado"""
+
+    def __init__(self, cache_ext):
+        self.cache = cache_ext
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._known = {}  # chave -> tabelas (snapshots usados neste processo)
+
+    @property
+    def store(self):
+        """Armazenamento dos snapshots: mmap do host se configurado, senão o cache"""
+        return self.cache.shared or self.cache
+
+    def get(self, key, compute, depends_on=(), max_age=CACHE_TIMEOUT, wait_timeout=None):
+        """
+        Retorna o snapshot de `key`, calculando-o com `compute()` se necessário
+
+        Args:
+            key (str): Identificador do snapshot
+            compute (callable): Função sem argumentos que gera o valor
+            depends_on (tuple): Tabelas cujas versões tornam o snapshot obsoleto
+            max_age (int): Idade máxima em segundos antes de revalidar
+            wait_timeout (float): Espera máxima por um cálculo em andamento
+        """
+        self._known[key] = tuple(depends_on)
+        versions = self.cache.get_versions(depends_on) if depends_on else ()
+        entry = self.store.get(f'snapshot:{key}')
+
+        if entry is None:
+            return self._compute_single_flight(key, compute, versions, wait_timeout)
+
+        if entry['versions'] != versions or time.time() - entry['created_at'] > max_age:
+            self._refresh_in_background(key, compute, versions)
+            if has_request_context():
+                g.stale_snapshot = True
+
+        return entry['value']
+
+    def invalidate(self, key):
+        """Remove o snapshot (o próximo leitor recalcula)"""
+        self.store.delete(f'snapshot:{key}')
+
+    def export(self):
+        """
+        Snapshots atuais (versões ainda válidas) usados neste processo
+
+        Returns:
+            dict: chave -> {'value', 'created_at', 'depends_on'}
+        """
+        exported = {}
+        for key, depends_on in list(self._known.items()):
+            entry = self.store.get(f'snapshot:{key}')
+            versions = self.cache.get_versions(depends_on, fresh=True) if depends_on else ()
+            if entry is not None and entry['versions'] == versions:
+                exported[key] = {
+                    'value': entry['value'],
+                    'created_at': entry['created_at'],
+                    'depends_on': depends_on
+                }
+        return exported
+
+    def restore(self, exported):
+        """Grava snapshots exportados com as versões de dados atuais deste processo"""
+        for key, entry in exported.items():
+            versions = self.cache.get_versions(entry['depends_on'], fresh=True) if entry['depends_on'] else ()
+            self._known[key] = tuple(entry['depends_on'])
+            self._store(key, entry['value'], versions, created_at=entry['created_at'])
+        return len(exported)
+
+    def _store(self, key, value, versions, created_at=None):
+        self.store.set(f'snapshot:{key}', {
+            'value': value,
+            'versions': versions,
+            'created_at': created_at or time.time()
+        }, timeout=SNAPSHOT_RETENTION)
+
+    def _claim(self, key):
+        """Registra o cálculo em andamento; retorna (future, é_líder)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _release(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _compute_single_flight(self, key, compute, versions, wait_timeout):
+        future, leader = self._claim(key)
+        if not leader:
+            value = future.result(timeout=wait_timeout)
+            if value is not None:
+                return value
+            # O cálculo em andamento era um refresh que não obteve o lock
+            value = compute()
+            self._store(key, value, versions)
+            return value
+
+        lock_key = f'snapshot-lock:{key}'
+        try:
+            # Outro worker já está calculando: aguarda a publicação dele
+            if not self.store.add(lock_key, True, timeout=SNAPSHOT_LOCK_TIMEOUT):
+                entry = self._wait_for_entry(key, wait_timeout)
+                if entry is not None:
+                    future.set_result(entry['value'])
+                    return entry['value']
+                lock_key = None
+
+            try:
+                value = compute()
+                self._store(key, value, versions)
+            finally:
+                if lock_key:
+                    self.store.delete(lock_key)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._release(key, future)
+
+    def _wait_for_entry(self, key, wait_timeout):
+        """Aguarda o snapshot publicado por outro processo (None se não vier)"""
+        deadline = time.monotonic() + (wait_timeout or SNAPSHOT_LOCK_TIMEOUT)
+        while time.monotonic() < deadline:
+            entry = self.store.get(f'snapshot:{key}')
+            if entry is not None:
+                return entry
+            time.sleep(SNAPSHOT_POLL_INTERVAL)
+        return None
+
+    def _refresh_in_background(self, key, compute, versions):
+        future, leader = self._claim(key)
+        if not leader:
+            return
+
+        # Lock no cache compartilhado: um refresh por chave entre workers
+        lock_key = f'snapshot-lock:{key}'
+        if not self.store.add(lock_key, True, timeout=SNAPSHOT_LOCK_TIMEOUT):
+            future.set_result(None)
+            self._release(key, future)
+            return
+
+        app = current_app._get_current_object()
+
+        def refresh():
+            try:
+                with app.app_context():
+                    value = compute()
+                    self._store(key, value, versions)
+                future.set_result(value)
+            except Exception as e:
+                logger.error(f"Falha ao atualizar snapshot {key}: {e}")
+                future.set_exception(e)
+            finally:
+                self.store.delete(lock_key)
+                self._release(key, future)
+
+        threading.Thread(target=refresh, name=f'snapshot-{key}', daemon=True).start()
+
+
+snapshots = SnapshotCache(cache)
@@ -0,0 +1,163 @@
+"""
+Exportação em streaming - memória constante independente do número de linhas
+
+As linhas chegam de um gerador (normalmente um cursor com yield_per) e são
+gravadas uma a uma; nada mantém o conjunto completo em memória:
+
+    XLSX: xlsxwriter em modo constant_memory (uma linha por vez no XML da
+          planilha), larguras das colunas calculadas durante a escrita
+    CSV / NDJSON: geradores de blocos de bytes para respostas em streaming,
+          opcionalmente comprimidos com gzip durante o envio
+
+O arquivo XLSX fica em um SpooledTemporaryFile: em memória até
+EXPORT_SPOOL_MAX_SIZE e em disco acima disso, pronto para `send_file`.
+"""
+
+import csv
+import io
+import json
+import tempfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+import xlsxwriter
+
+from app.constants import EXPORT_SPOOL_MAX_SIZE, EXPORT_MAX_COLUMN_WIDTH, EXPORT_CHUNK_SIZE
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+HEADER_FORMAT = {
+    'bold': True,
+    'text_wrap': True,
+    'valign': 'top',
+    'fg_color': '#D7E4BC',
+    'border': 1
+}
+MONEY_FORMAT = {'num_format': 'R$ #,##0.00'}
+
+
+def spooled_file():
+    """Arquivo temporário em memória que passa para o disco quando cresce"""
+    return tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+
+
+class ColumnWidths:
+    """Largura de cada coluna (maior texto + 2) acumulada linha a linha"""
+
+    def __init__(self, columns, max_width=EXPORT_MAX_COLUMN_WIDTH):
+        self.max_width = max_width
+        self.widths = [len(str(column)) for column in columns]
+
+    def update(self, values):
+        widths = self.widths
+        for i, value in enumerate(values):
+            size = len(str(value)) if value is not None else 0
+            if size > widths[i]:
+                widths[i] = size
+
+    def apply(self, worksheet, formats=None):
+        """Define as larguras (e formatos por coluna) na planilha"""
+        formats = formats or {}
+        for i, width in enumerate(self.widths):
+            worksheet.set_column(i, i, min(width + 2, self.max_width), formats.get(i))
+
+
+def _values(row, columns):
+    """Valores da linha na ordem das colunas (aceita dicts ou sequências)"""
+    if isinstance(row, dict):
+        return [row.get(column) for column in columns]
+    return list(row)
+
+
+def write_xlsx(sheets, output=None):
+    """
+    Grava planilhas XLSX em streaming
+
+    Args:
+        sheets: Iterável de (nome, colunas, linhas); as linhas podem ser um
+            gerador de dicts (chaves = colunas) ou de sequências
+        output: Arquivo de destino (padrão: spooled_file())
+
+    Returns:
+        arquivo posicionado no início
+    """
+    output = output if output is not None else spooled_file()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format(HEADER_FORMAT)
+    money_format = workbook.add_format(MONEY_FORMAT)
+
+    try:
+        for name, columns, rows in sheets:
+            worksheet = workbook.add_worksheet(name[:31])
+            worksheet.write_row(0, 0, columns, header_format)
+            widths = ColumnWidths(columns)
+
+            # constant_memory: cada linha é gravada em ordem e descartada
+            for row_number, row in enumerate(rows, start=1):
+                values = _values(row, columns)
+                worksheet.write_row(row_number, 0, values)
+                widths.update(values)
+
+            money_columns = {i: money_format for i, column in enumerate(columns) if 'valor' in column.lower()}
+            widths.apply(worksheet, money_columns)
+    finally:
+        workbook.close()
+
+    output.seek(0)
+    return output
+
+
+def _plain(value):
+    """Valor serializável: datas em ISO 8601 e Decimal como float"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def iter_csv(columns, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    CSV (UTF-8, cabeçalho na primeira linha) em blocos de ~chunk_size bytes
+
+    Args:
+        columns (list): Nomes das colunas
+        rows: Iterável de sequências na ordem das colunas
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_ndjson(columns, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """NDJSON (um objeto JSON por linha) em blocos de ~chunk_size bytes"""
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps({column: _plain(value) for column, value in zip(columns, row)},
+                          ensure_ascii=False, separators=(',', ':'))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines, size = [], 0
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def gzip_chunks(chunks, level=6):
+    """Comprime os blocos em formato gzip conforme são gerados"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
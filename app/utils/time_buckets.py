@@ -0,0 +1,141 @@
+"""
+Time Buckets - Séries temporais agrupadas em uma única query
+
+`time_bucket(coluna, granularidade)` compila para SQL nativo de cada banco e
+sempre retorna o início do período como texto 'YYYY-MM-DD':
+
+    SQLite:    strftime/date com modificadores de calendário
+    Postgres:  to_char(date_trunc(...), 'YYYY-MM-DD')
+
+O filtro de intervalo é aplicado na coluna original (col >= início AND
+col < fim), então os índices em created_at/start_date/end_date continuam
+utilizáveis; o agrupamento é feito sobre a expressão. Os períodos sem linhas
+são preenchidos em uma passada sobre o intervalo, com meses e trimestres de
+calendário (sem aproximar mês como 30 dias).
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import String, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from app import db
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter')
+
+
+class time_bucket(FunctionElement):
+    """Início do período (dia, semana ISO, mês ou trimestre) como 'YYYY-MM-DD'"""
+
+    type = String()
+    name = 'time_bucket'
+    inherit_cache = True
+    # A granularidade faz parte da chave do cache de SQL compilado
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ('granularity', InternalTraversal.dp_string)
+    ]
+
+    def __init__(self, column, granularity):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f'Granularidade inválida: {granularity}')
+        self.granularity = granularity
+        super().__init__(column)
+
+
+@compiles(time_bucket)
+def _compile_default(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    return f"to_char(date_trunc('{element.granularity}', {column}), 'YYYY-MM-DD')"
+
+
+@compiles(time_bucket, 'sqlite')
+def _compile_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    if element.granularity == 'day':
+        return f"date({column})"
+    if element.granularity == 'week':
+        # Segunda-feira da semana (ISO): recua 6 dias e avança até a segunda
+        return f"date({column}, '-6 days', 'weekday 1')"
+    if element.granularity == 'month':
+        return f"date({column}, 'start of month')"
+    # Trimestre: início do mês menos (mês - 1) % 3 meses
+    return (f"date({column}, 'start of month', "
+            f"'-' || ((CAST(strftime('%m', {column}) AS INTEGER) - 1) % 3) || ' months')")
+
+
+def bucket_start(value, granularity):
+    """Início do período que contém a data"""
+    if isinstance(value, datetime):
+        value = value.date()
+    if granularity == 'day':
+        return value
+    if granularity == 'week':
+        return value - timedelta(days=value.weekday())
+    if granularity == 'month':
+        return value.replace(day=1)
+    if granularity == 'quarter':
+        return date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+    raise ValueError(f'Granularidade inválida: {granularity}')
+
+
+def shift(start, granularity, periods=1):
+    """Início do período `periods` depois (ou antes, se negativo)"""
+    if granularity == 'day':
+        return start + timedelta(days=periods)
+    if granularity == 'week':
+        return start + timedelta(weeks=periods)
+    months = periods * (3 if granularity == 'quarter' else 1)
+    index = start.year * 12 + start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bucket_range(start, periods, granularity):
+    """Inícios dos `periods` períodos a partir do que contém `start`"""
+    first = bucket_start(start, granularity)
+    return [shift(first, granularity, i) for i in range(periods)]
+
+
+def time_series(column, granularity, start, periods, measures, filters=()):
+    """
+    Série temporal com uma query agrupada e períodos vazios preenchidos
+
+    Args:
+        column: Coluna de data/hora usada no agrupamento
+        granularity (str): day, week, month ou quarter
+        start (date): Data contida no primeiro período
+        periods (int): Quantidade de períodos
+        measures (dict): nome -> expressão agregada (ex.: func.count())
+        filters: Condições adicionais do WHERE
+
+    Returns:
+        list: [{'period': date, <nome>: valor, ...}] em ordem cronológica
+    """
+    buckets = bucket_range(start, periods, granularity)
+    if not buckets:
+        return []
+    end = shift(buckets[-1], granularity)
+
+    # Comparação com a coluna original para aproveitar os índices
+    lower, upper = buckets[0], end
+    if isinstance(column.type, db.DateTime):
+        lower, upper = datetime.combine(lower, datetime.min.time()), datetime.combine(upper, datetime.min.time())
+
+    bucket = time_bucket(column, granularity).label('bucket')
+    query = (
+        select(bucket, *(expression.label(name) for name, expression in measures.items()))
+        .where(column >= lower, column < upper, *filters)
+        .group_by(bucket)
+    )
+    rows = {row.bucket: row for row in db.session.execute(query)}
+
+    series = []
+    for period in buckets:
+        row = rows.get(period.isoformat())
+        point = {'period': period}
+        for name in measures:
+            point[name] = getattr(row, name) if row is not None else 0
+        series.append(point)
+    return series
+
@@ -4,14 +4,27 @@ Web Routes - Páginas web da aplicação
 
 from app.utils.imports import (
     render_template, request, redirect, url_for, flash, abort, current_app,
-    datetime, date, timedelta
+    send_file, datetime, date, timedelta
 )
+from sqlalchemy.orm import joinedload
 from app import db
 from app.models import Client, Contract, User, Notification
 from app.web import bp
 from app.services.dashboard_service import DashboardService
+from app.services.search_service import search_index
+from app.utils.pagination import keyset_paginate, cached_count, InvalidCursor
+from app.utils.query_cache import query_cache
+from app.constants import DEFAULT_PAGE_SIZE, CLIENT_SORT_FIELDS, CONTRACT_SORT_FIELDS
 from app.utils.decorators import handle_route_errors
 
+def _client_contract_rows(client_id):
+    """Contratos do cliente (colunas usadas nas páginas) via cache de queries"""
+    statement = db.select(
+        Contract.id, Contract.contract_number, Contract.title, Contract.status,
+        Contract.value, Contract.start_date, Contract.end_date
+    ).where(Contract.client_id == client_id)
+    return query_cache.execute(statement).all()
+
 @bp.route('/')
 @handle_route_errors('index.html')
 def index():
@@ -33,28 +46,45 @@ def dashboard():
 
 @bp.route('/clients')
 def clients():
-    """Lista de clientes"""
+    """Lista de clientes (paginada por cursor)"""
+    search = request.args.get('search', '', type=str)
     try:
-        # Obter todos os clientes (sem paginação por enquanto)
-        clients = Client.query.all()
+        query = Client.query
+        if search:
+            query = query.filter(search_index.filter_for(Client, search))
+        
+        clients = keyset_paginate(
+            query, Client,
+            sort='name',
+            order='asc',
+            cursor=request.args.get('cursor'),
+            per_page=DEFAULT_PAGE_SIZE,
+            allowed_sorts=CLIENT_SORT_FIELDS,
+            count_depends_on=('clients',)
+        )
         
-        # Obter contratos por cliente para estatísticas
-        contracts_by_client = {}
-        for client in clients:
-            contracts_by_client[client.id] = Contract.query.filter_by(client_id=client.id).all()
+        # Contagens e totais da página vêm dos contadores armazenados em clients
+        aggregates = {client.id: client.aggregates for client in clients.items}
         
-        # Total de contratos para estatísticas
-        contracts_count = Contract.query.count()
+        # Ativos/inativos sobre a mesma query filtrada do total (com a busca
+        # aplicada); contagens em cache, recontadas apenas após escritas
+        active_count = cached_count(query.filter(Client.is_active.is_(True)), ('clients',))
+        contracts_count = cached_count(Contract.query, ('contracts',))
         
         return render_template('clients/list.html', 
                              clients=clients, 
-                             contracts_by_client=contracts_by_client,
+                             aggregates=aggregates,
+                             search=search,
+                             active_count=active_count,
+                             inactive_count=clients.total - active_count,
                              contracts_count=contracts_count)
         
+    except InvalidCursor:
+        return redirect(url_for('web.clients', search=search))
     except Exception as e:
         current_app.logger.error(f"Erro ao listar clientes: {str(e)}")
         flash('Erro ao carregar lista de clientes', 'error')
-        return render_template('clients/list.html', clients=[], contracts_by_client={}, contracts_count=0)
+        return render_template('clients/list.html', clients=None, aggregates={}, contracts_count=0)
 
 @bp.route('/clientes')
 def clientes_pt():
@@ -66,8 +96,8 @@ def client_detail(client_id):
     """Detalhes do cliente"""
     try:
         client = Client.query.get_or_404(client_id)
-        client_contracts = Contract.query.filter_by(client_id=client.id).all()
-        total_contract_value = sum(c.value for c in client_contracts)
+        client_contracts = _client_contract_rows(client.id)
+        total_contract_value = client.total_contract_value
         
         return render_template('clients/detail.html', 
                              client=client, 
@@ -185,29 +215,31 @@ def edit_client(client_id):
 def contracts():
     """Lista de contratos"""
     try:
-        page = request.args.get('page', 1, type=int)
         search = request.args.get('search', '', type=str)
         status = request.args.get('status', '', type=str)
         
-        query = Contract.query
+        query = Contract.query.options(joinedload(Contract.client))
         
         if search:
-            query = query.filter(
-                Contract.title.ilike(f'%{search}%') |
-                Contract.contract_number.ilike(f'%{search}%')
-            )
+            query = query.filter(search_index.filter_for(Contract, search))
         
         if status:
             query = query.filter_by(status=status)
         
-        contracts = query.paginate(
-            page=page, 
-            per_page=20, 
-            error_out=False
+        contracts = keyset_paginate(
+            query, Contract,
+            sort='created_at',
+            order='desc',
+            cursor=request.args.get('cursor'),
+            per_page=DEFAULT_PAGE_SIZE,
+            allowed_sorts=CONTRACT_SORT_FIELDS,
+            count_depends_on=('contracts',)
         )
         
         return render_template('contracts/list.html', contracts=contracts, search=search, status=status)
         
+    except InvalidCursor:
+        return redirect(url_for('web.contracts', search=search, status=status))
     except Exception as e:
         current_app.logger.error(f"Erro ao listar contratos: {str(e)}")
         flash('Erro ao carregar contratos', 'error')
@@ -251,7 +283,7 @@ def edit_contract(contract_id):
             # Validações básicas
             if not all([title, client_id, value, start_date, end_date]):
                 flash('Campos obrigatórios não preenchidos', 'error')
-                return render_template('contracts/form.html', contract=contract)
+                return render_contract_form(contract=contract)
             
             # Validar datas
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -259,13 +291,13 @@ def edit_contract(contract_id):
             
             if end_date_obj < start_date_obj:
                 flash('Data de término deve ser posterior à data de início', 'error')
-                return render_template('contracts/form.html', contract=contract)
+                return render_contract_form(contract=contract)
             
             # Validar cliente
             client = Client.query.get(client_id)
             if not client:
                 flash('Cliente não encontrado', 'error')
-                return render_template('contracts/form.html', contract=contract)
+                return render_contract_form(contract=contract)
             
             # Atualizar contrato
             contract.title = title
@@ -298,9 +330,7 @@ def edit_contract(contract_id):
             current_app.logger.error(f"Erro ao atualizar contrato {contract_id}: {str(e)}")
             flash('Erro ao atualizar contrato', 'error')
     
-    # Carregar clientes para o select
-    clients = Client.query.filter_by(is_active=True).all()
-    return render_template('contracts/form.html', contract=contract, clients=clients, now=datetime.now)
+    return render_contract_form(contract=contract, now=datetime.now)
 
 @bp.route('/contracts/new', methods=['GET', 'POST'])
 def new_contract():
@@ -321,7 +351,7 @@ def new_contract():
             # Validações básicas
             if not all([title, client_id, value, start_date, end_date]):
                 flash('Campos obrigatórios não preenchidos', 'error')
-                return render_template('contracts/form.html')
+                return render_contract_form()
             
             # Validar datas
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -329,13 +359,13 @@ def new_contract():
             
             if end_date_obj < start_date_obj:
                 flash('Data de término deve ser posterior à data de início', 'error')
-                return render_template('contracts/form.html')
+                return render_contract_form()
             
             # Validar cliente
             client = Client.query.get(client_id)
             if not client:
                 flash('Cliente não encontrado', 'error')
-                return render_template('contracts/form.html')
+                return render_contract_form()
             
             # TODO: Obter user_id da sessão quando implementar auth
             user_id = 1  # Temporário
@@ -365,8 +395,7 @@ def new_contract():
             current_app.logger.error(f"Erro ao criar contrato: {str(e)}")
             flash('Erro ao criar contrato', 'error')
     
-    clients = Client.query.filter_by(is_active=True).all()
-    return render_template('contracts/form.html', clients=clients)
+    return render_contract_form()
 
 @bp.route('/reports')
 def reports():
@@ -378,26 +407,52 @@ def relatorios_pt():
     """Página de relatórios (rota em português)"""
     return reports()  # Reutiliza a mesma função
 
+@bp.route('/reports/export/<relatorio>')
+def export_report(relatorio):
+    """Download de relatório (Excel gerado em streaming ou PDF)"""
+    from app.services.relatorios import RelatorioGenerator
+    from app.utils.streaming_export import XLSX_MIMETYPE
+    
+    generator = RelatorioGenerator()
+    geradores = {
+        'clientes': generator.gerar_relatorio_clientes_excel,
+        'contratos': generator.gerar_relatorio_contratos_excel,
+        'resumo': generator.gerar_relatorio_resumo_geral
+    }
+    if relatorio not in geradores:
+        abort(404)
+    
+    formato = request.args.get('formato', 'excel')
+    output, filename = geradores[relatorio](formato=formato)
+    if output is None:
+        flash(filename, 'error')
+        return redirect(url_for('web.reports'))
+    
+    # O arquivo temporário é enviado em blocos e fechado ao fim da resposta;
+    # PDFs acima do limite de linhas chegam divididos em um .zip
+    return send_file(
+        output,
+        mimetype=XLSX_MIMETYPE if filename.endswith('.xlsx') else None,
+        as_attachment=True,
+        download_name=filename
+    )
+
 @bp.route('/reports/clients/<int:client_id>')
 def client_report(client_id):
     """Relatório detalhado do cliente"""
     try:
         client = Client.query.get_or_404(client_id)
-        contracts = Contract.query.filter_by(client_id=client.id).all()
-        
-        # Estatísticas
-        total_contracts = len(contracts)
-        active_contracts = len([c for c in contracts if c.status == 'ativo'])
-        total_value = sum(c.value for c in contracts)
+        contracts = _client_contract_rows(client.id)
         
+        # Estatísticas (contadores armazenados no cliente)
         report_data = {
             'client': client,
             'contracts': contracts,
             'stats': {
-                'total_contracts': total_contracts,
-                'active_contracts': active_contracts,
-                'total_value': total_value,
-                'avg_contract_value': total_value / total_contracts if total_contracts > 0 else 0
+                'total_contracts': client.contracts_count,
+                'active_contracts': client.active_contracts_count,
+                'total_value': client.total_contract_value,
+                'avg_contract_value': client.average_contract_value
             }
         }
         
@@ -424,9 +479,8 @@ def analytics():
         analytics_data = DashboardService.get_analytics_data()
         
         # IA Service - Gerar recomendações e análises
-        ai_service = AIAnalyticsService()
-        ai_recommendations = ai_service.generate_recommendations(limit=5)
-        risk_contracts = ai_service.generate_risk_analysis()
+        ai_recommendations = AIAnalyticsService.get_recommendations_cached(5)
+        risk_contracts = AIAnalyticsService.get_risk_analysis_cached()
         
         # Previsões simuladas da IA (mantidas para compatibilidade)
         analytics_data['ai_predictions'] = {
@@ -503,6 +557,13 @@ def mark_notification_read(notification_id):
         return jsonify({'success': False}), 500
 
 # Funções auxiliares
+def render_contract_form(**context):
+    """Renderiza o formulário de contrato no modo de seleção de cliente configurado"""
+    client_mode = current_app.config.get('CONTRACT_FORM_CLIENT_MODE', 'suggest')
+    if client_mode == 'select':
+        context['clients'] = Client.query.filter_by(is_active=True).all()
+    return render_template('contracts/form.html', client_mode=client_mode, **context)
+
 def get_status_color(status):
     """Retorna cor para status do contrato"""
     colors = {
@@ -47,9 +47,68 @@ class Config:
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo')
     
-    # Configurações de cache
-    CACHE_TYPE = 'simple'
+    # Configurações de cache (simple, filesystem, redis, null)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')
     CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_THRESHOLD = 500
+    CACHE_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance', 'cache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'memory://')
+    CACHE_KEY_PREFIX = 'mobius:'
+    
+    # Busca textual (auto = FTS5 no SQLite / tsvector+pg_trgm no PostgreSQL, like = ILIKE)
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+    
+    # Seleção de cliente no formulário de contrato (suggest = autocompletar, select = lista completa)
+    CONTRACT_FORM_CLIENT_MODE = os.environ.get('CONTRACT_FORM_CLIENT_MODE', 'suggest')
+    
+    # Snapshot do dashboard (stale-while-revalidate com recomputação única)
+    DASHBOARD_SNAPSHOT_MODE = True
+    DASHBOARD_SNAPSHOT_MAX_AGE = 300
+    DASHBOARD_SNAPSHOT_WAIT_TIMEOUT = 30
+    
+    # Arquivo mmap compartilhado pelos workers do host (snapshots e versões de
+    # dados sem Redis); vazio = desativado. Ex.: /dev/shm/mobius-cache
+    SHARED_MEMORY_PATH = os.environ.get('SHARED_MEMORY_PATH')
+    SHARED_MEMORY_SIZE = int(os.environ.get('SHARED_MEMORY_SIZE') or 16 * 1024 * 1024)
+    
+    # Aquecimento do cache na inicialização; snapshots válidos são gravados ao
+    # encerrar e recarregados no próximo start se os dados não mudaram
+    CACHE_WARMUP = os.environ.get('CACHE_WARMUP', 'false').lower() in ['true', 'on', '1']
+    CACHE_WARMUP_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance', 'warm-snapshots.pickle')
+    
+    # Cache de resultados de queries (app/utils/query_cache.py): L1 no processo
+    # e L2 no backend do cache; invalidado pelas versões de dados das tabelas
+    QUERY_CACHE = True
+    QUERY_CACHE_TIMEOUT = 3600
+    QUERY_CACHE_L1_SIZE = 1000
+    
+    # Extração incremental em Parquet (flask extract-parquet)
+    PARQUET_EXTRACT_DIR = os.environ.get('PARQUET_EXTRACT_DIR') or os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), 'instance', 'extracts')
+    # Segundos relidos atrás da marca d'água: cobre transações que confirmam
+    # depois da extração linhas com updated_at (hora do flush) anterior a ela
+    PARQUET_WATERMARK_OVERLAP = int(os.environ.get('PARQUET_WATERMARK_OVERLAP', 900))
+    
+    # PDFs de tabelas grandes (app/utils/pdf_tables.py): blocos renderizados
+    # em processos separados quando pypdf está instalado
+    PDF_PARALLEL = True
+    PDF_RENDER_WORKERS = 4
+    PDF_CHUNK_ROWS = 1000
+    PDF_MAX_ROWS_PER_FILE = 20000
+    
+    # Queries de leitura independentes em paralelo (app/utils/parallel.py)
+    PARALLEL_QUERIES = True
+    PARALLEL_QUERY_WORKERS = 8       # threads do processo (mantenha <= pool do engine)
+    PARALLEL_QUERY_CONCURRENCY = 4   # tarefas simultâneas por requisição
+    PARALLEL_QUERY_TIMEOUT = 10      # segundos para o grupo inteiro
+    
+    # Server-Sent Events (segundos); a conexão é encerrada após SSE_MAX_DURATION
+    # e o navegador reconecta sozinho (Last-Event-ID evita perder mudanças).
+    # Cada stream aberto ocupa uma thread: use workers gthread (gunicorn.conf.py)
+    SSE_POLL_INTERVAL = 2
+    SSE_HEARTBEAT = 15
+    SSE_MAX_DURATION = 55
+    SSE_RETRY_MS = 3000
     
     # Configurações de rate limiting
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'memory://')
@@ -75,6 +134,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    CACHE_TYPE = 'simple'
+    DASHBOARD_SNAPSHOT_MODE = False
     SERVER_NAME = 'localhost:5000'
 
 class ProductionConfig(Config):
@@ -86,9 +147,12 @@ class ProductionConfig(Config):
     # CORS restrito para produção
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',')
     
+    # Aquecimento do cache após deploy / reciclagem de workers
+    CACHE_WARMUP = os.environ.get('CACHE_WARMUP', 'true').lower() in ['true', 'on', '1']
+    
     # Cache Redis para produção
-    CACHE_TYPE = 'redis'
-    CACHE_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'redis')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     
     # Rate limiting com Redis
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/1')
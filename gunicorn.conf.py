@@ -0,0 +1,28 @@
+"""
+Configuração do Gunicorn (carregada automaticamente de ./gunicorn.conf.py)
+
+O dashboard mantém uma conexão Server-Sent Events aberta por aba
+(/api/stream/dashboard). Com workers síncronos cada conexão ocupa um worker
+inteiro e poucas abas esgotam o servidor; workers `gthread` atendem cada
+requisição em uma thread, então o stream ocupa só uma thread enquanto espera.
+
+    gunicorn "app:create_app('production')"
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+# Threads por worker: conexões SSE abertas + requisições normais simultâneas
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+# Maior que SSE_MAX_DURATION: o stream encerra antes do timeout do worker
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Aquece os caches do worker (CACHE_WARMUP) depois de carregar a aplicação"""
+    from app.services import cache_warmup
+    cache_warmup.start(worker.wsgi)
@@ -0,0 +1,50 @@
+"""
+Add denormalized contract counters to clients and backfill them
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.services import client_counters
+
+def add_client_counters():
+    """Add counter columns to clients and compute their values"""
+    
+    app = create_app()
+    
+    with app.app_context():
+        from sqlalchemy import inspect, text
+        
+        existing = {column['name'] for column in inspect(db.engine).get_columns('clients')}
+        columns = [
+            ("contract_count", "ALTER TABLE clients ADD COLUMN contract_count INTEGER NOT NULL DEFAULT 0"),
+            ("active_contract_count", "ALTER TABLE clients ADD COLUMN active_contract_count INTEGER NOT NULL DEFAULT 0"),
+            ("contract_value_total", "ALTER TABLE clients ADD COLUMN contract_value_total NUMERIC(15, 2) NOT NULL DEFAULT 0"),
+            ("next_expiration_date", "ALTER TABLE clients ADD COLUMN next_expiration_date DATE"),
+        ]
+        
+        print("Adicionando contadores de contratos em clients...")
+        for name, column_sql in columns:
+            if name in existing:
+                print(f"- Já existe: {name}")
+                continue
+            try:
+                db.session.execute(text(column_sql))
+                print(f"✓ Criado: {name}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"✗ Erro ao criar coluna {name}: {e}")
+                return
+        
+        db.session.commit()
+        
+        print("Calculando contadores...")
+        total = client_counters.repair()
+        print(f"Contadores calculados para {total} clientes!")
+
+if __name__ == "__main__":
+    add_client_counters()
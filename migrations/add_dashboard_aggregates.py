@@ -0,0 +1,33 @@
+"""
+Create the dashboard_aggregates table and backfill it
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models import DashboardAggregate
+from app.services import dashboard_aggregates
+
+def add_dashboard_aggregates():
+    """Create the aggregate table and compute it from the current data"""
+    
+    app = create_app()
+    
+    with app.app_context():
+        print("Criando tabela dashboard_aggregates...")
+        try:
+            DashboardAggregate.__table__.create(db.engine, checkfirst=True)
+        except Exception as e:
+            print(f"✗ Erro ao criar tabela: {e}")
+            return
+        
+        print("Calculando agregados...")
+        total = dashboard_aggregates.rebuild()
+        print(f"{total} métricas calculadas!")
+
+if __name__ == "__main__":
+    add_dashboard_aggregates()
@@ -23,6 +23,9 @@ def add_performance_indexes():
             "CREATE INDEX IF NOT EXISTS idx_clients_is_active ON clients(is_active)",
             "CREATE INDEX IF NOT EXISTS idx_clients_created_at ON clients(created_at)",
             "CREATE INDEX IF NOT EXISTS idx_clients_name ON clients(name)",
+            # Keyset pagination (sort column + id tie-breaker)
+            "CREATE INDEX IF NOT EXISTS idx_client_name_id ON clients(name, id)",
+            "CREATE INDEX IF NOT EXISTS idx_client_created_at_id ON clients(created_at, id)",
         ]
         
         # Indexes for Contract table
@@ -37,6 +40,10 @@ def add_performance_indexes():
             # Composite indexes for common query patterns
             "CREATE INDEX IF NOT EXISTS idx_contracts_status_end_date ON contracts(status, end_date)",
             "CREATE INDEX IF NOT EXISTS idx_contracts_client_status ON contracts(client_id, status)",
+            # Keyset pagination (sort column + id tie-breaker)
+            "CREATE INDEX IF NOT EXISTS idx_contract_value_id ON contracts(value, id)",
+            "CREATE INDEX IF NOT EXISTS idx_contract_end_date_id ON contracts(end_date, id)",
+            "CREATE INDEX IF NOT EXISTS idx_contract_created_at_id ON contracts(created_at, id)",
         ]
         
         # Indexes for Notification table
@@ -45,6 +52,7 @@ def add_performance_indexes():
             "CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON notifications(is_read)",
             "CREATE INDEX IF NOT EXISTS idx_notifications_user_read ON notifications(user_id, is_read)",
             "CREATE INDEX IF NOT EXISTS idx_notifications_created_at ON notifications(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_notification_user_created_id ON notifications(user_id, created_at, id)",
         ]
         
         all_indexes = client_indexes + contract_indexes + notification_indexes
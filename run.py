@@ -211,6 +211,11 @@ if __name__ == '__main__':
         with app.app_context():
             deploy()
     
+    # Aquecer caches (CACHE_WARMUP); com o reloader, só no processo que serve
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from app.services import cache_warmup
+        cache_warmup.start(app)
+    
     # Iniciar servidor
     try:
         app.run(
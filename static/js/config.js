@@ -15,6 +15,8 @@ export const config = {
     // Configurações do Dashboard
     dashboard: {
         refreshInterval: 5 * 60 * 1000, // 5 minutos
+        liveMode: 'sse', // 'sse' (eventos do servidor) ou 'polling'
+        streamUrl: '/api/stream/dashboard',
         maxDataPoints: 1000,
         chartAnimationDuration: 1000,
         loadingDelay: 300 // delay mínimo para mostrar loading
@@ -13,6 +13,7 @@ import { CONSTANTS } from './constants.js';
 const DashboardState = {
     charts: {},
     updateInterval: null,
+    eventSource: null,
     isLoading: false
 };
 
@@ -440,6 +441,31 @@ function criarTabelaSetores(dados) {
     `).join('');
 }
 
+// Criar tabela de próximos vencimentos
+function criarTabelaVencimentos(dados) {
+    const tbody = document.querySelector('#tabelaVencimentos tbody');
+    if (!tbody) return;
+
+    if (!dados.length) {
+        tbody.innerHTML = '<tr><td colspan="5">Nenhum contrato vencendo nos próximos dias</td></tr>';
+        return;
+    }
+
+    tbody.innerHTML = dados.map(c => `
+        <tr>
+            <td><strong>${c.title}</strong></td>
+            <td>${c.client ? c.client.name : '-'}</td>
+            <td>${Formatters.date(c.end_date)}</td>
+            <td>
+                <span class="badge ${c.days_until_expiration <= 7 ? 'badge-danger' : 'badge-warning'}">
+                    ${c.days_until_expiration}
+                </span>
+            </td>
+            <td>${Formatters.currency(c.value)}</td>
+        </tr>
+    `).join('');
+}
+
 // Renderizar dashboard com os dados
 function renderDashboard(data) {
     if (!data) return;
@@ -453,6 +479,7 @@ function renderDashboard(data) {
     if (data.valor_por_regiao) criarGraficoRegiao(data.valor_por_regiao);
     if (data.timeline_vencimentos) criarTimeline(data.timeline_vencimentos);
     if (data.comparacao_setores) criarTabelaSetores(data.comparacao_setores);
+    if (data.vencimentos_proximos) criarTabelaVencimentos(data.vencimentos_proximos);
     
     // Criar seções de IA
     if (data.ai_insights) {
@@ -814,12 +841,114 @@ function atualizarDados() {
     loadDashboardData();
 }
 
+// Atualizar gráfico existente sem recriá-lo
+function atualizarGrafico(chart, labels, datasetValues) {
+    if (!chart) return false;
+
+    chart.data.labels = labels;
+    datasetValues.forEach((values, index) => {
+        if (chart.data.datasets[index]) {
+            chart.data.datasets[index].data = values;
+        }
+    });
+    chart.update('none');
+    return true;
+}
+
+// Aplicar deltas recebidos via Server-Sent Events
+const StreamHandlers = {
+    metrics(delta) {
+        const data = DashboardState.currentData || {};
+        data.metricas = { ...(data.metricas || {}), ...delta };
+        DashboardState.currentData = data;
+        criarMetricas(data.metricas);
+    },
+
+    status(dados) {
+        if (DashboardState.currentData) DashboardState.currentData.distribuicao_status = dados;
+        const chart = DashboardState.charts.status;
+        if (chart) {
+            chart.data.datasets[0].backgroundColor = dados.map(d => d.cor);
+        }
+        if (!atualizarGrafico(chart, dados.map(d => d.status), [dados.map(d => d.quantidade)])) {
+            criarGraficoStatus(dados);
+        }
+    },
+
+    top_clients(dados) {
+        if (DashboardState.currentData) DashboardState.currentData.top_clientes = dados;
+        if (!atualizarGrafico(DashboardState.charts.clientes, dados.map(d => d.cliente), [dados.map(d => d.valor)])) {
+            criarGraficoClientes(dados);
+        }
+    },
+
+    expiring(delta) {
+        const data = DashboardState.currentData || {};
+        const removidos = new Set(delta.removed);
+        data.vencimentos_proximos = (data.vencimentos_proximos || [])
+            .filter(c => !removidos.has(c.id))
+            .concat(delta.added)
+            .sort((a, b) => a.end_date.localeCompare(b.end_date));
+        DashboardState.currentData = data;
+        criarTabelaVencimentos(data.vencimentos_proximos);
+    },
+
+    unread({ unread_count }) {
+        // O badge é sempre renderizado (oculto quando zerado) em base.html
+        document.querySelectorAll('.notification-badge').forEach(badge => {
+            badge.textContent = unread_count;
+            badge.style.display = unread_count > 0 ? '' : 'none';
+        });
+    },
+
+    resync() {
+        loadDashboardData();
+    }
+};
+
+// Iniciar polling periódico (modo legado / fallback)
+function iniciarPolling() {
+    if (!DashboardState.updateInterval) {
+        DashboardState.updateInterval = setInterval(atualizarDados, CONSTANTS.INTERVALS.DASHBOARD_REFRESH);
+    }
+}
+
+// Iniciar atualizações em tempo real
+function iniciarAtualizacoes() {
+    if (config.dashboard.liveMode !== 'sse' || typeof EventSource === 'undefined') {
+        iniciarPolling();
+        return;
+    }
+
+    const source = new EventSource(config.dashboard.streamUrl);
+    DashboardState.eventSource = source;
+
+    Object.entries(StreamHandlers).forEach(([evento, handler]) => {
+        source.addEventListener(evento, (event) => {
+            handler(JSON.parse(event.data || '{}'));
+            atualizarTimestamp();
+        });
+    });
+
+    source.onerror = () => {
+        // O navegador reconecta sozinho; se o stream foi fechado, volta ao polling
+        if (source.readyState === EventSource.CLOSED) {
+            DashboardState.eventSource = null;
+            iniciarPolling();
+        }
+    };
+}
+
 // Limpar recursos ao sair
 function cleanup() {
     if (DashboardState.updateInterval) {
         clearInterval(DashboardState.updateInterval);
     }
     
+    if (DashboardState.eventSource) {
+        DashboardState.eventSource.close();
+    }
+    
     Object.values(DashboardState.charts).forEach(chart => {
         if (chart && typeof chart.destroy === 'function') {
             chart.destroy();
@@ -831,8 +960,8 @@ function cleanup() {
 document.addEventListener('DOMContentLoaded', () => {
     loadDashboardData();
     
-    // Atualizar a cada 30 segundos
-    DashboardState.updateInterval = setInterval(atualizarDados, CONSTANTS.INTERVALS.DASHBOARD_REFRESH);
+    // Eventos do servidor (SSE) com fallback para polling periódico
+    iniciarAtualizacoes();
 });
 
 // Limpar ao sair da página
@@ -842,6 +971,7 @@ window.addEventListener('beforeunload', cleanup);
 export {
     DashboardState,
     loadDashboardData,
+    iniciarAtualizacoes,
     atualizarTimestamp,
     renderDashboard,
     updateLoadingState
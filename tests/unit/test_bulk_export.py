@@ -0,0 +1,84 @@
+"""
+Testes da exportação de tabelas em CSV/NDJSON
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import Client, Contract
+from app.utils.streaming_export import iter_csv, iter_ndjson, gzip_chunks
+
+
+@pytest.fixture(scope='module')
+def export_rows(app):
+    with app.app_context():
+        client = Client(name='BI Export', email='bi.export@test.com', created_by=1)
+        db.session.add(client)
+        db.session.commit()
+        for status, value in (('ativo', 100), ('suspenso', 40)):
+            db.session.add(Contract(title=f'BI {status}', client_id=client.id, value=value,
+                                    start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+                                    status=status, created_by=1))
+        db.session.commit()
+        yield client.id
+
+
+class TestStreamingSerializers:
+    """Testes dos geradores de blocos"""
+
+    def test_csv_chunks(self):
+        """Testa CSV em vários blocos com tipos convertidos"""
+        rows = ((i, f'nome {i}', Decimal('1.50'), date(2026, 1, i % 28 + 1)) for i in range(500))
+        chunks = list(iter_csv(['id', 'name', 'value', 'day'], rows, chunk_size=1024))
+
+        assert len(chunks) > 1
+        parsed = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+        assert parsed[0] == ['id', 'name', 'value', 'day']
+        assert parsed[2] == ['1', 'nome 1', '1.5', '2026-01-02']
+        assert len(parsed) == 501
+
+    def test_ndjson_and_gzip(self):
+        """Testa NDJSON comprimido durante a geração"""
+        chunks = gzip_chunks(iter_ndjson(['id', 'name'], [(1, 'ação'), (2, None)]))
+        lines = gzip.decompress(b''.join(chunks)).decode('utf-8').splitlines()
+
+        assert [json.loads(line) for line in lines] == [{'id': 1, 'name': 'ação'}, {'id': 2, 'name': None}]
+
+
+class TestExportEndpoints:
+    """Testes de /api/export/<tabela>.<formato>"""
+
+    def test_contracts_csv_with_filters(self, client, export_rows):
+        """Testa CSV de contratos com o filtro de status das listagens"""
+        response = client.get('/api/export/contracts.csv?status=suspenso')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert 'attachment' in response.headers['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert rows and all(row['status'] == 'suspenso' for row in rows)
+        assert any(row['client_name'] == 'BI Export' for row in rows)
+
+    def test_clients_ndjson_gzip(self, client, export_rows):
+        """Testa NDJSON de clientes comprimido quando o cliente aceita gzip"""
+        response = client.get('/api/export/clients.ndjson?sort=name&order=desc',
+                              headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        records = [json.loads(line) for line in gzip.decompress(response.get_data()).splitlines()]
+        exported = next(record for record in records if record['id'] == export_rows)
+        assert exported['contract_count'] == 2
+        assert [record['name'] for record in records] == sorted((r['name'] for r in records), reverse=True)
+
+    def test_invalid_sort(self, client):
+        """Testa ordenação fora das permitidas"""
+        response = client.get('/api/export/clients.csv?sort=email')
+
+        assert response.status_code == 400
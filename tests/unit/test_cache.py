@@ -0,0 +1,129 @@
+"""
+Testes unitários do cache compartilhado
+"""
+
+import time
+
+import pytest
+
+from app.utils.cache import (
+    Cache, MemoryCache, FileSystemCache, RedisCache, LocalRedis, create_backend
+)
+
+
+class TestMemoryCache:
+    """Testes do backend em memória"""
+
+    def test_get_set(self):
+        """Testa leitura e escrita com contadores"""
+        backend = MemoryCache()
+
+        assert backend.get('chave') is None
+        backend.set('chave', {'valor': 1})
+        assert backend.get('chave') == {'valor': 1}
+
+        stats = backend.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['sets'] == 1
+
+    def test_ttl_expiration(self):
+        """Testa expiração por TTL"""
+        backend = MemoryCache()
+        backend.set('chave', 'valor', timeout=0.01)
+        time.sleep(0.02)
+
+        assert backend.get('chave') is None
+        assert backend.get_stats()['expirations'] == 1
+
+    def test_lru_eviction(self):
+        """Testa descarte LRU ao atingir o limite"""
+        backend = MemoryCache(max_entries=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')  # 'a' passa a ser o mais recente
+        backend.set('c', 3)
+
+        assert backend.get('a') == 1
+        assert backend.get('b') is None
+        assert backend.get_stats()['evictions'] == 1
+
+
+class TestFileSystemCache:
+    """Testes do backend em arquivos"""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Testa que duas instâncias (workers) veem os mesmos dados"""
+        writer = FileSystemCache(str(tmp_path))
+        reader = FileSystemCache(str(tmp_path))
+
+        writer.set('chave', [('Cliente A', 10.0)])
+        assert reader.get('chave') == [('Cliente A', 10.0)]
+
+        writer.delete('chave')
+        assert reader.get('chave') is None
+
+    def test_eviction(self, tmp_path):
+        """Testa limite de arquivos"""
+        backend = FileSystemCache(str(tmp_path), max_entries=2)
+        for i in range(4):
+            backend.set(f'k{i}', i)
+
+        assert backend.get_stats()['entries'] <= 2
+        assert backend.get_stats()['evictions'] >= 2
+
+
+class TestRedisCache:
+    """Testes do backend Redis com stand-in local"""
+
+    def test_memory_url_uses_local_stand_in(self):
+        """Testa que memory:// não exige servidor Redis"""
+        backend = RedisCache.from_url('memory://')
+        assert isinstance(backend.client, LocalRedis)
+
+        backend.set('chave', {'total': 3})
+        assert backend.get('chave') == {'total': 3}
+        backend.clear()
+        assert backend.get('chave') is None
+
+    def test_fail_open_on_errors(self):
+        """Testa que falhas do servidor viram cache miss"""
+        class BrokenClient:
+            def get(self, name):
+                raise ConnectionError('down')
+
+        backend = RedisCache(BrokenClient())
+        assert backend.get('chave', 'padrao') == 'padrao'
+        assert backend.get_stats()['errors'] == 1
+
+
+class TestCacheExtension:
+    """Testes da extensão e do memoize"""
+
+    def test_create_backend_from_config(self, tmp_path):
+        """Testa seleção de backend por configuração"""
+        assert create_backend({'CACHE_TYPE': 'simple'}).backend_name == 'memory'
+        assert create_backend({'CACHE_TYPE': 'filesystem', 'CACHE_DIR': str(tmp_path)}).backend_name == 'filesystem'
+        assert create_backend({'CACHE_TYPE': 'redis', 'CACHE_REDIS_URL': 'memory://'}).backend_name == 'redis'
+
+        with pytest.raises(ValueError):
+            create_backend({'CACHE_TYPE': 'desconhecido'})
+
+    def test_memoize(self):
+        """Testa memoize e cache_clear"""
+        cache = Cache()
+        calls = []
+
+        @cache.memoize(timeout=60)
+        def dobro(valor):
+            calls.append(valor)
+            return valor * 2
+
+        assert dobro(2) == 4
+        assert dobro(2) == 4
+        assert dobro(3) == 6
+        assert calls == [2, 3]
+
+        dobro.cache_clear()
+        assert dobro(2) == 4
+        assert calls == [2, 3, 2]
@@ -0,0 +1,100 @@
+"""
+Testes do aquecimento e da persistência dos snapshots
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models import Client
+from app.services import cache_warmup
+from app.services.dashboard_service import DashboardService
+from app.utils.cache import cache
+
+
+@pytest.fixture
+def snapshot_mode(app):
+    app.config['DASHBOARD_SNAPSHOT_MODE'] = True
+    yield
+    app.config['DASHBOARD_SNAPSHOT_MODE'] = False
+
+
+class TestCacheWarmup:
+    """Testes do cache_warmup"""
+
+    def test_save_and_load_when_data_unchanged(self, app, snapshot_mode, tmp_path):
+        """Testa o hand-off: snapshots gravados voltam se os dados não mudaram"""
+        path = str(tmp_path / 'warm.pickle')
+        key = f'snapshot:dashboard:full:{date.today().isoformat()}'
+
+        with app.app_context():
+            data = DashboardService.get_full_dashboard_data()
+            assert cache_warmup.save_snapshots(path) >= 1
+
+            # Novo processo: cache vazio e versões de dados novas
+            cache.clear()
+            assert cache.get(key) is None
+            assert cache_warmup.load_snapshots(path) >= 1
+            assert cache.get(key)['value'] == data
+
+    def test_discarded_when_data_changed(self, app, snapshot_mode, tmp_path):
+        """Testa que escrita após a gravação invalida os snapshots persistidos"""
+        path = str(tmp_path / 'warm.pickle')
+
+        with app.app_context():
+            DashboardService.get_full_dashboard_data()
+            cache_warmup.save_snapshots(path)
+
+            db.session.add(Client(name='Aquecimento', email='aquecimento@test.com', created_by=1))
+            db.session.commit()
+
+            assert cache_warmup.load_snapshots(path) == 0
+
+    def test_missing_file(self, app, tmp_path):
+        """Testa inicialização sem arquivo gravado"""
+        with app.app_context():
+            assert cache_warmup.load_snapshots(str(tmp_path / 'inexistente')) == 0
+
+    def test_cli(self, app, runner, tmp_path, monkeypatch):
+        """Testa flask warm-cache"""
+        monkeypatch.setitem(app.config, 'CACHE_WARMUP_PATH', str(tmp_path / 'warm.pickle'))
+        result = runner.invoke(args=['warm-cache', '--save'])
+
+        assert result.exit_code == 0
+        for name in ('basic_stats', 'dashboard', 'analytics', 'ai_recommendations', 'ai_risk_analysis'):
+            assert f'{name}:' in result.output
+        assert 'erro' not in result.output
+
+    def test_started_only_when_serving(self, app, monkeypatch):
+        """Testa que create_app (CLI, deploy) não aquece e o worker do gunicorn sim"""
+        import runpy
+        import types
+
+        from app import create_app
+
+        started = []
+        monkeypatch.setattr(cache_warmup, 'start', started.append)
+
+        create_app('testing')
+        assert started == []
+
+        hooks = runpy.run_path(os.path.join(os.path.dirname(__file__), '..', '..', 'gunicorn.conf.py'))
+        hooks['post_worker_init'](types.SimpleNamespace(wsgi=app))
+        assert started == [app]
+
+    def test_ai_results_keyed_by_day(self, app, monkeypatch):
+        """Testa que recomendações e riscos em cache não atravessam a virada do dia"""
+        from app.services.ai_analytics import AIAnalyticsService
+
+        calls = []
+        monkeypatch.setattr(AIAnalyticsService, 'generate_risk_analysis', lambda self: calls.append(1) or [])
+
+        with app.app_context():
+            AIAnalyticsService.get_risk_analysis_for_day(date(2026, 3, 1))
+            AIAnalyticsService.get_risk_analysis_for_day(date(2026, 3, 1))
+            assert len(calls) == 1
+
+            AIAnalyticsService.get_risk_analysis_for_day(date(2026, 3, 2))
+            assert len(calls) == 2
@@ -0,0 +1,144 @@
+"""
+Testes dos agregados de contratos por cliente (contadores desnormalizados)
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app import db
+from app.models import Client, Contract
+from app.services import client_counters
+
+
+def _create_clients(count):
+    clients = [
+        Client(name=f'Agregado {i}', email=f'agregado{i}@test.com', created_by=1)
+        for i in range(count)
+    ]
+    db.session.add_all(clients)
+    db.session.flush()
+
+    for i, client in enumerate(clients):
+        for j in range(i):
+            db.session.add(Contract(
+                title=f'Contrato {i}-{j}',
+                client_id=client.id,
+                value=100.0 * (j + 1),
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                status='ativo' if j % 2 == 0 else 'cancelado',
+                created_by=1
+            ))
+    db.session.commit()
+    return clients
+
+
+class TestClientAggregates:
+    """Testes do Client.to_dict_many"""
+
+    def test_bulk_matches_per_client_properties(self, app):
+        """Testa que os agregados em lote batem com as propriedades"""
+        with app.app_context():
+            clients = _create_clients(4)
+
+            for client, data in zip(clients, Client.to_dict_many(clients)):
+                assert data['contracts_count'] == client.contracts_count
+                assert data['active_contracts_count'] == client.active_contracts_count
+                assert data['total_contract_value'] == client.total_contract_value
+                assert data['average_contract_value'] == client.average_contract_value
+
+    def test_serialization_without_queries(self, app):
+        """Testa que a página é serializada dos contadores, sem queries de agregados"""
+        with app.app_context():
+            clients = Client.query.filter(Client.email.like('agregado%')).all()
+            statements = []
+
+            def count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute', count)
+            try:
+                Client.to_dict_many(clients)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count)
+
+            assert statements == []
+
+
+class TestClientCounters:
+    """Testes da manutenção dos contadores"""
+
+    def test_insert_update_move_delete(self, app):
+        """Testa os contadores após cada tipo de escrita"""
+        with app.app_context():
+            origem = Client(name='Contador Origem', email='origem@contador.com', created_by=1)
+            destino = Client(name='Contador Destino', email='destino@contador.com', created_by=1)
+            db.session.add_all([origem, destino])
+            db.session.flush()
+
+            contract = Contract(
+                title='Contador', client_id=origem.id, value=250.0,
+                start_date=date.today(), end_date=date.today() + timedelta(days=15),
+                status='ativo', created_by=1
+            )
+            db.session.add(contract)
+            db.session.commit()
+
+            assert origem.contracts_count == 1
+            assert origem.active_contracts_count == 1
+            assert origem.total_contract_value == 250.0
+            assert origem.next_expiration_date == date.today() + timedelta(days=15)
+
+            contract.status = 'suspenso'
+            db.session.commit()
+            assert origem.active_contracts_count == 0
+            assert origem.next_expiration_date is None
+
+            contract.client_id = destino.id
+            db.session.commit()
+            assert origem.contracts_count == 0
+            assert destino.contracts_count == 1
+
+            db.session.delete(contract)
+            db.session.commit()
+            assert destino.contracts_count == 0
+            assert destino.total_contract_value == 0.0
+
+    def test_repair(self, app):
+        """Testa a reconstrução após escrita em massa fora do ORM"""
+        with app.app_context():
+            client = Client.query.filter_by(email='agregado3@test.com').first()
+            expected = client.contracts_count
+
+            db.session.execute(db.text(
+                "UPDATE clients SET contract_count = 0, contract_value_total = 0 WHERE id = :id"
+            ), {'id': client.id})
+            db.session.commit()
+            assert client.contracts_count == 0
+
+            assert client_counters.repair(chunk_size=2) == Client.query.count()
+            assert client.contracts_count == expected
+
+    def test_refresh_locks_clients_first(self, app):
+        """Testa a trava das linhas dos clientes antes do recálculo"""
+        with app.app_context():
+            sql = str(client_counters.lock_statement([3, 1]).compile(dialect=postgresql.dialect()))
+            assert sql.rstrip().endswith('FOR NO KEY UPDATE')
+            assert 'ORDER BY clients.id' in sql
+
+            executed = []
+
+            def record(conn, cursor, statement, *args):
+                executed.append(statement.lstrip().upper())
+
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                client_counters.refresh(db.session.connection(), [1])
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+            db.session.rollback()
+
+            assert executed[0].startswith('SELECT CLIENTS.ID')
+            assert executed[1].startswith('UPDATE CLIENTS')
@@ -0,0 +1,35 @@
+"""
+Testes do GET condicional (ETag / 304) da API
+"""
+
+
+class TestConditionalGet:
+    """Testes do decorator conditional_response"""
+
+    def test_not_modified_with_same_etag(self, client):
+        """Testa que a mesma ETag retorna 304 sem corpo"""
+        response = client.get('/api/clients?per_page=5')
+        etag = response.headers['ETag']
+
+        assert response.status_code == 200
+        assert etag
+
+        cached = client.get('/api/clients?per_page=5', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+
+    def test_etag_depends_on_query_params(self, client):
+        """Testa que parâmetros diferentes geram ETags diferentes"""
+        first = client.get('/api/clients?page=1').headers['ETag']
+        second = client.get('/api/clients?page=2').headers['ETag']
+        assert first != second
+
+    def test_write_invalidates_etag(self, client):
+        """Testa que uma escrita em clients gera nova ETag"""
+        etag = client.get('/api/contracts').headers['ETag']
+
+        client.post('/api/clients', json={'name': 'ETag', 'email': 'etag@test.com'})
+
+        response = client.get('/api/contracts', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
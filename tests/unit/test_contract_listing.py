@@ -0,0 +1,72 @@
+"""
+Testes da listagem de contratos com clientes carregados em lote
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Client, Contract
+
+
+@pytest.fixture(scope='module')
+def listing_contracts(app):
+    """Contratos de clientes diferentes"""
+    with app.app_context():
+        for i in range(6):
+            client = Client(name=f'Listagem {i}', email=f'listagem{i}@test.com', created_by=1)
+            db.session.add(client)
+            db.session.flush()
+            db.session.add(Contract(
+                title=f'Listagem {i}',
+                client_id=client.id,
+                value=500.0,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=60),
+                created_by=1
+            ))
+        db.session.commit()
+
+
+def _count_queries(app, func):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            result = func()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+    return result, len(statements)
+
+
+class TestContractListing:
+    """Testes do GET /api/contracts"""
+
+    def test_embeds_client_summary(self, client, listing_contracts):
+        """Testa que o cliente embutido é um resumo sem agregados"""
+        data = client.get('/api/contracts?search=Listagem').get_json()
+
+        embedded = data['contracts'][0]['client']
+        assert embedded['name'].startswith('Listagem')
+        assert 'total_contract_value' not in embedded
+
+    def test_client_stats_on_request(self, client, listing_contracts):
+        """Testa que os agregados do cliente vêm apenas com include=client_stats"""
+        data = client.get('/api/contracts?search=Listagem&include=client_stats').get_json()
+
+        embedded = data['contracts'][0]['client']
+        assert embedded['contracts_count'] == 1
+        assert embedded['total_contract_value'] == 500.0
+
+    def test_query_count_independent_of_page_size(self, app, client, listing_contracts):
+        """Testa que o número de queries não cresce com o tamanho da página"""
+        _count_queries(app, lambda: client.get('/api/contracts?per_page=1'))  # total fica em cache
+        _, small = _count_queries(app, lambda: client.get('/api/contracts?per_page=1&include=client_stats'))
+        _, large = _count_queries(app, lambda: client.get('/api/contracts?per_page=6&include=client_stats'))
+        assert small == large
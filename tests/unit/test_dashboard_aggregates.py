@@ -0,0 +1,114 @@
+"""
+Testes dos agregados do dashboard mantidos por deltas
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Client, Contract
+from app.services import dashboard_aggregates
+from app.services.dashboard_service import DashboardService
+
+
+def _contract(client, **kwargs):
+    values = dict(
+        title='Agregado Dashboard', client_id=client.id, value=100.0,
+        start_date=date.today(), end_date=date.today() + timedelta(days=10),
+        created_by=1
+    )
+    values.update(kwargs)
+    return Contract(**values)
+
+
+class TestDashboardAggregates:
+    """Testes da tabela dashboard_aggregates"""
+
+    def test_writes_keep_table_consistent(self, app):
+        """Testa inserção, alteração e remoção de clientes e contratos"""
+        with app.app_context():
+            client = Client(name='Dashboard Delta', email='delta@dashboard.com', created_by=1)
+            db.session.add(client)
+            db.session.flush()
+            contract = _contract(client, status='ativo', value=300.0, auto_renew=True)
+            db.session.add_all([contract, _contract(client)])
+            db.session.commit()
+            assert dashboard_aggregates.verify() == []
+
+            contract.status = 'suspenso'
+            contract.value = 450.0
+            db.session.commit()
+            assert dashboard_aggregates.verify() == []
+
+            contract.auto_renew = False
+            client.is_active = False
+            db.session.commit()
+            assert dashboard_aggregates.verify() == []
+
+            db.session.delete(contract)
+            db.session.commit()
+            assert dashboard_aggregates.verify() == []
+
+            # Remove o cliente e, em cascata, o contrato restante
+            db.session.delete(client)
+            db.session.commit()
+            assert dashboard_aggregates.verify() == []
+
+    def test_stats_match_full_scan(self, app):
+        """Testa que as estatísticas do dashboard batem com COUNT/SUM diretos"""
+        with app.app_context():
+            client = Client(name='Dashboard Stats', email='stats@dashboard.com', created_by=1)
+            db.session.add(client)
+            db.session.flush()
+            db.session.add(_contract(client, status='ativo', value=80.0))
+            db.session.commit()
+
+            stats = DashboardService.get_basic_stats_cached(date.today())
+            assert stats.total_clients == Client.query.count()
+            assert stats.total_contracts == Contract.query.count()
+            assert stats.active_contracts == Contract.query.filter_by(status='ativo').count()
+            assert stats.total_value == float(db.session.query(db.func.sum(Contract.value)).scalar())
+
+            distribution = dict(DashboardService.get_status_distribution_cached())
+            assert distribution['ativo'] == stats.active_contracts
+
+    def test_verify_and_rebuild(self, app, runner):
+        """Testa o comando de verificação após escrita fora do ORM"""
+        with app.app_context():
+            db.session.execute(db.text(
+                "UPDATE dashboard_aggregates SET count = count + 5 WHERE metric = 'clients'"
+            ))
+            db.session.commit()
+            assert [metric for metric, _, _ in dashboard_aggregates.verify()] == ['clients']
+
+        result = runner.invoke(args=['verify-dashboard-aggregates'])
+        assert result.exit_code == 1
+        assert 'clients' in result.output
+
+        result = runner.invoke(args=['verify-dashboard-aggregates', '--fix'])
+        assert result.exit_code == 0
+
+        with app.app_context():
+            assert dashboard_aggregates.verify() == []
+
+    def test_new_metric_is_upserted(self, app):
+        """Testa criação e incremento de uma métrica nova no mesmo comando"""
+        with app.app_context():
+            executed = []
+
+            def record(conn, cursor, statement, *args):
+                executed.append(statement)
+
+            connection = db.session.connection()
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                dashboard_aggregates.apply_deltas(connection, {'contracts:status:teste': [1, Decimal('10')]})
+                dashboard_aggregates.apply_deltas(connection, {'contracts:status:teste': [2, Decimal('5')]})
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+
+            assert dashboard_aggregates.read()['contracts:status:teste'] == (3, Decimal('15.00'))
+            assert len(executed) == 2 and all('ON CONFLICT' in sql for sql in executed)
+            db.session.rollback()
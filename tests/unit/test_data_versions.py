@@ -0,0 +1,67 @@
+"""
+Testes da invalidação de cache por versão de dados
+"""
+
+from datetime import date, timedelta
+
+from app import db
+from app.models import User, Client, Contract
+from app.services.dashboard_service import DashboardService
+from app.utils import data_versions
+
+
+def _create_user():
+    user = User(username='versions_user', email='versions@test.com')
+    user.set_password('testpass')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+class TestDataVersions:
+    """Testes dos hooks de versão"""
+
+    def test_commit_bumps_only_changed_tables(self, app):
+        """Testa que o commit gera versão nova apenas para tabelas alteradas"""
+        with app.app_context():
+            user = _create_user()
+            before = data_versions.get_versions('clients', 'contracts', 'notifications')
+
+            db.session.add(Client(name='Versão', email='versao@test.com', created_by=user.id))
+            db.session.commit()
+
+            after = data_versions.get_versions('clients', 'contracts', 'notifications')
+            assert after[0] != before[0]
+            assert after[1:] == before[1:]
+
+    def test_rollback_keeps_versions(self, app):
+        """Testa que rollback não invalida o cache"""
+        with app.app_context():
+            before = data_versions.get_versions('clients')
+
+            db.session.add(Client(name='Descartado', email='descartado@test.com', created_by=1))
+            db.session.flush()
+            db.session.rollback()
+
+            assert data_versions.get_versions('clients') == before
+
+    def test_dashboard_reflects_new_contract(self, app):
+        """Testa que um contrato novo aparece sem reiniciar o worker"""
+        with app.app_context():
+            client = Client.query.filter_by(email='versao@test.com').first()
+            stats = DashboardService.get_basic_stats()
+
+            db.session.add(Contract(
+                title='Contrato Versionado',
+                client_id=client.id,
+                value=1234.00,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=10),
+                status='ativo',
+                created_by=client.created_by
+            ))
+            db.session.commit()
+
+            updated = DashboardService.get_basic_stats()
+            assert updated.total_contracts == stats.total_contracts + 1
+            assert updated.total_value == stats.total_value + 1234.00
@@ -0,0 +1,42 @@
+"""
+Testes dos DTOs retornados pelos serviços em cache
+"""
+
+import json
+import pickle
+
+import pytest
+
+from app.services.dashboard_service import DashboardService
+from app.services.dto import BasicStats, ClientValue, StatusCount, jsonable
+
+
+class TestDashboardDTOs:
+    """Testes dos resultados imutáveis do DashboardService"""
+
+    def test_cached_results_are_dtos(self, app):
+        """Testa os tipos retornados e que não há estado do ORM"""
+        with app.app_context():
+            stats = DashboardService.get_basic_stats()
+            assert isinstance(stats, BasicStats)
+            assert all(isinstance(item, ClientValue) for item in DashboardService.get_top_clients(5))
+            assert all(isinstance(item, StatusCount) for item in DashboardService.get_status_distribution())
+
+            for value in (stats, DashboardService.get_dashboard_metrics(),
+                          DashboardService.get_top_clients(5), DashboardService.get_expiration_windows()):
+                assert pickle.loads(pickle.dumps(value)) == value
+
+    def test_immutable_and_slotted(self):
+        """Testa imutabilidade e ausência de __dict__ por instância"""
+        status = StatusCount('ativo', 3)
+        with pytest.raises(AttributeError):
+            status.count = 4
+        assert not hasattr(status, '__dict__')
+
+    def test_jsonable(self):
+        """Testa a conversão para JSON"""
+        data = {'top': (ClientValue('Ana', 10.0),), 'status': [StatusCount('ativo', 1)]}
+        assert json.loads(json.dumps(jsonable(data))) == {
+            'top': [{'name': 'Ana', 'value': 10.0}],
+            'status': [{'status': 'ativo', 'count': 1}]
+        }
@@ -0,0 +1,47 @@
+"""
+Testes do stream de eventos do dashboard
+"""
+
+from app.services.event_stream import DashboardEventStream
+
+
+def _state(**overrides):
+    state = {
+        'metricas': {'total_contratos': 10, 'valor_total': 1000.0},
+        'expiring_contracts': 2,
+        'distribuicao_status': [{'status': 'ativo', 'quantidade': 10, 'cor': '#28a745'}],
+        'top_clientes': [{'cliente': 'Alpha', 'valor': 1000.0}],
+        'vencimentos_proximos': {1: {'id': 1}, 2: {'id': 2}},
+        'unread_count': 0
+    }
+    state.update(overrides)
+    return state
+
+
+class TestDashboardEventStream:
+    """Testes do DashboardEventStream"""
+
+    def test_diff_without_changes(self):
+        """Testa que estados iguais não geram eventos"""
+        assert DashboardEventStream.diff(_state(), _state()) == []
+
+    def test_diff_sends_only_changes(self):
+        """Testa que apenas os campos alterados são enviados"""
+        current = _state(
+            metricas={'total_contratos': 11, 'valor_total': 1000.0},
+            vencimentos_proximos={2: {'id': 2}, 3: {'id': 3}},
+            unread_count=1
+        )
+
+        events = dict(DashboardEventStream.diff(_state(), current))
+
+        assert events == {
+            'metrics': {'total_contratos': 11},
+            'expiring': {'added': [{'id': 3}], 'removed': [1]},
+            'unread': {'unread_count': 1}
+        }
+
+    def test_format_event(self):
+        """Testa a serialização no formato text/event-stream"""
+        message = DashboardEventStream.format_event('unread', {'unread_count': 3}, 'a.b.c')
+        assert message == 'id: a.b.c\nevent: unread\ndata: {"unread_count": 3}\n\n'
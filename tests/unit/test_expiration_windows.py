@@ -0,0 +1,67 @@
+"""
+Testes das janelas de vencimento (30/60/90 dias)
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Client, Contract
+from app.services.dashboard_service import DashboardService
+
+
+class TestExpirationWindows:
+    """Testes do DashboardService.get_expiration_windows"""
+
+    def test_windows_match_direct_counts(self, app):
+        """Testa contagens e valores acumulados sem limite de linhas"""
+        with app.app_context():
+            client = Client(name='Janelas', email='janelas@vencimento.com', created_by=1)
+            db.session.add(client)
+            db.session.flush()
+            for days in [5] * 60 + [45, 80, 200]:
+                db.session.add(Contract(
+                    title='Janela', client_id=client.id, value=10.0,
+                    start_date=date.today() - timedelta(days=1),
+                    end_date=date.today() + timedelta(days=days),
+                    status='ativo', created_by=1
+                ))
+            db.session.commit()
+
+            windows = DashboardService.get_expiration_windows((90, 30, 60))
+            assert [window.days for window in windows] == [30, 60, 90]
+
+            for window in windows:
+                expected = Contract.query.filter(
+                    Contract.status == 'ativo',
+                    Contract.end_date >= date.today(),
+                    Contract.end_date <= date.today() + timedelta(days=window.days)
+                )
+                assert window.count == expected.count()
+                assert window.value == float(sum(contract.value for contract in expected))
+            assert windows[0].count >= 60
+
+    def test_single_query(self, app):
+        """Testa que todas as janelas saem de uma única query"""
+        with app.app_context():
+            statements = []
+
+            def count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            DashboardService.get_expiration_windows_cached.cache_clear()
+            event.listen(db.engine, 'before_cursor_execute', count)
+            try:
+                DashboardService.get_expiration_windows((30, 60, 90, 180))
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count)
+
+            assert len([s for s in statements if 'FROM contracts' in s]) == 1
+
+    def test_api_timeline(self, client):
+        """Testa o formato de timeline_vencimentos no dashboard"""
+        data = client.get('/api/dashboard/data').get_json()
+        assert [entry['data'] for entry in data['timeline_vencimentos']] == [
+            (date.today() + timedelta(days=days)).isoformat() for days in (30, 60, 90)
+        ]
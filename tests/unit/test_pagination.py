@@ -0,0 +1,120 @@
+"""
+Testes da paginação por cursor (keyset)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from flask import template_rendered
+
+from app import db
+from app.models import Client, Contract
+
+
+@pytest.fixture(scope='module')
+def cursor_contracts(app):
+    """Contratos com valores repetidos (desempate por id)"""
+    with app.app_context():
+        client = Client(name='Cursor', email='cursor@test.com', created_by=1)
+        db.session.add(client)
+        db.session.flush()
+        for i in range(7):
+            db.session.add(Contract(
+                title=f'Cursor {i}',
+                client_id=client.id,
+                value=100.0 * (i % 3 + 1),
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=i + 1),
+                created_by=1
+            ))
+        db.session.commit()
+
+
+def _walk(client, url, key='contracts'):
+    """Percorre todas as páginas seguindo next_cursor"""
+    pages = []
+    data = client.get(url).get_json()
+    pages.append(data)
+    while data['pagination']['has_next']:
+        data = client.get(f"{url}&cursor={data['pagination']['next_cursor']}").get_json()
+        pages.append(data)
+    return pages
+
+
+class TestKeysetPagination:
+    """Testes do keyset_paginate via API"""
+
+    def test_walk_matches_offset_ordering(self, app, client, cursor_contracts):
+        """Testa que percorrer os cursores retorna todos os itens na ordem"""
+        pages = _walk(client, '/api/contracts?search=Cursor&sort=value&order=desc&per_page=3')
+        ids = [contract['id'] for page in pages for contract in page['contracts']]
+
+        with app.app_context():
+            expected = [contract.id for contract in Contract.query.filter(
+                Contract.title.like('Cursor%')
+            ).order_by(Contract.value.desc(), Contract.id.desc())]
+
+        assert ids == expected
+        assert len(pages) == 3
+        assert pages[0]['pagination']['total'] == 7
+        assert not pages[0]['pagination']['has_prev']
+
+    def test_prev_cursor_returns_previous_page(self, client, cursor_contracts):
+        """Testa que prev_cursor volta para a página anterior"""
+        pages = _walk(client, '/api/contracts?search=Cursor&sort=end_date&per_page=3')
+        prev_cursor = pages[1]['pagination']['prev_cursor']
+
+        data = client.get(f'/api/contracts?search=Cursor&sort=end_date&per_page=3&cursor={prev_cursor}').get_json()
+
+        assert [c['id'] for c in data['contracts']] == [c['id'] for c in pages[0]['contracts']]
+        assert data['pagination']['has_next']
+        assert not data['pagination']['has_prev']
+
+    def test_invalid_cursor(self, client, cursor_contracts):
+        """Testa que cursor inválido ou de outra ordenação retorna 400"""
+        assert client.get('/api/contracts?cursor=invalido').status_code == 400
+
+        pages = _walk(client, '/api/contracts?search=Cursor&sort=value&per_page=3')
+        cursor = pages[0]['pagination']['next_cursor']
+        assert client.get(f'/api/contracts?sort=end_date&cursor={cursor}').status_code == 400
+
+    def test_web_contracts_page(self, client):
+        """Testa a listagem web com cursor"""
+        assert client.get('/contracts').status_code == 200
+
+
+class TestWebClientList:
+    """Testes da listagem web de clientes"""
+
+    def test_clients_page(self, client, cursor_contracts):
+        """Testa a página de clientes com contagens da página"""
+        response = client.get('/clients?search=Cursor')
+        assert response.status_code == 200
+        assert b'Cursor' in response.data
+
+    def test_stats_cards_follow_search(self, app, client):
+        """Testa ativos, inativos e total calculados sobre a mesma busca"""
+        with app.app_context():
+            db.session.add_all([
+                Client(name='Cartela Ativa', email='cartela.ativa@test.com', created_by=1),
+                Client(name='Cartela Inativa', email='cartela.inativa@test.com', is_active=False, created_by=1),
+            ])
+            db.session.commit()
+
+        captured = []
+
+        def record(sender, template, context, **extra):
+            captured.append(context)
+
+        with template_rendered.connected_to(record, app):
+            response = client.get('/clients?search=Cartela')
+
+        assert response.status_code == 200
+        context = captured[-1]
+        assert context['clients'].total == 2
+        assert (context['active_count'], context['inactive_count']) == (1, 1)
+        assert b'Total na busca' in response.data
+
+    def test_invalid_cursor_redirects(self, client):
+        """Testa que cursor inválido volta para a primeira página"""
+        assert client.get('/clients?cursor=invalido').status_code == 302
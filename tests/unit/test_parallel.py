@@ -0,0 +1,95 @@
+"""
+Testes da execução paralela de queries (QueryGroup)
+"""
+
+import threading
+import time
+
+import pytest
+
+from app import db
+from app.utils import parallel
+from app.utils.parallel import QueryGroup, QueryTimeout
+
+
+def _slow_session_id(delay):
+    time.sleep(delay)
+    return id(db.session())
+
+
+def _session_id():
+    return id(db.session())
+
+
+@pytest.fixture
+def threaded(monkeypatch):
+    """O banco de testes é SQLite em memória; força o caminho com threads"""
+    monkeypatch.setattr(parallel, '_shares_single_connection', lambda: False)
+
+
+class TestQueryGroup:
+    """Testes do QueryGroup"""
+
+    def test_sqlite_memory_runs_sequentially(self, app):
+        """Testa que SQLite em memória (uma conexão) não usa threads"""
+        with app.app_context():
+            results = QueryGroup().add('a', _session_id).add('b', _session_id).run()
+            assert results['a'] == results['b'] == id(db.session())
+
+    def test_runs_concurrently_on_separate_sessions(self, app, threaded):
+        """Testa que as tarefas rodam ao mesmo tempo, cada uma com sua sessão"""
+        with app.app_context():
+            group = QueryGroup(max_concurrency=4)
+            for i in range(4):
+                group.add(f'session{i}', _slow_session_id, 0.3)
+
+            started = time.monotonic()
+            results = group.run()
+            elapsed = time.monotonic() - started
+
+            assert elapsed < 1.0
+            sessions = {results[f'session{i}'] for i in range(4)}
+            assert id(db.session()) not in sessions
+
+    def test_concurrency_cap(self, app, threaded):
+        """Testa o limite de tarefas simultâneas do grupo"""
+        with app.app_context():
+            running, peak, lock = [0], [0], threading.Lock()
+
+            def task():
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.1)
+                with lock:
+                    running[0] -= 1
+
+            group = QueryGroup(max_concurrency=2)
+            for i in range(6):
+                group.add(i, task)
+            group.run()
+
+            assert peak[0] == 2
+
+    def test_timeout_and_errors(self, app, threaded):
+        """Testa tempo limite e propagação de exceções"""
+        with app.app_context():
+            with pytest.raises(QueryTimeout):
+                QueryGroup(timeout=0.1).add('a', time.sleep, 0.5).add('b', time.sleep, 0.5).run()
+
+            def fail():
+                raise ValueError('falhou')
+
+            with pytest.raises(ValueError):
+                QueryGroup().add('ok', _session_id).add('erro', fail).run()
+
+    def test_sequential_when_disabled(self, app, threaded):
+        """Testa a execução em sequência com PARALLEL_QUERIES desligado"""
+        with app.app_context():
+            app.config['PARALLEL_QUERIES'] = False
+            try:
+                results = QueryGroup().add('a', _session_id).add('b', _session_id).run()
+            finally:
+                app.config['PARALLEL_QUERIES'] = True
+
+            assert results['a'] == results['b'] == id(db.session())
@@ -0,0 +1,131 @@
+"""
+Testes da extração incremental em Parquet
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import Client, Contract
+from app.services import parquet_extract
+
+
+@pytest.fixture(scope='module')
+def extract_contracts(app):
+    with app.app_context():
+        client = Client(name='Extração', email='extracao@test.com', created_by=1)
+        db.session.add(client)
+        db.session.commit()
+        base = datetime(2030, 1, 1)
+        contracts = []
+        for i, created in enumerate((datetime(2025, 1, 15), datetime(2025, 1, 20), datetime(2025, 2, 3))):
+            contracts.append(Contract(title=f'Extração {i}', client_id=client.id, value=Decimal('10.50') * (i + 1),
+                                      start_date=date(2025, 1, 1), end_date=date(2025, 12, 31),
+                                      status='ativo', created_by=1, created_at=created,
+                                      updated_at=base + timedelta(minutes=i)))
+        db.session.add_all(contracts)
+        db.session.commit()
+        yield [contract.id for contract in contracts]
+
+
+class TestChangedRows:
+    """Testes da seleção incremental (sem pyarrow)"""
+
+    def test_watermark_includes_ties_after_last_id(self, app, extract_contracts):
+        """Testa o par (updated_at, id): empate no updated_at não perde linhas"""
+        with app.app_context():
+            rows = list(parquet_extract.changed_rows('contracts'))
+            ours = [row for row in rows if row['id'] in extract_contracts]
+            assert len(ours) == 3
+
+            watermark = {'updated_at': ours[1]['updated_at'].isoformat(), 'id': ours[1]['id']}
+            after = [row['id'] for row in parquet_extract.changed_rows('contracts', watermark)]
+            assert after == [extract_contracts[2]]
+
+    def test_late_commit_behind_watermark(self, app, extract_contracts):
+        """Testa que linha confirmada atrás da marca d'água (updated_at do flush) é relida"""
+        overlap = timedelta(minutes=15)
+        with app.app_context():
+            rows = list(parquet_extract.changed_rows('contracts'))
+            watermark = parquet_extract._advance(None, rows, overlap)
+            assert list(parquet_extract.changed_rows('contracts', watermark, overlap=overlap)) == []
+
+            late = Contract(title='Extração atrasada', client_id=db.session.get(Contract, extract_contracts[0]).client_id,
+                            value=Decimal('1.00'), start_date=date(2025, 1, 1), end_date=date(2025, 12, 31),
+                            created_by=1, created_at=datetime(2025, 1, 25),
+                            updated_at=datetime.fromisoformat(watermark['updated_at']) - timedelta(minutes=5))
+            db.session.add(late)
+            db.session.commit()
+
+            again = list(parquet_extract.changed_rows('contracts', watermark, overlap=overlap))
+            assert [row['id'] for row in again] == [late.id]
+
+            watermark = parquet_extract._advance(watermark, again, overlap)
+            assert list(parquet_extract.changed_rows('contracts', watermark, overlap=overlap)) == []
+
+    def test_partition_and_watermark_file(self, tmp_path):
+        """Testa partição por mês de created_at e gravação da marca d'água"""
+        assert parquet_extract.partition_of(datetime(2025, 3, 9)) == 'month=2025-03'
+        assert parquet_extract.partition_of(None) == parquet_extract.UNKNOWN_PARTITION
+
+        parquet_extract.save_watermarks(str(tmp_path), {'clients': {'updated_at': '2030-01-01T00:00:00', 'id': 5}})
+        assert parquet_extract.load_watermarks(str(tmp_path))['clients']['id'] == 5
+
+    def test_requires_pyarrow(self, app, tmp_path, monkeypatch):
+        """Testa erro claro sem a dependência opcional"""
+        monkeypatch.setattr(parquet_extract, 'pa', None)
+        with app.app_context():
+            with pytest.raises(parquet_extract.ExtractError):
+                parquet_extract.extract('contracts', str(tmp_path))
+
+
+class TestParquetFiles:
+    """Testes dos arquivos gerados (requer pyarrow)"""
+
+    def test_incremental_extract_and_compaction(self, app, extract_contracts, tmp_path):
+        """Testa extração incremental, tipos das colunas e compactação"""
+        pq = pytest.importorskip('pyarrow.parquet')
+        directory = str(tmp_path)
+
+        with app.app_context():
+            first = parquet_extract.extract('contracts', directory)
+            assert first['rows'] >= 3
+            assert parquet_extract.extract('contracts', directory)['rows'] == 0
+
+            contract = db.session.get(Contract, extract_contracts[0])
+            contract.value = Decimal('99.90')
+            contract.updated_at = datetime(2031, 1, 1)
+            db.session.commit()
+            assert parquet_extract.extract('contracts', directory)['rows'] == 1
+
+            partition = os.path.join(directory, 'contracts', 'month=2025-01')
+            assert len(os.listdir(partition)) == 2
+            assert parquet_extract.compact('contracts', directory, today=date(2025, 6, 1)) >= 1
+            assert os.listdir(partition) == ['part-compacted.parquet']
+
+            table = pq.read_table(os.path.join(partition, 'part-compacted.parquet'))
+            assert str(table.schema.field('value').type) == 'decimal128(15, 2)'
+            assert str(table.schema.field('end_date').type) == 'date32[day]'
+            assert str(table.schema.field('status').type).startswith('dictionary')
+            rows = {row['id']: row for row in table.to_pylist()}
+            assert rows[extract_contracts[0]]['value'] == Decimal('99.90')
+
+    def test_late_commit_is_extracted(self, app, extract_contracts, tmp_path):
+        """Testa a extração de linha confirmada com updated_at anterior à marca d'água"""
+        pytest.importorskip('pyarrow.parquet')
+        directory = str(tmp_path)
+
+        with app.app_context():
+            parquet_extract.extract('contracts', directory)
+            since = datetime.fromisoformat(parquet_extract.load_watermarks(directory)['contracts']['updated_at'])
+
+            contract = db.session.get(Contract, extract_contracts[1])
+            contract.value = Decimal('12.34')
+            contract.updated_at = since - timedelta(seconds=30)
+            db.session.commit()
+
+            assert parquet_extract.extract('contracts', directory)['rows'] == 1
+            assert parquet_extract.extract('contracts', directory)['rows'] == 0
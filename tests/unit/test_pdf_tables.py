@@ -0,0 +1,86 @@
+"""
+Testes da geração de PDFs de tabelas grandes
+"""
+
+import zipfile
+
+import pytest
+
+from app import db
+from app.models import Client
+from app.utils import pdf_tables
+
+HEADERS = ['ID', 'Nome', 'Valor']
+
+
+def _rows(count):
+    return [[str(i), f'Cliente {i}', f'R$ {i:,.2f}'] for i in range(count)]
+
+
+@pytest.fixture
+def small_chunks(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_CHUNK_ROWS', 40)
+    monkeypatch.setitem(app.config, 'PDF_MAX_ROWS_PER_FILE', 100)
+
+
+class TestRenderTablePdf:
+    """Testes do render_table_pdf"""
+
+    def test_single_pdf(self, app, small_chunks):
+        """Testa PDF único em blocos quando abaixo do limite de linhas"""
+        with app.app_context():
+            output, extension = pdf_tables.render_table_pdf('Relatório', HEADERS, iter(_rows(90)),
+                                                            footer='Total: {total}')
+
+        assert extension == '.pdf'
+        assert output.getvalue().startswith(b'%PDF')
+
+    def test_split_into_zip_above_row_cap(self, app, small_chunks):
+        """Testa divisão em vários PDFs compactados acima do limite"""
+        with app.app_context():
+            output, extension = pdf_tables.render_table_pdf('Relatório', HEADERS, _rows(250), base_name='clientes')
+
+        assert extension == '.zip'
+        with zipfile.ZipFile(output) as archive:
+            names = archive.namelist()
+            assert names == ['clientes_parte01.pdf', 'clientes_parte02.pdf', 'clientes_parte03.pdf']
+            assert all(archive.read(name).startswith(b'%PDF') for name in names)
+
+    def test_column_widths_fill_page(self):
+        """Testa larguras fixas proporcionais ao conteúdo"""
+        widths = pdf_tables.column_widths(HEADERS, _rows(10), total_width=300)
+
+        assert sum(widths) == pytest.approx(300)
+        assert widths[1] > widths[0]
+
+    def test_parallel_matches_sequential(self, app, small_chunks, monkeypatch):
+        """Testa blocos renderizados no pool e concatenados (requer pypdf)"""
+        pypdf = pytest.importorskip('pypdf')
+        rows = _rows(100)
+
+        with app.app_context():
+            monkeypatch.setitem(app.config, 'PDF_PARALLEL', False)
+            sequential, _ = pdf_tables.render_table_pdf('Relatório', HEADERS, rows)
+            monkeypatch.setitem(app.config, 'PDF_PARALLEL', True)
+            parallel, _ = pdf_tables.render_table_pdf('Relatório', HEADERS, rows)
+
+        pages = len(pypdf.PdfReader(parallel).pages)
+        assert pages >= len(pypdf.PdfReader(sequential).pages)
+        text = ''.join(page.extract_text() for page in pypdf.PdfReader(parallel).pages)
+        assert 'Cliente 0' in text and 'Cliente 99' in text
+
+
+class TestPdfExportRoute:
+    """Testes do download em PDF"""
+
+    def test_clients_pdf(self, app, client):
+        """Testa o relatório de clientes em PDF pela rota de exportação"""
+        with app.app_context():
+            db.session.add(Client(name='Relatório PDF', email='relatorio.pdf@test.com', created_by=1))
+            db.session.commit()
+
+        response = client.get('/reports/export/clientes?formato=pdf')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+        assert response.get_data().startswith(b'%PDF')
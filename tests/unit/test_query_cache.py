@@ -0,0 +1,108 @@
+"""
+Testes do cache de resultados de queries
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db
+from app.models import Client, Contract, User
+from app.utils.cache import cache, FileSystemCache
+from app.utils.query_cache import query_cache
+
+
+@pytest.fixture
+def fresh_query_cache(app):
+    with app.app_context():
+        query_cache.clear()
+        query_cache.reset_stats()
+    yield query_cache
+    query_cache.clear()
+
+
+@pytest.fixture
+def shared_l2(tmp_path, monkeypatch):
+    """Backend compartilhado (filesystem) como L2"""
+    monkeypatch.setattr(cache, 'backend', FileSystemCache(str(tmp_path / 'l2')))
+
+
+def _count_clients():
+    return select(func.count(Client.id))
+
+
+class TestQueryCache:
+    """Testes do QueryCache"""
+
+    def test_second_execution_hits_l1(self, app, fresh_query_cache):
+        """Testa que a mesma query (SQL + parâmetros) é servida pelo L1"""
+        with app.app_context():
+            first = query_cache.scalar(_count_clients())
+            assert query_cache.scalar(_count_clients()) == first
+
+            stats = query_cache.get_stats()
+            assert stats['misses'] == 1
+            assert stats['l1_hits'] == 1
+
+    def test_parameters_are_part_of_key(self, app, fresh_query_cache):
+        """Testa que parâmetros diferentes geram entradas diferentes"""
+        with app.app_context():
+            for client_id in (1, 2):
+                query_cache.execute(select(Contract.id).where(Contract.client_id == client_id)).all()
+            assert query_cache.get_stats()['misses'] == 2
+
+    def test_commit_invalidates(self, app, fresh_query_cache):
+        """Testa que escrita em uma tabela usada pela query gera nova leitura"""
+        with app.app_context():
+            before = query_cache.scalar(_count_clients())
+
+            db.session.add(Client(name='Cache Query', email='cache.query@test.com', created_by=1))
+            db.session.commit()
+
+            assert query_cache.scalar(_count_clients()) == before + 1
+            assert query_cache.get_stats()['misses'] == 2
+
+    def test_pending_writes_bypass_cache(self, app, fresh_query_cache):
+        """Testa que a sessão com alterações não commitadas lê do banco"""
+        with app.app_context():
+            before = query_cache.scalar(_count_clients())
+
+            db.session.add(Client(name='Pendente', email='pendente@test.com', created_by=1))
+            assert query_cache.scalar(_count_clients()) == before + 1
+            assert query_cache.get_stats()['bypasses'] == 1
+            db.session.rollback()
+
+    def test_l2_shared_between_processes(self, app, fresh_query_cache, shared_l2):
+        """Testa que um L1 vazio (outro worker) é preenchido a partir do L2"""
+        with app.app_context():
+            rows = query_cache.execute(select(Contract.status, func.count()).group_by(Contract.status)).all()
+
+            query_cache.clear()  # novo processo: L1 vazio
+            cached = query_cache.execute(select(Contract.status, func.count()).group_by(Contract.status)).all()
+
+            assert cached == rows
+            stats = query_cache.get_stats()
+            assert stats['l2_hits'] == 1
+            assert stats['l2_backend'] == 'filesystem'
+
+    def test_tables_detected_in_joins(self):
+        """Testa a detecção das tabelas usadas (joins e subqueries)"""
+        statement = (select(Client.name, func.sum(Contract.value))
+                     .join(Contract, Client.id == Contract.client_id)
+                     .group_by(Client.name))
+        assert query_cache.tables_for(statement) == ('clients', 'contracts')
+
+    def test_rejects_entities_and_untracked_tables(self, app):
+        """Testa que entidades ORM e tabelas sem versão exigem decisão explícita"""
+        with app.app_context():
+            with pytest.raises(ValueError):
+                query_cache.execute(select(Client))
+            with pytest.raises(ValueError):
+                query_cache.execute(select(func.count(User.id)))
+
+    def test_disabled(self, app, fresh_query_cache, monkeypatch):
+        """Testa QUERY_CACHE=False"""
+        monkeypatch.setitem(app.config, 'QUERY_CACHE', False)
+        with app.app_context():
+            query_cache.scalar(_count_clients())
+            query_cache.scalar(_count_clients())
+            assert query_cache.get_stats()['bypasses'] == 2
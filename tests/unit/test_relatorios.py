@@ -0,0 +1,132 @@
+"""
+Testes do gerador de relatórios
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Client, Contract
+from app.services.relatorios import RelatorioGenerator
+
+
+@pytest.fixture(scope='module')
+def export_data(app):
+    with app.app_context():
+        clients = [Client(name=f'Exportação {i}', email=f'exportacao{i}@test.com', created_by=1)
+                   for i in range(3)]
+        db.session.add_all(clients)
+        db.session.commit()
+        for value in (100, 250):
+            db.session.add(Contract(title='Exportado', client_id=clients[0].id, value=value,
+                                    start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+                                    status='ativo', created_by=1))
+        db.session.commit()
+        yield [client.id for client in clients]
+
+
+@pytest.fixture
+def statements(app):
+    """SQL executado no engine durante o teste"""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+        yield executed
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+class TestRelatorioClientes:
+    """Testes do relatório de clientes"""
+
+    def test_rows_use_stored_counters(self, app, export_data):
+        """Testa linhas em ordem de id com contagem e valor dos contadores"""
+        with app.app_context():
+            rows = {row['ID']: row for row in RelatorioGenerator()._iter_clientes()}
+
+            assert list(rows) == sorted(rows)
+            first = rows[export_data[0]]
+            assert first['Nº Contratos'] == 2
+            assert first['Valor Total'] == 'R$ 350.00'
+            assert rows[export_data[1]]['Nº Contratos'] == 0
+
+    def test_single_query_regardless_of_clients(self, app, export_data, statements):
+        """Testa que a exportação não faz queries por cliente"""
+        with app.app_context():
+            rows = list(RelatorioGenerator()._iter_clientes(batch_size=2))
+            assert len(rows) >= 3
+            assert len([sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]) == 1
+
+    def test_excel_export(self, app, export_data):
+        """Testa a geração do arquivo Excel"""
+        with app.app_context():
+            output, filename = RelatorioGenerator().gerar_relatorio_clientes_excel()
+
+            assert filename.endswith('.xlsx')
+            assert output.read(2) == b'PK'
+
+
+class TestRelatorioContratos:
+    """Testes do relatório de contratos e do download"""
+
+    def test_contract_rows(self, app, export_data):
+        """Testa linhas de contratos com o nome do cliente, sem ORM"""
+        with app.app_context():
+            rows = list(RelatorioGenerator()._iter_contratos())
+
+            exported = [row for row in rows if row['Cliente'] == 'Exportação 0']
+            assert [row['Valor'] for row in exported] == ['R$ 100.00', 'R$ 250.00']
+
+    def test_export_route_streams_xlsx(self, app, client, export_data):
+        """Testa o download do relatório via send_file"""
+        response = client.get('/reports/export/contratos')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        assert 'relatorio_contratos_' in response.headers['Content-Disposition']
+        assert response.get_data()[:2] == b'PK'
+
+    def test_export_route_unknown_report(self, client):
+        """Testa relatório inexistente"""
+        assert client.get('/reports/export/inexistente').status_code == 404
+
+
+class TestRelatorioResumo:
+    """Testes do relatório resumo geral"""
+
+    def test_summary_counts_by_status(self, app, export_data):
+        """Testa a geração do resumo com os status gravados no banco"""
+        with app.app_context():
+            generator = RelatorioGenerator()
+            output, filename = generator.gerar_relatorio_resumo_geral()
+
+            assert output is not None, filename
+            assert filename.endswith('.xlsx')
+
+            estatisticas = pd.read_excel(output, sheet_name='Estatísticas Gerais')
+            valores = dict(zip(estatisticas['Métrica'], estatisticas['Valor']))
+            ativos = Contract.query.filter_by(status='ativo').count()
+            assert ativos >= 2
+            assert int(valores['Contratos Ativos']) == ativos
+
+    def test_summary_pdf(self, app, export_data):
+        """Testa o resumo em PDF"""
+        with app.app_context():
+            output, filename = RelatorioGenerator().gerar_relatorio_resumo_geral(formato='pdf')
+
+            assert output is not None, filename
+            assert output.getvalue().startswith(b'%PDF')
+
+    def test_export_route_summary(self, client, export_data):
+        """Testa o download do resumo pela rota de exportação"""
+        response = client.get('/reports/export/resumo')
+
+        assert response.status_code == 200
+        assert 'relatorio_resumo_geral_' in response.headers['Content-Disposition']
+        assert response.get_data()[:2] == b'PK'
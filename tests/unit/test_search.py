@@ -0,0 +1,91 @@
+"""
+Testes do índice de busca textual
+"""
+
+from app import db
+from app.models import Client
+from app.services import search_service
+from app.services.search_service import PostgresBackend, search_index, normalize
+
+
+def _names(query):
+    return [client.name for client in Client.search(query)]
+
+
+class TestSearchIndex:
+    """Testes do search_index (FTS5 no SQLite)"""
+
+    def test_normalize(self):
+        """Testa a remoção de acentos e caixa"""
+        assert normalize('Conceição ÁGUA') == 'conceicao agua'
+
+    def test_prefix_and_accents(self, app):
+        """Testa busca por prefixo sem depender de acentos"""
+        with app.app_context():
+            db.session.add(Client(
+                name='Joaquim Conceição', email='joaquim@busca.com',
+                document='987.654.321-00', created_by=1
+            ))
+            db.session.commit()
+
+            assert 'Joaquim Conceição' in _names('joaq')
+            assert 'Joaquim Conceição' in _names('CONCEICAO')
+            assert 'Joaquim Conceição' in _names('98765432100')
+
+    def test_typo_tolerance(self, app):
+        """Testa que erros de digitação ainda encontram o cliente"""
+        with app.app_context():
+            assert 'Joaquim Conceição' in _names('Joaquim Consseicao')
+
+    def test_index_follows_updates_and_deletes(self, app):
+        """Testa a sincronização do índice com o ORM"""
+        with app.app_context():
+            client = Client.query.filter_by(email='joaquim@busca.com').first()
+            client.name = 'Joaquim Pereira'
+            db.session.commit()
+
+            assert 'Joaquim Pereira' in _names('pereira')
+            assert _names('conceicao') == []
+
+            db.session.delete(client)
+            db.session.commit()
+            assert _names('pereira') == []
+
+    def test_reindex(self, app):
+        """Testa a reconstrução completa do índice"""
+        with app.app_context():
+            assert search_index.reindex() == Client.query.count() + db.session.execute(
+                db.text('SELECT COUNT(*) FROM contracts')
+            ).scalar()
+
+    def test_filter_has_no_result_cap(self, app):
+        """Testa que o filtro não é limitado como a lista ranqueada"""
+        with app.app_context():
+            db.session.add_all([
+                Client(name=f'Zebulom {i}', email=f'zebulom{i}@busca.com', created_by=1) for i in range(5)
+            ])
+            db.session.commit()
+
+            assert len(search_index.search('client', 'zebulom', limit=2)) == 2
+            assert len(_names('zebulom')) == 5
+            assert Client.query.filter(search_index.filter_for(Client, 'zebulom')).count() == 5
+            assert _names('!!!') == []
+
+    def test_typo_filter_is_bounded(self, app, monkeypatch):
+        """Testa que o filtro tolerante a erros não gera IN (...) sem limite"""
+        with app.app_context():
+            db.session.add_all([
+                Client(name=f'Teodolindo Farias {i}', email=f'teodolindo{i}@busca.com', created_by=1)
+                for i in range(3)
+            ])
+            db.session.commit()
+
+            assert Client.query.filter(search_index.filter_for(Client, 'Teodolindu Farias')).count() == 3
+            monkeypatch.setattr(search_service, 'SEARCH_MAX_RESULTS', 2)
+            assert Client.query.filter(search_index.filter_for(Client, 'Teodolindu Farias')).count() == 2
+
+    def test_postgres_typo_matching_is_subquery(self):
+        """Testa que no PostgreSQL os candidatos por pg_trgm são SQL sem LIMIT"""
+        sql, params = PostgresBackend().typo_matching('client', ['joaquim'])
+        assert 'LIMIT' not in sql and '<%' in sql
+        assert params == {'search_query': 'joaquim', 'search_doc_type': 'client'}
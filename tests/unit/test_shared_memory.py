@@ -0,0 +1,145 @@
+"""
+Testes do cache compartilhado em arquivo mmap (SharedMemoryCache)
+"""
+
+import multiprocessing
+
+import pytest
+
+from app.utils.cache import Cache, SharedMemoryCache, SharedVersionTable, VersionTableFull
+from app.utils.snapshot import SnapshotCache
+
+
+def _add_lock(path, results):
+    results.put(SharedMemoryCache(path).add('lock', True, timeout=30))
+
+
+def _set_key(path, index):
+    SharedMemoryCache(path).set(f'chave{index}', index)
+
+
+def _set_version(path, token):
+    SharedVersionTable(path).set('contracts', token)
+
+
+def _run_processes(target, args_list):
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=10)
+    return context
+
+
+class TestSharedMemoryCache:
+    """Testes do backend mmap"""
+
+    def test_get_set_add_delete(self, tmp_path):
+        """Testa operações básicas e leitura por outra instância"""
+        path = str(tmp_path / 'shared')
+        writer, reader = SharedMemoryCache(path), SharedMemoryCache(path)
+
+        assert writer.set('snapshot', {'total': 1})
+        assert reader.get('snapshot') == {'total': 1}
+        assert not reader.add('snapshot', {'total': 2})
+
+        writer.set('snapshot', {'total': 3})
+        assert reader.get('snapshot') == {'total': 3}
+        assert reader.delete('snapshot')
+        assert writer.get('snapshot') is None
+
+    def test_decoded_once_per_publication(self, tmp_path):
+        """Testa que leituras repetidas reutilizam o dicionário decodificado"""
+        path = str(tmp_path / 'shared')
+        SharedMemoryCache(path).set('snapshot', {'lista': [1, 2, 3]})
+        reader = SharedMemoryCache(path)
+
+        assert reader.get('snapshot') is reader.get('snapshot')
+
+    def test_overflow_is_rejected(self, tmp_path):
+        """Testa que valores maiores que o slot não corrompem o arquivo"""
+        backend = SharedMemoryCache(str(tmp_path / 'shared'), size=4096)
+        backend.set('pequeno', 1)
+
+        assert backend.set('grande', 'x' * 10000) is False
+        assert backend.get('pequeno') == 1
+
+    def test_atomic_between_processes(self, tmp_path):
+        """Testa add exclusivo e publicações concorrentes entre processos"""
+        path = str(tmp_path / 'shared')
+        SharedMemoryCache(path).get('inicializa')
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        _run_processes(_add_lock, [(path, results)] * 4)
+        assert sorted(results.get(timeout=5) for _ in range(4)) == [False, False, False, True]
+
+        _run_processes(_set_key, [(path, i) for i in range(6)])
+        reader = SharedMemoryCache(path)
+        assert [reader.get(f'chave{i}') for i in range(6)] == list(range(6))
+
+
+class TestSharedSnapshots:
+    """Testes de versões e snapshots compartilhados entre workers"""
+
+    def test_workers_share_versions_and_snapshot(self, app, tmp_path):
+        """Testa que dois workers veem a mesma versão e o mesmo snapshot"""
+        path = str(tmp_path / 'shared')
+        workers = []
+        for _ in range(2):
+            cache_ext = Cache()
+            cache_ext.use_shared_memory(path)
+            workers.append(cache_ext)
+
+        with app.app_context():
+            assert workers[0].get_versions(('contracts',)) == workers[1].get_versions(('contracts',))
+            workers[0].bump_versions(('contracts',))
+            assert workers[0].get_versions(('contracts',)) == workers[1].get_versions(('contracts',), fresh=True)
+
+            calls = []
+            first, second = SnapshotCache(workers[0]), SnapshotCache(workers[1])
+            assert first.get('dashboard', lambda: calls.append(1) or {'total': 5}, depends_on=('contracts',)) == {'total': 5}
+            assert second.get('dashboard', lambda: calls.append(1) or {'total': 6}, depends_on=('contracts',)) == {'total': 5}
+            assert len(calls) == 1
+
+    def test_versions_do_not_republish_snapshots(self, app, tmp_path):
+        """Testa que gerar versões não regrava o dicionário de snapshots"""
+        cache_ext = Cache()
+        cache_ext.use_shared_memory(str(tmp_path / 'shared'))
+        cache_ext.shared.set('dashboard', {'total': 1})
+        published = cache_ext.shared.get_stats()['sets']
+
+        with app.app_context():
+            for _ in range(5):
+                cache_ext.bump_versions(('contracts', 'clients'))
+
+        assert cache_ext.shared.get_stats()['sets'] == published
+        assert cache_ext.get_stats()['shared_versions']['used_slots'] == 2
+
+
+class TestSharedVersionTable:
+    """Testes da tabela de versões em mmap"""
+
+    def test_read_by_other_instance_and_process(self, tmp_path):
+        """Testa tokens lidos por outra instância e gravados por outro processo"""
+        path = str(tmp_path / 'versions')
+        writer, reader = SharedVersionTable(path), SharedVersionTable(path)
+
+        assert reader.get('contracts') is None
+        writer.set('contracts', 'a' * 16)
+        assert reader.get('contracts') == 'a' * 16
+
+        _run_processes(_set_version, [(path, 'b' * 16)])
+        assert reader.get('contracts') == 'b' * 16
+
+    def test_full_table_fails_loudly(self, tmp_path):
+        """Testa erro explícito quando não há slot livre"""
+        table = SharedVersionTable(str(tmp_path / 'versions'), slots=2)
+        table.set('clients', '1')
+        table.set('contracts', '2')
+
+        with pytest.raises(VersionTableFull):
+            table.set('notifications', '3')
+        table.set('contracts', '4')
+        assert table.get('contracts') == '4'
@@ -0,0 +1,63 @@
+"""
+Testes dos snapshots stale-while-revalidate
+"""
+
+import threading
+import time
+
+from app.utils.cache import Cache
+from app.utils.snapshot import SnapshotCache
+
+
+class TestSnapshotCache:
+    """Testes do SnapshotCache"""
+
+    def test_single_flight_on_cold_cache(self, app):
+        """Testa que chamadas concorrentes disparam um único cálculo"""
+        snapshots = SnapshotCache(Cache())
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'total': 42}
+
+        def reader():
+            with app.app_context():
+                results.append(snapshots.get('dashboard', compute))
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{'total': 42}] * 8
+
+    def test_stale_snapshot_served_while_refreshing(self, app):
+        """Testa que o snapshot antigo é servido e atualizado em segundo plano"""
+        snapshots = SnapshotCache(Cache())
+        values = iter([1, 2])
+        refreshed = threading.Event()
+
+        def compute():
+            value = next(values)
+            if value == 2:
+                refreshed.set()
+            return value
+
+        with app.app_context():
+            assert snapshots.get('metricas', compute, max_age=0) == 1
+            time.sleep(0.01)
+
+            # Snapshot expirado: retorna o valor antigo imediatamente
+            assert snapshots.get('metricas', compute, max_age=0) == 1
+            assert refreshed.wait(timeout=2)
+
+            for _ in range(50):
+                if snapshots.get('metricas', compute, max_age=60) == 2:
+                    break
+                time.sleep(0.01)
+            assert snapshots.get('metricas', compute, max_age=60) == 2
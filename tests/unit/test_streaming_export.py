@@ -0,0 +1,59 @@
+"""
+Testes da exportação em streaming
+"""
+
+import tempfile
+import tracemalloc
+
+from openpyxl import load_workbook
+
+from app.utils.streaming_export import ColumnWidths, write_xlsx
+
+COLUMNS = ['ID', 'Nome', 'Valor Total']
+
+
+def _rows(count):
+    for i in range(count):
+        yield {'ID': i, 'Nome': f'Cliente {i}', 'Valor Total': i * 1.5}
+
+
+def _peak_memory(count):
+    tracemalloc.start()
+    try:
+        with tempfile.TemporaryFile() as output:
+            write_xlsx([('Dados', COLUMNS, _rows(count))], output=output)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestWriteXlsx:
+    """Testes do write_xlsx"""
+
+    def test_rows_and_sheets(self):
+        """Testa planilhas com linhas vindas de geradores (dicts e tuplas)"""
+        output = write_xlsx([
+            ('Dados', COLUMNS, _rows(3)),
+            ('Resumo', ['Métrica', 'Valor'], iter([('Total', 3)]))
+        ])
+        workbook = load_workbook(output, read_only=True)
+
+        rows = list(workbook['Dados'].values)
+        assert rows[0] == tuple(COLUMNS)
+        assert rows[3] == (2, 'Cliente 2', 3)
+        assert list(workbook['Resumo'].values) == [('Métrica', 'Valor'), ('Total', 3)]
+
+    def test_column_widths_tracked_incrementally(self):
+        """Testa larguras pelo maior texto da coluna, com limite"""
+        widths = ColumnWidths(['ID', 'Nome'], max_width=20)
+        widths.update([1, 'curto'])
+        widths.update([12345, 'um nome bem mais longo que o limite'])
+
+        assert widths.widths == [5, 35]
+
+    def test_peak_memory_independent_of_row_count(self):
+        """Testa memória de pico estável com 20x mais linhas"""
+        small = _peak_memory(1000)
+        large = _peak_memory(20000)
+
+        assert large < small * 2
@@ -0,0 +1,100 @@
+"""
+Testes do autocompletar de clientes
+"""
+
+from flask import g
+
+from app import db
+from app.models import Client
+from app.services.suggest_service import client_prefix_index
+from app.utils import data_versions
+
+
+def _suggest(client, query):
+    response = client.get(f'/api/clients/suggest?q={query}')
+    assert response.status_code == 200
+    return [suggestion['name'] for suggestion in response.get_json()['suggestions']]
+
+
+class TestClientSuggest:
+    """Testes do /api/clients/suggest"""
+
+    def test_prefix_name_email_document(self, app, client):
+        """Testa sugestões por palavra do nome, email e documento"""
+        with app.app_context():
+            db.session.add(Client(
+                name='Otávio Ramalho', email='otavio@sugestao.com',
+                document='111.222.333-44', created_by=1
+            ))
+            db.session.commit()
+
+        assert 'Otávio Ramalho' in _suggest(client, 'ota')
+        assert 'Otávio Ramalho' in _suggest(client, 'rama')
+        assert 'Otávio Ramalho' in _suggest(client, 'otavio ram')
+        assert 'Otávio Ramalho' in _suggest(client, 'otavio@sug')
+        assert 'Otávio Ramalho' in _suggest(client, '111.222')
+
+    def test_incremental_updates(self, app, client):
+        """Testa que renomear ou desativar atualiza o índice sem reconstrução"""
+        with app.app_context():
+            otavio = Client.query.filter_by(email='otavio@sugestao.com').first()
+            otavio.name = 'Otávio Bastos'
+            db.session.commit()
+
+            assert _suggest(client, 'ramalho') == []
+            assert 'Otávio Bastos' in _suggest(client, 'bastos')
+
+            otavio.is_active = False
+            db.session.commit()
+            assert _suggest(client, 'bastos') == []
+
+    def test_empty_query(self, client):
+        """Testa que texto vazio não retorna sugestões"""
+        assert _suggest(client, '') == []
+
+    def test_contract_form_does_not_list_clients(self, app, client):
+        """Testa que o formulário no modo suggest não carrega a lista de clientes"""
+        response = client.get('/contracts/new')
+        assert response.status_code == 200
+        assert b'client_search' in response.data
+
+    def test_rebuild(self, app):
+        """Testa a reconstrução completa"""
+        with app.app_context():
+            client_prefix_index.rebuild()
+            active = Client.query.filter_by(is_active=True).count()
+            assert len(client_prefix_index._entries) == active
+
+    def test_local_commit_does_not_rebuild(self, app, client, monkeypatch):
+        """Testa que o commit deste processo adota o próprio token sem reconstruir"""
+        with app.app_context():
+            client_prefix_index.rebuild()
+
+        rebuilds = []
+        monkeypatch.setattr(client_prefix_index, 'rebuild', lambda: rebuilds.append(True))
+
+        with app.app_context():
+            db.session.add(Client(name='Quirino Versão', email='quirino@sugestao.com', created_by=1))
+            db.session.commit()
+            assert client_prefix_index._version == data_versions.get_versions('clients', fresh=True)
+
+        # Versões lidas por requisições anteriores no contexto compartilhado
+        g.pop('_data_versions', None)
+        assert 'Quirino Versão' in _suggest(client, 'quirino')
+        assert rebuilds == []
+
+    def test_foreign_commit_triggers_rebuild(self, app):
+        """Testa que um token trocado por outro worker não é adotado"""
+        with app.app_context():
+            client_prefix_index.rebuild()
+            version = client_prefix_index._version
+
+            data_versions.bump('clients')  # commit de outro worker
+            db.session.add(Client(name='Ubirajara Versão', email='ubirajara@sugestao.com', created_by=1))
+            db.session.commit()
+
+            assert 'Ubirajara Versão' in [entry['name'] for entry in client_prefix_index._entries.values()]
+            assert client_prefix_index._version == version
+
+            client_prefix_index.rebuild()
+            assert client_prefix_index._version == data_versions.get_versions('clients', fresh=True)
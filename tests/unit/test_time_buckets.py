@@ -0,0 +1,100 @@
+"""
+Testes das séries temporais agrupadas (time_buckets)
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects import postgresql
+
+from app import db
+from app.models import Client, Contract
+from app.services.dashboard_service import DashboardService
+from app.utils.time_buckets import GRANULARITIES, bucket_range, bucket_start, shift, time_bucket
+
+
+class TestBucketArithmetic:
+    """Testes dos períodos de calendário em Python"""
+
+    def test_month_and_quarter_shift(self):
+        """Testa que meses e trimestres respeitam o calendário"""
+        assert shift(date(2024, 1, 1), 'month', 1) == date(2024, 2, 1)
+        assert shift(date(2024, 1, 1), 'month', -1) == date(2023, 12, 1)
+        assert shift(date(2024, 10, 1), 'quarter', 1) == date(2025, 1, 1)
+        assert bucket_range(date(2024, 3, 31), 3, 'month') == [
+            date(2024, 3, 1), date(2024, 4, 1), date(2024, 5, 1)
+        ]
+
+    def test_week_starts_on_monday(self):
+        """Testa a semana ISO (segunda-feira)"""
+        assert bucket_start(date(2024, 6, 16), 'week') == date(2024, 6, 10)  # domingo
+        assert bucket_start(datetime(2024, 6, 10, 23, 59), 'week') == date(2024, 6, 10)
+
+
+class TestSqlBuckets:
+    """Testes da compilação por banco"""
+
+    def test_sqlite_matches_python(self, app):
+        """Testa que o SQL do SQLite concorda com bucket_start para um ano de datas"""
+        with app.app_context():
+            days = [date(2023, 12, 25) + timedelta(days=i) for i in range(400)]
+            for granularity in GRANULARITIES:
+                for day in days[::7] + days[:14]:
+                    value = db.session.execute(select(time_bucket(literal(day.isoformat()), granularity))).scalar()
+                    assert value == bucket_start(day, granularity).isoformat(), (granularity, day)
+
+    def test_postgres_uses_date_trunc(self):
+        """Testa a compilação para Postgres"""
+        sql = str(select(time_bucket(Contract.created_at, 'quarter')).compile(dialect=postgresql.dialect()))
+        assert "to_char(date_trunc('quarter', contracts.created_at), 'YYYY-MM-DD')" in sql
+
+
+class TestTimeSeries:
+    """Testes das séries do dashboard"""
+
+    def test_contracts_by_month_fills_gaps(self, app):
+        """Testa contagem por mês com meses vazios preenchidos com zero"""
+        with app.app_context():
+            client = Client(name='Série Temporal', email='serie@temporal.com', created_by=1)
+            db.session.add(client)
+            db.session.flush()
+            two_months_ago = shift(bucket_start(date.today(), 'month'), 'month', -2)
+            db.session.add(Contract(
+                title='Série', client_id=client.id, value=120.0,
+                start_date=two_months_ago, end_date=date.today() + timedelta(days=40),
+                status='ativo', created_by=1,
+                created_at=datetime.combine(two_months_ago, datetime.min.time()) + timedelta(hours=5)
+            ))
+            db.session.commit()
+
+            series = DashboardService.get_contracts_by_month(6)
+            assert len(series) == 6
+            assert series[-1]['period'] == bucket_start(date.today(), 'month').isoformat()
+            assert series[3]['period'] == two_months_ago.isoformat()
+            assert series[3]['count'] >= 1
+            assert sum(point['count'] for point in series) == Contract.query.filter(
+                Contract.created_at >= datetime.combine(shift(bucket_start(date.today(), 'month'), 'month', -5),
+                                                        datetime.min.time())
+            ).count()
+
+            revenue = DashboardService.get_revenue_by_month(6)
+            assert revenue[3]['value'] >= 120.0
+
+    def test_analytics_data_keyed_by_day(self, app):
+        """Testa que as séries do analytics em cache acompanham a virada do dia"""
+        with app.app_context():
+            january = DashboardService.get_analytics_data_cached(date(2026, 1, 31))
+            february = DashboardService.get_analytics_data_cached(date(2026, 2, 1))
+
+            assert january['expiration_timeline'][0]['period'] == '2026-01-01'
+            assert february['expiration_timeline'][0]['period'] == '2026-02-01'
+            assert february['contracts_by_month'][-1]['period'] == '2026-02-01'
+
+    def test_series_endpoint(self, client):
+        """Testa o endpoint e a validação dos parâmetros"""
+        data = client.get('/api/dashboard/series?metric=expirations&granularity=week&periods=8').get_json()
+        assert len(data['series']) == 8
+        assert data['series'][0]['period'] == bucket_start(date.today(), 'week').isoformat()
+
+        assert client.get('/api/dashboard/series?metric=invalida').status_code == 400
+        assert client.get('/api/dashboard/series?granularity=year').status_code == 400